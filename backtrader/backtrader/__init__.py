@@ -56,6 +56,7 @@ from .sizers import SizerFix  # old sizer for compatibility
 from .strategy import *
 
 from .writer import *
+from .history import *
 
 from .signal import *
 
@@ -64,27 +65,28 @@ from .timer import *
 from .flt import *
 
 from . import utils as utils
+from .utils.py3 import lazyimport as _lazyimport
 
-from . import feeds as feeds
-from . import indicators as indicators
-from . import indicators as ind
-from . import studies as studies
-from . import strategies as strategies
-from . import strategies as strats
 from . import observers as observers
 from . import observers as obs
-from . import analyzers as analyzers
 from . import commissions as commissions
 from . import commissions as comms
 from . import filters as filters
 from . import signals as signals
 from . import sizers as sizers
-from . import stores as stores
-from . import brokers as brokers
 from . import timer as timer
 
-from . import talib as talib
-
-# Load contributed indicators and studies
-import backtrader.indicators.contrib
-import backtrader.studies.contrib
+# The large namespaces (and those with optional dependencies) are imported
+# when first used
+_lazyimport(__name__, globals(), dict(
+    feeds=('.feeds', None),
+    indicators=('.indicators', None),
+    ind=('.indicators', None),
+    studies=('.studies', None),
+    strategies=('.strategies', None),
+    strats=('.strategies', None),
+    analyzers=('.analyzers', None),
+    stores=('.stores', None),
+    brokers=('.brokers', None),
+    talib=('.talib', None),
+))
@@ -21,14 +21,63 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import array
 import calendar
+import collections
 from collections import OrderedDict
+import copy
 import datetime
 import pprint as pp
 
 import backtrader as bt
 from backtrader import TimeFrame
-from backtrader.utils.py3 import MAXINT, with_metaclass
+from backtrader.utils.py3 import MAXINT, with_metaclass, zip
+from backtrader.utils import num2date
+
+
+class FundLog(object):
+    '''Columnar log of the values notified to the analyzers of a strategy,
+    with one entry per cycle
+
+    It is kept by the strategy if the ``fundlog`` parameter of ``Cerebro`` is
+    ``True`` and allows analyzers which only depend on the evolution of the
+    portfolio to calculate their analysis in a single pass during ``stop``
+
+    Member Attributes (``array.array`` instances):
+
+      - ``dt``: float coded datetime of the strategy for each cycle
+      - ``cash``, ``value``, ``fundvalue``, ``fundshares``: values notified
+        to the analyzers with ``notify_fund``
+      - ``status``: minimum period status of the strategy in the cycle. ``1``
+        for ``prenext``, ``0`` for ``nextstart`` and ``-1`` for ``next``
+    '''
+    def __init__(self):
+        self.dt = array.array(str('d'))
+        self.cash = array.array(str('d'))
+        self.value = array.array(str('d'))
+        self.fundvalue = array.array(str('d'))
+        self.fundshares = array.array(str('d'))
+        self.status = array.array(str('b'))
+
+    def __len__(self):
+        return len(self.status)
+
+    def addfund(self, dt, cash, value, fundvalue, fundshares):
+        '''Records the values notified in the current cycle'''
+        self.dt.append(dt)
+        self.cash.append(cash)
+        self.value.append(value)
+        self.fundvalue.append(fundvalue)
+        self.fundshares.append(fundshares)
+
+    def addstatus(self, minperstatus):
+        '''Records the minimum period status of the current cycle'''
+        self.status.append(max(-1, min(minperstatus, 1)))
+
+    def values(self, fundmode):
+        '''Returns the column holding the fund value if ``fundmode`` is
+        ``True`` and else the column with the net asset value'''
+        return self.fundvalue if fundmode else self.value
 
 
 class MetaAnalyzer(bt.MetaParams):
@@ -43,9 +92,11 @@ class MetaAnalyzer(bt.MetaParams):
 
         _obj.strategy = strategy = bt.metabase.findowner(_obj, bt.Strategy)
         _obj._parent = bt.metabase.findowner(_obj, Analyzer)
+        _obj._fundlog = None
 
         # Register with a master observer if created inside one
         masterobs = bt.metabase.findowner(_obj, bt.Observer)
+        _obj._observed = masterobs is not None
         if masterobs is not None:
             masterobs._register_analyzer(_obj)
 
@@ -134,9 +185,17 @@ class Analyzer(with_metaclass(MetaAnalyzer, object)):
     object containing the results of the analysis (the actual format is
     implementation dependent)
 
+    Analyzers which only depend on the notified cash/value can set the class
+    attribute ``_canfundlog`` to ``True`` and implement ``fundlog_analysis``
+    to support the ``fundlog`` mode of ``Cerebro``
+
     '''
     csv = True
 
+    # Subclasses which can calculate the analysis from a FundLog set this to
+    # True and implement fundlog_analysis
+    _canfundlog = False
+
     def __len__(self):
         '''Support for invoking ``len`` on analyzers by actually returning the
         current length of the strategy the analyzer operates on'''
@@ -149,19 +208,22 @@ class Analyzer(with_metaclass(MetaAnalyzer, object)):
         for child in self._children:
             child._prenext()
 
-        self.prenext()
+        if self._fundlog is None:
+            self.prenext()
 
     def _notify_cashvalue(self, cash, value):
         for child in self._children:
             child._notify_cashvalue(cash, value)
 
-        self.notify_cashvalue(cash, value)
+        if self._fundlog is None:
+            self.notify_cashvalue(cash, value)
 
     def _notify_fund(self, cash, value, fundvalue, shares):
         for child in self._children:
             child._notify_fund(cash, value, fundvalue, shares)
 
-        self.notify_fund(cash, value, fundvalue, shares)
+        if self._fundlog is None:
+            self.notify_fund(cash, value, fundvalue, shares)
 
     def _notify_trade(self, trade):
         for child in self._children:
@@ -179,26 +241,92 @@ class Analyzer(with_metaclass(MetaAnalyzer, object)):
         for child in self._children:
             child._nextstart()
 
-        self.nextstart()
+        if self._fundlog is None:
+            self.nextstart()
 
     def _next(self):
         for child in self._children:
             child._next()
 
-        self.next()
+        if self._fundlog is None:
+            self.next()
 
     def _start(self):
         for child in self._children:
             child._start()
 
+        self._fundlog = None
         self.start()
 
+        fundlog = self.strategy._fundlog
+        if fundlog is not None and self._canfundlog and not self._observed:
+            if self.usefundlog():
+                self._fundlog = fundlog
+
+    def _continue(self):
+        # a run is continued: the analysis may have been closed by stop
+        for child in self._children:
+            child._continue()
+
+        # undo what fundlog_analysis and stop did to the state of the cycles
+        self.__dict__.update(self._stopstate)
+        rets = getattr(self, 'rets', None)
+        if hasattr(rets, '_open'):
+            rets._open()
+
+    # containers in the state of an analyzer which stop may modify in place
+    _STATETYPES = (list, dict, set, array.array, collections.deque)
+
+    def _savestate(self):
+        # Copies the state left by the cycles to let _continue go back to it.
+        # The objects shared with the rest of the system are not copied
+        strategy = self.strategy
+        shared = [self, strategy, strategy.broker, self._parent]
+        shared.extend(strategy.datas)
+        shared.extend(strategy.analyzers)
+        shared.extend(strategy._slave_analyzers)
+        shared.extend(self._children)
+        memo = dict((id(obj), obj) for obj in shared)
+
+        state = dict()
+        for name, val in self.__dict__.items():
+            if name in ('_children', 'datas', '_stopstate'):
+                continue
+
+            if isinstance(val, self._STATETYPES):
+                val = copy.deepcopy(val, memo)
+
+            state[name] = val
+
+        self._stopstate = state
+
     def _stop(self):
         for child in self._children:
             child._stop()
 
+        self._savestate()
+        if self._fundlog is not None:
+            self.fundlog_analysis(self._fundlog)
+
         self.stop()
 
+    def usefundlog(self):
+        '''Called after ``start`` if the strategy keeps a ``FundLog`` to let
+        the analyzer decide if it can calculate the analysis from it (for
+        example because it tracks no data). In that case the per cycle
+        ``next`` and ``notify_xxx`` calls (but ``notify_order`` and
+        ``notify_trade``) will not be made and ``fundlog_analysis`` will be
+        called before ``stop``
+        '''
+        return True
+
+    def fundlog_analysis(self, fundlog):
+        '''Meant to be overriden by subclasses with ``_canfundlog = True``.
+        Receives the ``FundLog`` of the strategy and has to leave the analyzer
+        in the same state the per cycle calls would have produced
+        '''
+        pass
+
     def notify_cashvalue(self, cash, value):
         '''Receives the cash/value notification before each next cycle'''
         pass
@@ -316,6 +444,9 @@ class TimeFrameAnalyzerBase(with_metaclass(MetaTimeFrameAnalyzerBase,
         for child in self._children:
             child._prenext()
 
+        if self._fundlog is not None:
+            return
+
         if self._dt_over():
             self.on_dt_over()
 
@@ -326,6 +457,9 @@ class TimeFrameAnalyzerBase(with_metaclass(MetaTimeFrameAnalyzerBase,
         for child in self._children:
             child._nextstart()
 
+        if self._fundlog is not None:
+            return
+
         if self._dt_over() or not self.p._doprenext:  # exec if no prenext
             self.on_dt_over()
 
@@ -335,6 +469,9 @@ class TimeFrameAnalyzerBase(with_metaclass(MetaTimeFrameAnalyzerBase,
         for child in self._children:
             child._next()
 
+        if self._fundlog is not None:
+            return
+
         if self._dt_over():
             self.on_dt_over()
 
@@ -343,6 +480,48 @@ class TimeFrameAnalyzerBase(with_metaclass(MetaTimeFrameAnalyzerBase,
     def on_dt_over(self):
         pass
 
+    def _fundlog_cycles(self, fundlog):
+        '''Replays the ``_dt_over`` logic over the cycles recorded in
+        ``fundlog``, leaving ``dtcmp``/``dtkey`` as the per cycle calls would.
+
+        Returns a list with a tuple ``(over, donext, dtkey)`` for each cycle
+        indicating if ``on_dt_over`` and ``next`` (or the ``prenext`` /
+        ``nextstart`` equivalents) would have been called and the
+        ``dtkey`` in place at that moment
+        '''
+        cycles = list()
+        doprenext = self.p._doprenext
+
+        notimeframe = self.timeframe == TimeFrame.NoTimeFrame
+        tz = self.strategy.lines.datetime._tz
+        # the comparison key for days and above depends only on the date
+        bydate = self.timeframe >= TimeFrame.Days and tz is None
+        lastdate = None
+
+        for dt, status in zip(fundlog.dt, fundlog.status):
+            if notimeframe:
+                dtcmp, dtkey = MAXINT, datetime.datetime.max
+            elif not bydate or int(dt) != lastdate:
+                lastdate = int(dt)
+                dtcmp, dtkey = self._get_dt_cmpkey(num2date(dt, tz=tz))
+
+            over = self.dtcmp is None or dtcmp > self.dtcmp
+            if over:
+                self.dtkey, self.dtkey1 = dtkey, self.dtkey
+                self.dtcmp, self.dtcmp1 = dtcmp, self.dtcmp
+
+            if status > 0:  # prenext
+                donext = doprenext
+            elif status == 0:  # nextstart
+                over = over or not doprenext
+                donext = True
+            else:
+                donext = True
+
+            cycles.append((over, donext, self.dtkey))
+
+        return cycles
+
     def _dt_over(self):
         if self.timeframe == TimeFrame.NoTimeFrame:
             dtcmp, dtkey = MAXINT, datetime.datetime.max
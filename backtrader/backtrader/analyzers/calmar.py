@@ -22,6 +22,7 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import backtrader as bt
+from backtrader.utils.py3 import zip
 from . import TimeDrawDown
 
 
@@ -80,6 +81,8 @@ class Calmar(bt.TimeFrameAnalyzerBase):
         ('fund', None),
     )
 
+    _canfundlog = True
+
     def __init__(self):
         self._maxdd = TimeDrawDown(timeframe=self.p.timeframe,
                                    compression=self.p.compression)
@@ -98,16 +101,43 @@ class Calmar(bt.TimeFrameAnalyzerBase):
         else:
             self._values.append(self.strategy.broker.fundvalue)
 
+    def usefundlog(self):
+        # the drawdown must be calculated in the same pass
+        return self._maxdd._fundlog is not None
+
+    def fundlog_analysis(self, fundlog):
+        values = fundlog.values(self._fundmode)
+        ddvalues = fundlog.values(self._maxdd._fundmode)
+        cycles = self._fundlog_cycles(fundlog)
+
+        # replay the TimeDrawDown calculations on the shared timeframe
+        peak, maxdd = float('-inf'), 0.0
+        for value, ddvalue, cycle in zip(values, ddvalues, cycles):
+            over, donext, dtkey = cycle
+            if not over:
+                continue
+
+            peak = max(peak, ddvalue)
+            maxdd = max(maxdd, 100.0 * (peak - ddvalue) / peak)
+
+            self._mdd = max(self._mdd, maxdd)
+            self._update(value, dtkey)
+
     def on_dt_over(self):
         self._mdd = max(self._mdd, self._maxdd.maxdd)
         if not self._fundmode:
-            self._values.append(self.strategy.broker.getvalue())
+            value = self.strategy.broker.getvalue()
         else:
-            self._values.append(self.strategy.broker.fundvalue)
+            value = self.strategy.broker.fundvalue
+
+        self._update(value, self.dtkey)
+
+    def _update(self, value, dtkey):
+        self._values.append(value)
         rann = math.log(self._values[-1] / self._values[0]) / len(self._values)
         self.calmar = calmar = rann / (self._mdd or float('Inf'))
 
-        self.rets[self.dtkey] = calmar
+        self.rets[dtkey] = calmar
 
     def stop(self):
         self.on_dt_over()  # update last values
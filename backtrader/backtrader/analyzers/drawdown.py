@@ -23,6 +23,7 @@ from __future__ import (absolute_import, division, print_function,
 
 import backtrader as bt
 from backtrader.utils import AutoOrderedDict
+from backtrader.utils.py3 import zip
 
 
 __all__ = ['DrawDown', 'TimeDrawDown']
@@ -64,6 +65,8 @@ class DrawDown(bt.Analyzer):
         ('fund', None),
     )
 
+    _canfundlog = True
+
     def start(self):
         super(DrawDown, self).start()
         if self.p.fund is None:
@@ -87,6 +90,31 @@ class DrawDown(bt.Analyzer):
     def stop(self):
         self.rets._close()  # . notation cannot create more keys
 
+    def fundlog_analysis(self, fundlog):
+        values = fundlog.values(self._fundmode)
+        if not values:
+            return
+
+        r = self.rets
+        maxvalue = self._maxvalue
+        ddlen, maxlen = r.len, r.max.len
+        maxmoneydown, maxdrawdown = r.max.moneydown, r.max.drawdown
+        for value in values:
+            maxvalue = max(maxvalue, value)
+            moneydown = maxvalue - value
+            drawdown = 100.0 * moneydown / maxvalue
+
+            maxmoneydown = max(maxmoneydown, moneydown)
+            maxdrawdown = max(maxdrawdown, drawdown)
+
+            ddlen = ddlen + 1 if drawdown else 0
+            maxlen = max(maxlen, ddlen)
+
+        self._value, self._maxvalue = value, maxvalue
+        r.moneydown, r.drawdown = moneydown, drawdown
+        r.max.moneydown, r.max.drawdown = maxmoneydown, maxdrawdown
+        r.len, r.max.len = ddlen, maxlen
+
     def notify_fund(self, cash, value, fundvalue, shares):
         if not self._fundmode:
             self._value = value  # record current value
@@ -161,6 +189,8 @@ class TimeDrawDown(bt.TimeFrameAnalyzerBase):
         ('fund', None),
     )
 
+    _canfundlog = True
+
     def start(self):
         super(TimeDrawDown, self).start()
         if self.p.fund is None:
@@ -173,12 +203,22 @@ class TimeDrawDown(bt.TimeFrameAnalyzerBase):
         self.peak = float('-inf')
         self.ddlen = 0
 
+    def fundlog_analysis(self, fundlog):
+        values = fundlog.values(self._fundmode)
+        cycles = self._fundlog_cycles(fundlog)
+        for value, (over, donext, dtkey) in zip(values, cycles):
+            if over:
+                self._update(value)
+
     def on_dt_over(self):
         if not self._fundmode:
             value = self.strategy.broker.getvalue()
         else:
             value = self.strategy.broker.fundvalue
 
+        self._update(value)
+
+    def _update(self, value):
         # update the maximum seen peak
         if value > self.peak:
             self.peak = value
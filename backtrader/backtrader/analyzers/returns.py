@@ -94,6 +94,8 @@ class Returns(TimeFrameAnalyzerBase):
         ('fund', None),
     )
 
+    _canfundlog = True
+
     _TANN = {
         bt.TimeFrame.Days: 252.0,
         bt.TimeFrame.Weeks: 52.0,
@@ -151,5 +153,9 @@ class Returns(TimeFrameAnalyzerBase):
 
         self.rets['rnorm100'] = rnorm * 100.0  # human readable %
 
+    def fundlog_analysis(self, fundlog):
+        cycles = self._fundlog_cycles(fundlog)
+        self._tcount += sum(1 for over, donext, dtkey in cycles if over)
+
     def _on_dt_over(self):
         self._tcount += 1  # count the subperiod
@@ -22,6 +22,7 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 from backtrader import TimeFrameAnalyzerBase
+from backtrader.utils.py3 import zip
 
 
 class TimeReturn(TimeFrameAnalyzerBase):
@@ -93,6 +94,8 @@ class TimeReturn(TimeFrameAnalyzerBase):
         ('fund', None),
     )
 
+    _canfundlog = True
+
     def start(self):
         super(TimeReturn, self).start()
         if self.p.fund is None:
@@ -109,6 +112,28 @@ class TimeReturn(TimeFrameAnalyzerBase):
             else:
                 self._lastvalue = self.strategy.broker.fundvalue
 
+    def usefundlog(self):
+        return self.p.data is None  # data values are not in the log
+
+    def fundlog_analysis(self, fundlog):
+        values = fundlog.values(self._fundmode)
+        cycles = self._fundlog_cycles(fundlog)
+
+        rets = self.rets
+        value_start, lastvalue = self._value_start, self._lastvalue
+        for value, (over, donext, dtkey) in zip(values, cycles):
+            if over:
+                value_start = lastvalue
+
+            if donext:
+                rets[dtkey] = (value / value_start) - 1.0
+                lastvalue = value
+
+        if values:
+            self._value = values[-1]
+
+        self._value_start, self._lastvalue = value_start, lastvalue
+
     def notify_fund(self, cash, value, fundvalue, shares):
         if not self._fundmode:
             # Record current value
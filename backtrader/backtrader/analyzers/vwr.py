@@ -25,6 +25,7 @@ import math
 
 import backtrader as bt
 from backtrader import TimeFrameAnalyzerBase
+from backtrader.utils.py3 import zip
 from . import Returns
 from ..mathsupport import standarddev
 
@@ -104,6 +105,8 @@ class VWR(TimeFrameAnalyzerBase):
         ('fund', None),
     )
 
+    _canfundlog = True
+
     _TANN = {
         bt.TimeFrame.Days: 252.0,
         bt.TimeFrame.Weeks: 52.0,
@@ -159,6 +162,16 @@ class VWR(TimeFrameAnalyzerBase):
         vwr = rnorm100 * (1.0 - pow(sdev_p / self.p.sdev_max, self.p.tau))
         self.rets['vwr'] = vwr
 
+    def fundlog_analysis(self, fundlog):
+        values = fundlog.values(self._fundmode)
+        cycles = self._fundlog_cycles(fundlog)
+        pis, pns = self._pis, self._pns
+        for value, (over, donext, dtkey) in zip(values, cycles):
+            pns[-1] = value  # notify_fund comes before the dt_over check
+            if over:
+                pis.append(value)
+                pns.append(None)
+
     def notify_fund(self, cash, value, fundvalue, shares):
         if not self._fundmode:
             self._pns[-1] = value  # annotate last seen pn for current period
@@ -74,6 +74,11 @@ class BrokerBase(with_metaclass(MetaBroker, object)):
         '''Add fund history. See cerebro for details'''
         raise NotImplementedError
 
+    def set_history(self, size):
+        '''Keep in memory only (about) the last ``size`` orders which are no
+        longer alive. See cerebro for details'''
+        pass  # do nothing, not all brokers keep the orders
+
     def getcommissioninfo(self, data):
         '''Retrieves the ``CommissionInfo`` scheme associated with the given
         ``data``'''
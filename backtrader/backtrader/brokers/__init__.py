@@ -26,22 +26,13 @@ from __future__ import (absolute_import, division, print_function,
 
 from .bbroker import BackBroker, BrokerBack
 
-try:
-    from .ibbroker import IBBroker
-except ImportError:
-    pass  # The user may not have ibpy installed
+from ..utils.py3 import lazyimport
 
-try:
-    from .vcbroker import VCBroker
-except ImportError:
-    pass  # The user may not have something installed
-
-try:
-    from .oandabroker import OandaBroker
-except ImportError as e:
-    pass  # The user may not have something installed
-
-try:
-    from .ccxtbroker import CCXTBroker
-except ImportError as e:
-    pass  # The user may not have something installed
+# The live brokers are imported when first used. The user may not have the
+# needed packages (ibpy, comtypes, oandapy, ccxt) installed
+lazyimport(__name__, globals(), dict(
+    IBBroker=('.ibbroker', 'IBBroker'),
+    VCBroker=('.vcbroker', 'VCBroker'),
+    OandaBroker=('.oandabroker', 'OandaBroker'),
+    CCXTBroker=('.ccxtbroker', 'CCXTBroker'),
+))
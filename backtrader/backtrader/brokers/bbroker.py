@@ -23,6 +23,7 @@ from __future__ import (absolute_import, division, print_function,
 
 import collections
 import datetime
+import math
 
 import backtrader as bt
 from backtrader.comminfo import CommInfoBase
@@ -252,6 +253,7 @@ class BackBroker(bt.BrokerBase):
         super(BackBroker, self).__init__()
         self._userhist = []
         self._fundhist = []
+        self._historysize = 0
         # share_value, net asset value
         self._fhistlast = [float('NaN'), float('NaN')]
 
@@ -267,11 +269,17 @@ class BackBroker(bt.BrokerBase):
         self._leverage = 1.0  # initially nothing is open
         self._unrealized = 0.0  # no open position
 
-        self.orders = list()  # will only be appending
+        self.orders = list()  # appending (see set_history)
         self.pending = collections.deque()  # popleft and append(right)
         self._toactivate = collections.deque()  # to activate in next cycle
 
         self.positions = collections.defaultdict(Position)
+        self._held = dict()  # datas with an open position (in order)
+        self._posvalues = dict()  # (close, values) in the totals per data
+        self._posdirty = set()  # datas with values to be calculated again
+        self._possums = ([], [], [])  # partials: value, unrealized, unlever
+        self._posnonfinite = set()  # datas with values not in the partials
+        self._commkeys = None  # comminfos (and params) at last valuation
         self.d_credit = collections.defaultdict(float)  # credit per data
         self.notifs = collections.deque()
 
@@ -436,7 +444,12 @@ class BackBroker(bt.BrokerBase):
             self._fundshares += c / self._fundval
             self.cash += c
 
-        for data in datas or self.positions:
+        if not datas:
+            # full portfolio: only the positions which have changed are
+            # valued again (see _valuepositions)
+            pos_value, unrealized, pos_value_unlever = self._valuepositions()
+
+        for data in datas or ():
             comminfo = self.getcommissioninfo(data)
             position = self.positions[data]
             # use valuesize:  returns raw value, rather than negative adj val
@@ -447,7 +460,7 @@ class BackBroker(bt.BrokerBase):
 
             dunrealized = comminfo.profitandloss(position.size, position.price,
                                                  data.close[0])
-            if datas and len(datas) == 1:
+            if len(datas) == 1:
                 if lever and dvalue > 0:
                     dvalue -= dunrealized
                     return (dvalue / comminfo.get_leverage()) + dunrealized
@@ -493,6 +506,107 @@ class BackBroker(bt.BrokerBase):
 
         return self._value if not lever else self._valuelever
 
+    def _posupdated(self, data):
+        # the position on data has changed: keep track of the open positions
+        # and value it again
+        if self.positions[data]:
+            self._held[data] = None
+        else:
+            self._held.pop(data, None)
+
+        self._posdirty.add(data)
+
+    def _valuepositions(self):
+        '''Returns the totals (value, unrealized, unlevered value) of the
+        open positions
+
+        The totals are exact running sums (as calculated by ``math.fsum``)
+        of the values of the positions. Only the positions marked as dirty,
+        because the position or the closing price have changed, are valued
+        again and their old values are replaced in the sums. All positions
+        are valued again if the commission schemes (or their parameters) or
+        ``shortcash`` have changed
+        '''
+        dirty = self._posdirty
+        commkeys = dict((name, (comminfo, comminfo.p._getvalues()))
+                        for name, comminfo in self.comminfo.items())
+        commkeys = (self.p.shortcash, commkeys)
+        if commkeys != self._commkeys:
+            self._commkeys = commkeys
+            dirty.update(self._posvalues)
+            dirty.update(self._held)
+
+        for data in dirty:
+            old = self._posvalues.pop(data, None)
+            if old is not None:
+                self._possum(data, old[1], -1.0)
+
+            if data in self._held:
+                position = self.positions[data]
+                values = self._get_posvalue(data, position)
+                self._posvalues[data] = (data.close[0], values)
+                self._possum(data, values, 1.0)
+
+        dirty.clear()
+
+        sums = [math.fsum(partials) for partials in self._possums]
+        for data in self._posnonfinite:  # inf/nan (like the plain sums)
+            for i, terms in enumerate(self._posterms(
+                    self._posvalues[data][1])):
+                for x in terms:
+                    sums[i] += x
+
+        return sums
+
+    @staticmethod
+    def _posterms(values):
+        # terms of a position for the totals: value, unrealized, unlevered
+        dvalue, dunrealized, dunlever = values
+        if dunlever is not None:  # long position - unlever
+            return (dvalue,), (dunrealized,), (dunlever, dunrealized)
+
+        return (dvalue,), (dunrealized,), (dvalue,)
+
+    def _possum(self, data, values, sign):
+        # adds (sign 1.0) or removes (sign -1.0) the values of a position
+        # to/from the exact partial sums of the totals
+        if not all(x - x == 0.0 for x in values if x is not None):
+            if sign > 0.0:  # inf/nan cannot be taken back from the partials
+                self._posnonfinite.add(data)
+            else:
+                self._posnonfinite.discard(data)
+            return
+
+        for partials, terms in zip(self._possums, self._posterms(values)):
+            for x in terms:
+                _fsumadd(partials, sign * x)
+
+    def _get_posvalue(self, data, position):
+        '''Returns a tuple (value, unrealized, unlevered) for the position
+        held on ``data``, where ``unlevered`` is ``None`` if the position is
+        not long'''
+        close = data.close[0]
+        comminfo = self.getcommissioninfo(data)
+        shortcash = self.p.shortcash
+
+        # use valuesize:  returns raw value, rather than negative adj val
+        if not shortcash:
+            dvalue = comminfo.getvalue(position, close)
+        else:
+            dvalue = comminfo.getvaluesize(position.size, close)
+
+        dunrealized = comminfo.profitandloss(position.size, position.price,
+                                             close)
+
+        if not shortcash:
+            dvalue = abs(dvalue)  # short selling adds value in this case
+
+        dunlever = None
+        if dvalue > 0:  # long position - unlever
+            dunlever = (dvalue - dunrealized) / comminfo.get_leverage()
+
+        return dvalue, dunrealized, dunlever
+
     def get_leverage(self):
         return self._leverage
 
@@ -641,6 +755,16 @@ class BackBroker(bt.BrokerBase):
         o = next(oiter, None)
         self._userhist.append([o, oiter, notify])
 
+    def set_history(self, size):
+        self._historysize = size
+
+    def _prunehistory(self):
+        # keep the alive orders and the latest which are no longer alive
+        dead = [o for o in self.orders if not o.alive()]
+        drop = set(id(o) for o in dead[:-self._historysize])
+        if drop:
+            self.orders = [o for o in self.orders if id(o) not in drop]
+
     def set_fund_history(self, fund):
         # iterable with the following pro item
         # [datetime, share_value, net asset value]
@@ -817,6 +941,7 @@ class BackBroker(bt.BrokerBase):
 
             # do a real position update if something was executed
             position.update(execsize, price, data.datetime.datetime())
+            self._posupdated(data)
 
             if closed and self.p.int2pnl:  # Assign accumulated interest data
                 closedcomm += self.d_credit.pop(data, 0.0)
@@ -1178,17 +1303,17 @@ class BackBroker(bt.BrokerBase):
             self.check_submitted()
 
         # Discount any cash for positions hold
-        credit = 0.0
-        for data, pos in self.positions.items():
-            if pos:
-                comminfo = self.getcommissioninfo(data)
-                dt0 = data.datetime.datetime()
-                dcredit = comminfo.get_credit_interest(data, pos, dt0)
-                self.d_credit[data] += dcredit
-                credit += dcredit
-                pos.datetime = dt0  # mark last credit operation
-
-        self.cash -= credit
+        credits = []
+        for data in self._held:
+            pos = self.positions[data]
+            comminfo = self.getcommissioninfo(data)
+            dt0 = data.datetime.datetime()
+            dcredit = comminfo.get_credit_interest(data, pos, dt0)
+            self.d_credit[data] += dcredit
+            credits.append(dcredit)
+            pos.datetime = dt0  # mark last credit operation
+
+        self.cash -= math.fsum(credits)
 
         self._process_order_history()
 
@@ -1216,19 +1341,45 @@ class BackBroker(bt.BrokerBase):
                     # a bracket parent order may have been executed
                     self._bracketize(order)
 
+        if self._historysize and len(self.orders) > 2 * self._historysize:
+            self._prunehistory()
+
         # Operations have been executed ... adjust cash end of bar
-        for data, pos in self.positions.items():
+        adjusts = []
+        posvalues = self._posvalues
+        for data in self._held:
             # futures change cash every bar
-            if pos:
-                comminfo = self.getcommissioninfo(data)
-                self.cash += comminfo.cashadjust(pos.size,
-                                                 pos.adjbase,
-                                                 data.close[0])
-                # record the last adjustment price
-                pos.adjbase = data.close[0]
+            pos = self.positions[data]
+            close = data.close[0]
+            comminfo = self.getcommissioninfo(data)
+            adjusts.append(comminfo.cashadjust(pos.size, pos.adjbase, close))
+            pos.adjbase = close  # record the last adjustment price
+
+            if data not in posvalues or posvalues[data][0] != close:
+                self._posdirty.add(data)  # new price (nan is always new)
+
+        self.cash += math.fsum(adjusts)
 
         self._get_value()  # update value
 
 
+def _fsumadd(partials, x):
+    '''Adds ``x`` to the exact sum held (as non-overlapping values) in
+    ``partials``, which ``math.fsum`` rounds correctly (Shewchuk's algorithm,
+    as used by ``math.fsum``)'''
+    i = 0
+    for y in partials:
+        if abs(x) < abs(y):
+            x, y = y, x
+        hi = x + y
+        lo = y - (hi - x)
+        if lo:
+            partials[i] = lo
+            i += 1
+        x = hi
+
+    partials[i:] = [x]
+
+
 # Alias
 BrokerBack = BackBroker
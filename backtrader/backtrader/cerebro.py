@@ -23,6 +23,7 @@ from __future__ import (absolute_import, division, print_function,
 
 import datetime
 import collections
+import heapq
 import itertools
 import multiprocessing
 
@@ -36,6 +37,8 @@ from .brokers import BackBroker
 from .metabase import MetaParams
 from . import observers
 from .writer import WriterFile
+from .history import HistoryLog
+from . import snapshot
 from .utils import OrderedDict, tzparse, num2date, date2num
 from .strategy import Strategy, SignalStrategy
 from .tradingcal import (TradingCalendarBase, TradingCalendar,
@@ -60,6 +63,12 @@ class Cerebro(with_metaclass(MetaParams, object)):
         Whether to preload the different ``data feeds`` passed to cerebro for
         the Strategies
 
+        Datas added with ``resampledata`` are only preloaded (resampling all
+        bars in a single pass) if all datas in the system are resampled.
+        Running along other datas, the resampled bars are delivered when the
+        next bar of the source shows that they are complete, which requires
+        not preloading
+
       - ``runonce`` (default: ``True``)
 
         Run ``Indicators`` in vectorized mode to speed up the entire system.
@@ -264,6 +273,100 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
         Set to ``False`` for compatibility. May be changed to ``True``
 
+      - ``fundlog`` (default: ``False``)
+
+        Strategies keep a columnar log (``FundLog``) of the cash, value and
+        fund value notified to the analyzers in each cycle. Analyzers which
+        only depend on the evolution of the portfolio (``TimeReturn``,
+        ``Returns``, ``DrawDown``, ``TimeDrawDown``, ``VWR``, ``Calmar`` and
+        those built on top of them like ``SharpeRatio`` or ``PeriodStats``)
+        skip the per cycle calculations and deliver the same analysis
+        calculated in a single pass during ``stop``.
+
+        Useful when several analyzers are attached, specially during
+        optimization. Analyzers attached to observers are not affected
+
+      - ``replaypreload`` (default: ``False``)
+
+        Replaying data feeds (``replaydata``) deactivates ``preload`` and
+        ``runonce`` for all data feeds in the system.
+
+        If ``True`` the partial bars produced by the replay filter are
+        calculated during ``preload`` and delivered tick by tick during the
+        run, without going to the source of the data. The rest of data feeds
+        are preloaded as usual. ``runonce`` remains deactivated, because
+        indicators have to be recalculated with each partial bar
+
+        Replayed data feeds which use filters which can still modify the
+        delivered bars at run time (like ``adjbartime`` in the replay filter)
+        are not preloaded.
+
+        Resampled data feeds added with ``resampledata`` still deactivate
+        ``preload``
+
+      - ``lazystats`` (default: ``False``)
+
+        Observers which support it (``Broker``, ``BuySell``, ``Trades`` and
+        ``DataTrades``, i.e.: those added with ``stdstats``) only record the
+        sparse events (executions, closed trades, changes of cash/value)
+        during the run and build their lines from them in a single pass when
+        the strategy stops. Their values are therefore not available during
+        the run.
+
+        Not applied if a writer has ``csv`` output (it needs the values in
+        each cycle) or with ``exactbars`` saving memory
+
+      - ``indplan`` (default: ``False``)
+
+        The tree of indicators (and the lines operations created inside
+        them) of each strategy is flattened before the run into a single
+        ordered list of steps, which is executed with a plain loop in each
+        ``next`` and in ``once`` instead of recursively walking down the tree
+
+        Indicators which redefine how they are iterated are executed as a
+        single step
+
+      - ``opfusion`` (default: ``False``)
+
+        Chains of lines operations (the objects created by arithmetic
+        expressions with lines like ``self.data0 - self.data1 * 2.0``) in
+        which the intermediate results are only used by the next operation
+        are evaluated with a single kernel by the last operation. The
+        intermediate operations are removed from the execution and their
+        buffers remain empty
+
+      - ``retention`` (default: ``0``)
+
+        If greater than ``0``, the lines of the datas, indicators and
+        observers keep only (at least) this number of bars in memory, plus
+        the lookback period needed by the indicators of the strategy. The
+        older values are discarded in chunks, which keeps the memory flat and
+        the cost per bar constant for sessions which are never ending
+
+        Unlike ``exactbars``, the length of the lines and the indexing with
+        *ago* values work as usual, and plotting is possible (showing the
+        bars still in memory)
+
+        Only applied when ``runonce`` is not active (for example with live
+        datas) and ``exactbars`` is not in use. ``lazystats`` is deactivated
+
+      - ``history`` (default: ``0``)
+
+        If greater than ``0``, the strategies keep in memory only (about) this
+        number of notified orders and of closed trades for each data and
+        ``tradeid``, and the broker the same number of orders which are no
+        longer alive. The older ones are removed in chunks
+
+        The notifications and the values calculated by the analyzers and
+        observers are not affected
+
+      - ``historylog`` (default: ``None``)
+
+        File name (opened in append mode) or stream in which the completed
+        orders and the closed trades which are removed from memory due to
+        ``history`` are written down (one JSON object per line). See
+        ``HistoryLog``
+
     '''
 
     params = (
@@ -286,11 +389,20 @@ class Cerebro(with_metaclass(MetaParams, object)):
         ('cheat_on_open', False),
         ('broker_coo', True),
         ('quicknotify', False),
+        ('fundlog', False),
+        ('replaypreload', False),
+        ('lazystats', False),
+        ('indplan', False),
+        ('opfusion', False),
+        ('retention', 0),
+        ('history', 0),
+        ('historylog', None),
     )
 
     def __init__(self):
         self._dolive = False
         self._doreplay = False
+        self._doresample = False
         self._dooptimize = False
         self.stores = list()
         self.feeds = list()
@@ -320,6 +432,9 @@ class Cerebro(with_metaclass(MetaParams, object)):
         self._pretimers = list()
         self._ohistory = list()
         self._fhistory = None
+        self._snapshot = None  # state to restore at the start of the run
+        self._snapshotreq = None  # snapshot requested during a cycle
+        self._inloop = False
 
     @staticmethod
     def iterize(iterable):
@@ -337,6 +452,57 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
         return niterable
 
+    def snapshot(self, path, tail=None):
+        '''
+        Saves the state of the running strategies to the file ``path``, for
+        example from within ``next`` of a strategy in a live session (the
+        snapshot is then taken at the end of the cycle, once the observers
+        and analyzers have also seen the bar). The state contains:
+
+          - The values of the lines of the datas, strategies, indicators and
+            observers (the last ``tail`` values, but never less than the
+            minimum period of the strategies. With ``None`` the values held in
+            memory are saved)
+
+          - The attributes of the datas, strategies, indicators, observers and
+            analyzers like running sums, orders, trades and the notifications
+            which are still pending. Attributes which cannot be pickled are
+            left out with a ``RuntimeWarning`` naming them
+
+          - The broker with the cash, positions and orders
+
+          - The timers with the state of their next check
+
+        The objects themselves (datas, indicators, ...) are not saved. A
+        snapshot can only be restored (see ``restore``) by a ``Cerebro`` which
+        has been set up in the same manner
+        '''
+        self._snapshotreq = (path, tail)
+        if not self._inloop:
+            self._takesnapshot()
+        # else: taken at the end of the cycle, once observers and analyzers
+        # have also seen the bar
+
+    def _takesnapshot(self):
+        path, tail = self._snapshotreq
+        self._snapshotreq = None
+        payload = snapshot.dumps(self, self.runningstrats, tail)
+        with open(path, 'wb') as f:
+            f.write(payload)
+
+    def restore(self, path):
+        '''
+        Reads the state saved with ``snapshot`` from the file ``path``. The
+        state is restored during ``run``, once the strategies have been
+        created and started
+
+        ``preload`` and ``runonce`` are deactivated. The datas do not deliver
+        again the bars which had already been seen when the snapshot was
+        taken, and the strategies continue with the bars which were missed
+        '''
+        with open(path, 'rb') as f:
+            self._snapshot = f.read()
+
     def set_fund_history(self, fund):
         '''
         Add a history of orders to be directly executed in the broker for
@@ -832,13 +998,16 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
         Any other kwargs like ``timeframe``, ``compression``, ``todate`` which
         are supported by the resample filter will be passed transparently
+
+        Preloading is deactivated unless all datas are resampled (see the
+        ``preload`` parameter)
         '''
         if any(dataname is x for x in self.datas):
             dataname = dataname.clone()
 
         dataname.resample(**kwargs)
         self.adddata(dataname, name=name)
-        self._doreplay = True
+        self._doresample = True
 
         return dataname
 
@@ -1062,13 +1231,22 @@ class Cerebro(with_metaclass(MetaParams, object)):
             self._dorunonce = False  # something is saving memory, no runonce
             self._dopreload = self._dopreload and self._exactbars < 1
 
+        if self._doresample and not all(x.resampling for x in self.datas):
+            # resampled bars delivered when complete along the other datas
+            self._doreplay = True
+
         self._doreplay = self._doreplay or any(x.replaying for x in self.datas)
         if self._doreplay:
-            # preloading is not supported with replay. full timeframe bars
-            # are constructed in realtime
-            self._dopreload = False
+            if self.p.replaypreload and not self._doresample:
+                # replayed datas preload the ticks, but indicators have to
+                # see each of them
+                self._dorunonce = False
+            else:
+                # preloading is not supported with replay. full timeframe
+                # bars are constructed in realtime
+                self._dopreload = False
 
-        if self._dolive or self.p.live:
+        if self._dolive or self.p.live or self._snapshot is not None:
             # in this case both preload and runonce must be off
             self._dorunonce = False
             self._dopreload = False
@@ -1088,6 +1266,13 @@ class Cerebro(with_metaclass(MetaParams, object)):
         # Write down if any writer wants the full csv output
         self.writers_csv = any(map(lambda x: x.p.csv, self.runwriters))
 
+        # observers can only delay building the lines if no one needs them
+        self._doretention = (self.p.retention > 0 and
+                             not self._dorunonce and not self._exactbars)
+
+        self._dolazystats = (self.p.lazystats and not self.writers_csv and
+                             self._exactbars < 1 and not self._doretention)
+
         self.runstrats = list()
 
         if self.signals:  # allow processing of signals
@@ -1184,8 +1369,14 @@ class Cerebro(with_metaclass(MetaParams, object)):
         for orders, onotify in self._ohistory:
             self._broker.add_order_history(orders, onotify)
 
+        self._broker.set_history(self.p.history)
         self._broker.start()
 
+        self._historylog = None
+        if self.p.history and self.p.historylog is not None:
+            self._historylog = HistoryLog(out=self.p.historylog)
+            self._historylog.start()
+
         for feed in self.feeds:
             feed.start()
 
@@ -1222,6 +1413,8 @@ class Cerebro(with_metaclass(MetaParams, object)):
                 strat._oldsync = True  # tell strategy to use old clock update
             if self.p.tradehistory:
                 strat.set_tradehistory()
+            if self.p.history:
+                strat.set_history(self.p.history, self._historylog)
             runstrats.append(strat)
 
         tz = self.p.tz
@@ -1263,6 +1456,12 @@ class Cerebro(with_metaclass(MetaParams, object)):
                 strat._settz(tz)
                 strat._start()
 
+                if self.p.opfusion:
+                    strat._fuseoperations()
+
+                if self.p.indplan:
+                    strat._compileplan()
+
                 for writer in self.runwriters:
                     if writer.p.csv:
                         writer.addheaders(strat.getwriterheaders())
@@ -1271,37 +1470,42 @@ class Cerebro(with_metaclass(MetaParams, object)):
                 for strat in runstrats:
                     strat.qbuffer(self._exactbars, replaying=self._doreplay)
 
+            if self._doretention:
+                for strat in runstrats:
+                    strat.retain(self.p.retention)
+
+            for timer in self._pretimers:
+                # preprocess tzdata if needed
+                timer.start(self.datas[0])
+
+            if self._snapshot is not None:
+                # also restores the next check state of the timers
+                snapshot.loads(self, runstrats, self._snapshot)
+
             for writer in self.runwriters:
                 writer.start()
 
-            # Prepare timers
+            # Prepare timers: heaps sorted by the next check timestamp
             self._timers = []
             self._timerscheat = []
             for timer in self._pretimers:
-                # preprocess tzdata if needed
-                timer.start(self.datas[0])
-
                 if timer.params.cheat:
-                    self._timerscheat.append(timer)
+                    theap = self._timerscheat
                 else:
-                    self._timers.append(timer)
+                    theap = self._timers
 
-            if self._dopreload and self._dorunonce:
-                if self.p.oldsync:
-                    self._runonce_old(runstrats)
-                else:
-                    self._runonce(runstrats)
-            else:
-                if self.p.oldsync:
-                    self._runnext_old(runstrats)
-                else:
-                    self._runnext(runstrats)
+                heapq.heappush(theap, (timer.nextdt, timer.p.tid, timer))
+
+            self._runloop(runstrats)
 
             for strat in runstrats:
                 strat._stop()
 
         self._broker.stop()
 
+        if self._historylog is not None:
+            self._historylog.stop()
+
         if not predata:
             for data in self.datas:
                 data.stop()
@@ -1369,6 +1573,84 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
             owner._addnotification(order, quicknotify=self.p.quicknotify)
 
+    def _runloop(self, runstrats, more=False):
+        self._inloop = True
+        try:
+            if self._dopreload and self._dorunonce:
+                if self.p.oldsync:
+                    self._runonce_old(runstrats, more=more)
+                else:
+                    self._runonce(runstrats, more=more)
+            else:
+                if self.p.oldsync:
+                    self._runnext_old(runstrats)
+                else:
+                    self._runnext(runstrats)
+        finally:
+            self._inloop = False
+
+        if self._snapshotreq is not None:  # stopped during the cycle
+            self._takesnapshot()
+
+    def runcontinue(self):
+        '''
+        Continues the last (finished) run with the bars which have been added
+        to the datas after it. The strategies, indicators, observers,
+        analyzers and the broker keep their state and only see the new bars:
+        with ``runonce`` the indicators calculate only the new values
+
+        The datas are started again and skip the bars up to the last one
+        which was seen. ``stop`` is called again at the end for the
+        strategies and analyzers. The changes made by ``stop`` (and by the
+        ``fundlog`` analysis) to the state of the analyzers are undone before
+        continuing. Writers only see the initial run
+
+        A resampled data delivers the (maybe incomplete) bar of the last
+        period at the end of a run. If new bars belong to that period, the
+        complete bar is delivered again as a new bar
+
+        Not available after an optimization. Returns the same as ``run``
+        '''
+        if self._dooptimize:
+            raise ValueError('An optimization cannot be continued')
+
+        runstrats = self.runningstrats
+        self._event_stop = False
+        self.runwriters = list()
+        self.writers_csv = False
+
+        if self._historylog is not None:
+            self._historylog.start()  # appends to the existing log
+
+        sizes = [len(data) for data in self.datas]
+        for data in self.datas:
+            data._reopen()
+
+        if self._dopreload:
+            for data in self.datas:
+                data.preload()  # the new bars (and home)
+
+            for data, size in zip(self.datas, sizes):
+                data.home()  # a clone may have moved its guest
+                data.advance(size=size)
+
+        for strat in runstrats:
+            strat._continue()
+
+        self._runloop(runstrats, more=True)
+
+        for strat in runstrats:
+            strat._stop()
+
+        self._broker.stop()
+        for data in self.datas:
+            data.stop()
+
+        if self._historylog is not None:
+            self._historylog.stop()
+
+        return self.runstrats[0]
+
     def _runnext_old(self, runstrats):
         '''
         Actual implementation of run in full next mode. All objects have its
@@ -1427,6 +1709,9 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
                     self._next_writers(runstrats)
 
+                if self._snapshotreq is not None:
+                    self._takesnapshot()
+
         # Last notification chance before stopping
         self._datanotify()
         if self._event_stop:  # stop if requested
@@ -1435,14 +1720,17 @@ class Cerebro(with_metaclass(MetaParams, object)):
         if self._event_stop:  # stop if requested
             return
 
-    def _runonce_old(self, runstrats):
+    def _runonce_old(self, runstrats, more=False):
         '''
         Actual implementation of run in vector mode.
         Strategies are still invoked on a pseudo-event mode in which ``next``
         is called for each data arrival
         '''
         for strat in runstrats:
-            strat._once()
+            if more:  # continuation: only the new values
+                strat._oncemore()
+            else:
+                strat._once()
 
         # The default once for strategies does nothing and therefore
         # has not moved forward all datas/indicators/observers that
@@ -1450,7 +1738,7 @@ class Cerebro(with_metaclass(MetaParams, object)):
         # here again, because pointers are at 0
         data0 = self.datas[0]
         datas = self.datas[1:]
-        for i in range(data0.buflen()):
+        for i in range(len(data0), data0.buflen()):
             data0.advance()
             for data in datas:
                 data.advance(datamaster=data0)
@@ -1467,6 +1755,9 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
                 self._next_writers(runstrats)
 
+            if self._snapshotreq is not None:
+                self._takesnapshot()
+
     def _next_writers(self, runstrats):
         if not self.runwriters:
             return
@@ -1633,6 +1924,9 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
                     self._next_writers(runstrats)
 
+                if self._snapshotreq is not None:
+                    self._takesnapshot()
+
         # Last notification chance before stopping
         self._datanotify()
         if self._event_stop:  # stop if requested
@@ -1641,7 +1935,7 @@ class Cerebro(with_metaclass(MetaParams, object)):
         if self._event_stop:  # stop if requested
             return
 
-    def _runonce(self, runstrats):
+    def _runonce(self, runstrats, more=False):
         '''
         Actual implementation of run in vector mode.
 
@@ -1649,8 +1943,11 @@ class Cerebro(with_metaclass(MetaParams, object)):
         is called for each data arrival
         '''
         for strat in runstrats:
-            strat._once()
-            strat.reset()  # strat called next by next - reset lines
+            if more:  # continuation: only the new values
+                strat._oncemore()
+            else:
+                strat._once()
+                strat.reset()  # strat called next by next - reset lines
 
         # The default once for strategies does nothing and therefore
         # has not moved forward all datas/indicators/observers that
@@ -1698,10 +1995,23 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
                 self._next_writers(runstrats)
 
+            if self._snapshotreq is not None:
+                self._takesnapshot()
+
     def _check_timers(self, runstrats, dt0, cheat=False):
         timers = self._timers if not cheat else self._timerscheat
-        for t in timers:
-            if not t.check(dt0):
+        if not timers or dt0 < timers[0][0]:
+            return  # no timer is due
+
+        dues = []
+        while timers and timers[0][0] <= dt0:
+            dues.append(heapq.heappop(timers)[-1])
+
+        dues.sort(key=lambda x: x.p.tid)  # check in the order of creation
+        for t in dues:
+            ret = t.check(dt0)
+            heapq.heappush(timers, (t.nextdt, t.p.tid, t))
+            if not ret:
                 continue
 
             t.params.owner.notify_timer(t, t.lastwhen, *t.args, **t.kwargs)
@@ -21,10 +21,12 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import array
 import collections
 import datetime
 import inspect
 import io
+import itertools
 import os.path
 
 import backtrader as bt
@@ -155,6 +157,7 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
 
     _clone = False
     _qcheck = 0.0
+    _resumedt = float('-inf')  # last bar before a snapshot was taken
 
     _tmoffset = datetime.timedelta()
 
@@ -164,6 +167,8 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
 
     _started = False
 
+    _preticks = None  # ticks of a replayed data preloaded with preloadticks
+
     def _start_finish(self):
         # A live feed (for example) may have learnt something about the
         # timezones after the start and that's why the date/time related
@@ -205,15 +210,33 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
         if not self._started:
             self._start_finish()
 
+    def _reopen(self):
+        # Restart after a run to deliver the bars added to the source after
+        # the last one which was seen (see Cerebro.runcontinue)
+        if len(self):
+            self._resumedt = self.lines.datetime[0]
+
+        for ff, fargs, fkwargs in self._filters:
+            if hasattr(ff, 'reopen'):
+                ff.reopen(self, *fargs, **fkwargs)
+
+        self._start()
+
     def _timeoffset(self):
         return self._tmoffset
 
-    def _getnexteos(self):
-        '''Returns the next eos using a trading calendar if available'''
-        if not len(self):
-            return datetime.datetime.min, 0.0
+    def _getnexteos(self, dt=None):
+        '''Returns the next eos using a trading calendar if available
+
+        If ``dt`` is given the eos is calculated for it instead of for the
+        current bar
+        '''
+        if dt is None:
+            if not len(self):
+                return datetime.datetime.min, 0.0
+
+            dt = self.lines.datetime[0]
 
-        dt = self.lines.datetime[0]
         dtime = num2date(dt)
         if self._calendar is None:
             nexteos = datetime.datetime.combine(dtime, self.p.sessionend)
@@ -300,6 +323,7 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
         self._barstack = collections.deque()
         self._barstash = collections.deque()
         self._laststatus = self.CONNECTED
+        self._preticks = None
 
     def stop(self):
         pass
@@ -432,12 +456,150 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
         return True
 
     def preload(self):
-        while self.load():
-            pass
+        # the preloaded bars are kept, even with a retention in place (see
+        # Cerebro.runcontinue), because they are only delivered later
+        retainmax = [line.retainmax for line in self.lines]
+        for line in self.lines:
+            line.retainmax = 0
+
+        try:
+            if self.replaying:
+                self._preloadticks()  # full bars cannot be preloaded
+
+            elif not self._preloadbulk():
+                while self.load():
+                    pass
+
+                self._last()
+        finally:
+            for line, rmax in zip(self.lines, retainmax):
+                line.retainmax = rmax
 
-        self._last()
         self.home()
 
+    def _preloadticks(self):
+        '''Loads all partial bars (ticks) produced by a replay filter, which
+        will later be delivered one by one by ``load`` without going to the
+        source of the data or through the filters
+
+        The ticks are not preloaded (and the data will be loaded during the
+        run) if the filters can still modify the delivered bars
+
+        Returns ``True`` if the ticks have been preloaded
+        '''
+        if self._ffilters:
+            return False  # "last" delivers when the source is exhausted
+
+        for ff, fargs, fkwargs in self._filters:
+            if not hasattr(ff, 'check'):
+                continue
+
+            if not getattr(ff, 'replaying', False) or ff.doadjusttime:
+                return False  # checks during the run deliver/modify bars
+
+        names = ['tick_' + x for x in self.getlinealiases() if x != 'datetime']
+        names.append('tick_last')
+        NaN = float('NaN')
+        noticks = [NaN] * len(names)
+
+        flags = array.array(str('b'))  # 1: new bar, 2: ticks not filled
+        values = array.array(str('d'))  # line values, flattened
+        ticks = array.array(str('d'))  # tick_xxx values, flattened
+
+        dlen = 0
+        while self.load():
+            flag = int(len(self) > dlen)
+            dlen = len(self)
+
+            values.extend([line[0] for line in self.itersize()])
+
+            tvals = [getattr(self, x, None) for x in names]
+            if tvals[0] is None:  # filled/nullified all together
+                flag |= 2
+                tvals = noticks
+
+            ticks.extend(tvals)
+            flags.append(flag)
+
+        for line in self.lines:
+            extension = line.extension  # lookahead
+            line.reset()
+            line.extend(size=extension)
+
+        self._preticks = (names, flags, values, ticks)
+        self._pretick = 0
+        return True
+
+    def _loadtick(self):
+        '''Delivers the next tick preloaded by ``_preloadticks``'''
+        names, flags, values, ticks = self._preticks
+        i = self._pretick
+        if i >= len(flags):
+            return False
+
+        self._pretick = i + 1
+
+        flag = flags[i]
+        if flag & 1:
+            self.forward()  # new bar, else the current bar is updated
+
+        size = self.size()
+        for line, val in zip(self.itersize(),
+                             values[i * size:(i + 1) * size]):
+            line[0] = val
+
+        if flag & 2:
+            for name in names:
+                setattr(self, name, None)
+        else:
+            nticks = len(names)
+            for name, val in zip(names, ticks[i * nticks:(i + 1) * nticks]):
+                setattr(self, name, val)
+
+        return True
+
+    def _preloadbulk(self):
+        '''Lets a filter which supports it (like the ``Resampler``) process
+        all bars in a single pass, instead of seeing them one by one during
+        ``load``
+
+        Returns ``False`` if the bars have not been loaded
+        '''
+        if len(self._filters) != 1:
+            return False  # a single filter can see all bars at once
+
+        ff, fargs, fkwargs = self._filters[0]
+        if not hasattr(ff, 'bulk'):
+            return False
+
+        dtline = self.lines.datetime
+        if dtline.mode != dtline.UnBounded or len(dtline.array):
+            return False  # bounded or already used/extended buffers
+
+        rawlines = self._preloadraw()
+        ff.bulk(self, rawlines, *fargs, **fkwargs)
+
+        while self._fromstack(forward=True):
+            pass  # consume the bars delivered by the filter
+
+        return True
+
+    def _preloadraw(self):
+        '''Loads all bars bypassing the filters and returns the values as a
+        list of arrays, in the order of the lines. The lines are left empty'''
+        filters, self._filters = self._filters, []
+        try:
+            while self.load():
+                pass
+        finally:
+            self._filters = filters
+
+        rawlines = [line.array for line in self.itersize()]
+        for line in self.lines:
+            line.reset()
+
+        return rawlines
+
     def _last(self, datamaster=None):
         # Last chance for filters to deliver something
         ret = 0
@@ -465,6 +627,9 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
             ff.check(self, _forcedata=forcedata, *fargs, **fkwargs)
 
     def load(self):
+        if self._preticks is not None:
+            return self._loadtick()
+
         while True:
             # move data pointer forward for new bar
             self.forward()
@@ -503,6 +668,10 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
                 # discard loaded bar and carry on
                 self.backwards()
                 continue
+            if dt <= self._resumedt:
+                # delivered before taking a snapshot (see Cerebro.restore)
+                self.backwards()
+                continue
             if dt > self.todate:
                 # discard loaded bar and break out
                 self.backwards(force=True)
@@ -682,11 +851,10 @@ class CSVDataBase(with_metaclass(MetaCSVDataBase, DataBase)):
             self.f = None
 
     def preload(self):
-        while self.load():
-            pass
+        super(CSVDataBase, self).preload()
 
-        self._last()
-        self.home()
+        if self.replaying and self._preticks is None:
+            return  # not preloaded, the file is read during the run
 
         # preloaded - no need to keep the object around - breaks multip in 3.x
         self.f.close()
@@ -730,8 +898,23 @@ class CSVFeedBase(FeedBase):
 
 
 class DataClone(AbstractDataBase):
+    '''Delivers the bars of another data feed (``dataname``)
+
+    Params:
+
+      - ``sharebuffers`` (default: ``True``)
+
+        If the guest data has been preloaded and the clone has neither
+        filters nor a resampling/replaying in place, the lines of the clone
+        share the buffers of the guest. Only the index pointers are
+        independent and no value is copied
+
+        Filtered clones always hold their own storage
+    '''
     _clone = True
 
+    params = (('sharebuffers', True),)
+
     def __init__(self):
         self.data = self.p.dataname
         self._dataname = self.data._dataname
@@ -768,12 +951,66 @@ class DataClone(AbstractDataBase):
         self._dlen = 0
         self._preloading = False
 
+    def _reopen(self):
+        super(DataClone, self)._reopen()
+        self._dlen = len(self.data)  # bars of the guest already delivered
+
     def preload(self):
+        if self._sharebuffers():
+            self.home()
+            return
+
+        for line, dline in zip(self.lines, self.data.lines):
+            if line.array is dline.array:  # shared in a previous preload
+                line.array = array.array(str('d'),
+                                         line.array[:self._sharedlen])
+
         self._preloading = True
         super(DataClone, self).preload()
         self.data.home()  # preloading data was pushed forward
         self._preloading = False
 
+    def _sharebuffers(self):
+        # the values of an unfiltered clone are those of the guest: point the
+        # lines to the already preloaded arrays of the guest
+        if not self.p.sharebuffers or self._filters or self._ffilters:
+            return False
+
+        if not self.data.buflen():
+            return False  # guest not preloaded
+
+        if self.lines.size() > self.data.lines.size():
+            return False
+
+        for line in itertools.chain(self.lines, self.data.lines):
+            if line.mode != line.UnBounded:
+                return False
+
+        for line, dline in zip(self.lines, self.data.lines):
+            line.array = dline.array
+            line.extension = dline.extension
+
+        self._sharedlen = self.data.buflen()
+        return True
+
+    def _preloadticks(self):
+        # ticks are taken from the guest, which has to be preloaded and
+        # discarding late ticks would leave the clone ahead of the guest
+        if not self.data.buflen():
+            return False
+
+        for ff, fargs, fkwargs in self._filters:
+            if getattr(ff, 'replaying', False) and not ff.p.takelate:
+                return False
+
+        return super(DataClone, self)._preloadticks()
+
+    def _preloadraw(self):
+        # the guest data is preloaded and has gone through the same date
+        # filters: take the values directly from it
+        return [dline.array[:self.data.buflen()]
+                for line, dline in zip(self.itersize(), self.data.lines)]
+
     def _load(self):
         # assumption: the data is in the system
         # simply copy the lines
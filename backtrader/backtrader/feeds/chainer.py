@@ -47,16 +47,26 @@ class MetaChainer(bt.DataBase.__class__):
 
 
 class Chainer(bt.with_metaclass(MetaChainer, bt.DataBase)):
-    '''Class that chains datas'''
+    '''Class that chains datas
+
+    The chained datas are preloaded (if ``Cerebro`` preloads) and the chain
+    is built from the preloaded buffers, unless any of the datas is live
+    '''
 
     def islive(self):
         '''Returns ``True`` to notify ``Cerebro`` that preloading and runonce
-        should be deactivated'''
-        return True
+        should be deactivated, if any of the chained datas is live'''
+        return any(d.islive() for d in self._args)
 
     def __init__(self, *args):
         self._args = args
 
+    def preload(self):
+        for d in self._args:
+            d.preload()  # _load will then move along the preloaded buffers
+
+        super(Chainer, self).preload()
+
     def start(self):
         super(Chainer, self).start()
         for d in self._args:
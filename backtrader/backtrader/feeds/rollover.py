@@ -48,6 +48,9 @@ class MetaRollOver(bt.DataBase.__class__):
 class RollOver(bt.with_metaclass(MetaRollOver, bt.DataBase)):
     '''Class that rolls over to the next future when a condition is met
 
+    The futures are preloaded (if ``Cerebro`` preloads) and the roll over
+    logic runs along the preloaded buffers, unless any of the futures is live
+
     Params:
 
         - ``checkdate`` (default: ``None``)
@@ -108,12 +111,18 @@ class RollOver(bt.with_metaclass(MetaRollOver, bt.DataBase)):
 
     def islive(self):
         '''Returns ``True`` to notify ``Cerebro`` that preloading and runonce
-        should be deactivated'''
-        return True
+        should be deactivated, if any of the futures is live'''
+        return any(d.islive() for d in self._rolls)
 
     def __init__(self, *args):
         self._rolls = args
 
+    def preload(self):
+        for d in self._rolls:
+            d.preload()  # _load will then move along the preloaded buffers
+
+        super(RollOver, self).preload()
+
     def start(self):
         super(RollOver, self).start()
         for d in self._rolls:
@@ -152,7 +161,11 @@ class RollOver(bt.with_metaclass(MetaRollOver, bt.DataBase)):
 
     def _load(self):
         while self._d is not None:
-            if self._d.next() is not False:  # no values from current data src
+            _next = self._d.next()
+            if _next is None:  # no values yet, let the caller come back
+                return None
+
+            if _next is False:  # no values from current data src
                 if self._ds:
                     self._d = self._ds.pop(0)
                     self._dts.pop(0)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import json
+
+from .metabase import MetaParams
+from .utils import num2date
+from .utils.py3 import string_types, with_metaclass
+
+
+__all__ = ['HistoryLog']
+
+
+def _dt2str(dt):
+    return num2date(dt).isoformat() if dt else None
+
+
+class HistoryLog(with_metaclass(MetaParams, object)):
+    '''Append-only log for the completed orders and the closed trades which
+    a strategy removes from memory (see the ``history`` parameter of
+    ``Cerebro``)
+
+    Each order/trade is written out as a JSON object in a single line.
+    Together with the orders/trades still held in memory, the log contains
+    the full history of the strategy
+
+    Params:
+
+      - ``out`` (default: ``None``): stream to write to. If a string is
+        passed, a file with that name is opened in append mode
+
+      - ``close_out`` (default: ``False``): if ``out`` is a stream, whether
+        it has to be explicitly closed when the log stops
+    '''
+    params = (
+        ('out', None),
+        ('close_out', False),
+    )
+
+    def __init__(self):
+        self.out = None
+
+    def start(self):
+        if isinstance(self.p.out, string_types):
+            self.out = open(self.p.out, 'a')
+            self.close_out = True
+        else:
+            self.out = self.p.out
+            self.close_out = self.p.close_out
+
+    def stop(self):
+        if self.out is not None:
+            self.out.flush()
+            if self.close_out:
+                self.out.close()
+
+            self.out = None
+
+    def write(self, record):
+        if self.out is not None:
+            self.out.write(json.dumps(record) + '\n')
+
+    def order(self, order):
+        '''Writes out an order which is no longer alive'''
+        created, executed = order.created, order.executed
+        self.write(dict(
+            type='order',
+            ref=order.ref,
+            data=order.data._name,
+            tradeid=order.tradeid,
+            ordtype=order.ordtypename(),
+            exectype=order.getordername(),
+            status=order.getstatusname(),
+            created=dict(dt=_dt2str(created.dt), size=created.size,
+                         price=created.price),
+            executed=dict(dt=_dt2str(executed.dt), size=executed.size,
+                          price=executed.price, value=executed.value,
+                          comm=executed.comm, pnl=executed.pnl),
+        ))
+
+    def trade(self, trade):
+        '''Writes out a closed trade (and its history if recorded)'''
+        history = [
+            dict(dt=_dt2str(h.status.dt), size=h.status.size,
+                 price=h.status.price, pnl=h.status.pnl,
+                 pnlcomm=h.status.pnlcomm, order=h.event.order.ref,
+                 eventsize=h.event.size, eventprice=h.event.price,
+                 commission=h.event.commission)
+            for h in trade.history
+        ]
+        self.write(dict(
+            type='trade',
+            ref=trade.ref,
+            data=trade.data._name,
+            tradeid=trade.tradeid,
+            status=trade.status_names[trade.status],
+            long=trade.long,
+            price=trade.price,
+            commission=trade.commission,
+            pnl=trade.pnl,
+            pnlcomm=trade.pnlcomm,
+            baropen=trade.baropen,
+            dtopen=_dt2str(trade.dtopen),
+            barclose=trade.barclose,
+            dtclose=_dt2str(trade.dtclose),
+            barlen=trade.barlen,
+            history=history,
+        ))
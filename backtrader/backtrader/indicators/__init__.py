@@ -88,3 +88,6 @@ from .ichimoku import *
 from .hurst import *
 from .ols import *
 from .hadelta import *
+
+# Load contributed indicators
+from . import contrib
@@ -21,8 +21,12 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
-import backtrader as bt
+import sys
 
 from .import vortex as vortex
+
+# Loaded at the end of the indicators package (which may still be missing
+# as an attribute of backtrader)
+_indicators = sys.modules[__name__.rpartition('.')[0]]
 for name in vortex.__all__:
-    setattr(bt.indicators, name, getattr(vortex, name))
+    setattr(_indicators, name, getattr(vortex, name))
@@ -21,51 +21,155 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import collections
+
 import backtrader as bt
+from ..utils.py3 import range, zip
 from . import PeriodN
 
 
+NaN = float('NaN')
+
+
 __all__ = ['OLS_Slope_InterceptN', 'OLS_TransformationN', 'OLS_BetaN',
            'CointN']
 
 
 class OLS_Slope_InterceptN(PeriodN):
     '''
-    Calculates a linear regression using ``statsmodel.OLS`` (Ordinary least
-    squares) of data1 on data0
-
-    Uses ``pandas`` and ``statsmodels``
-
-    Use ``prepend_constant`` to influence the paramter ``prepend`` of
-    sm.add_constant
+    Calculates a linear regression (Ordinary least squares) of data0 on data1
+    over the last ``period`` values
+
+    The closed form of the regression is used. The sums of ``x``, ``y``,
+    ``x * y`` and ``x * x`` are updated in ``next`` by adding the newest
+    values and removing the oldest ones and are calculated from cumulative
+    sums in ``once``. The values are offset by the first seen ones to keep the
+    precision of the sums
+
+    The results are those of ``statsmodels.OLS`` for data0 on data1 and a
+    constant. Use ``prepend_constant`` to influence the order of the results
+    like the parameter ``prepend`` of ``sm.add_constant`` does: if ``True``
+    the constant is the first result (``slope``) and the coefficient of data1
+    the second (``intercept``)
+
+    If any value in the period is ``NaN`` the results are ``NaN``
     '''
     _mindatas = 2  # ensure at least 2 data feeds are passed
 
-    packages = (
-        ('pandas', 'pd'),
-        ('statsmodels.api', 'sm'),
-    )
     lines = ('slope', 'intercept',)
     params = (
         ('period', 10),
         ('prepend_constant', True),
     )
 
+    def __init__(self):
+        super(OLS_Slope_InterceptN, self).__init__()
+        self._window = collections.deque()  # offset values in the period
+        self._sums = [0.0, 0.0, 0.0, 0.0]  # x, y, xy, xx
+        self._nans = 0  # number of NaN pairs in the window
+        self._offset = None
+
+    def _results(self, n, sx, sy, sxy, sxx, x0, y0):
+        den = n * sxx - sx * sx
+        if not den:
+            return NaN, NaN  # data1 is constant in the period
+
+        beta = (n * sxy - sx * sy) / den
+        alpha = y0 + (sy - beta * sx) / n - beta * x0
+        if self.p.prepend_constant:
+            return alpha, beta
+
+        return beta, alpha
+
+    def _add(self):
+        window, sums = self._window, self._sums
+        if len(window) == self.p.period:
+            x, y = window.popleft()
+            if x != x:
+                self._nans -= 1
+            else:
+                sums[0] -= x
+                sums[1] -= y
+                sums[2] -= x * y
+                sums[3] -= x * x
+
+        x, y = self.data1[0], self.data0[0]
+        if x != x or y != y:
+            self._nans += 1
+            window.append((NaN, NaN))
+            return
+
+        if self._offset is None:
+            self._offset = (x, y)
+
+        x0, y0 = self._offset
+        x, y = x - x0, y - y0
+        window.append((x, y))
+        sums[0] += x
+        sums[1] += y
+        sums[2] += x * y
+        sums[3] += x * x
+
+    def prenext(self):
+        self._add()
+
     def next(self):
-        p0 = pd.Series(self.data0.get(size=self.p.period))
-        p1 = pd.Series(self.data1.get(size=self.p.period))
-        p1 = sm.add_constant(p1, prepend=self.p.prepend_constant)
-        slope, intercept = sm.OLS(p0, p1).fit().params
+        self._add()
+        if self._nans:
+            slope, intercept = NaN, NaN
+        else:
+            slope, intercept = self._results(
+                len(self._window), *(self._sums + list(self._offset)))
 
         self.lines.slope[0] = slope
         self.lines.intercept[0] = intercept
 
+    def once(self, start, end):
+        slopes = self.lines.slope.array
+        intercepts = self.lines.intercept.array
+        xs, ys = self.data1.array, self.data0.array
+        period = self.p.period
+
+        base = max(0, start - period + 1)
+        for x0, y0 in zip(xs[base:end], ys[base:end]):
+            if x0 == x0 and y0 == y0:
+                break
+        else:
+            x0 = y0 = 0.0  # only NaN
+
+        # cumulative sums (and NaN count) up to each index (excluded)
+        csums = [(0.0, 0.0, 0.0, 0.0, 0)]
+        sx = sy = sxy = sxx = 0.0
+        nans = 0
+        for x, y in zip(xs[base:end], ys[base:end]):
+            if x != x or y != y:
+                nans += 1
+            else:
+                x, y = x - x0, y - y0
+                sx += x
+                sy += y
+                sxy += x * y
+                sxx += x * x
+
+            csums.append((sx, sy, sxy, sxx, nans))
+
+        for i in range(start, end):
+            last, first = csums[i + 1 - base], csums[i + 1 - period - base]
+            if last[4] - first[4]:
+                slope, intercept = NaN, NaN
+            else:
+                slope, intercept = self._results(
+                    period, last[0] - first[0], last[1] - first[1],
+                    last[2] - first[2], last[3] - first[3], x0, y0)
+
+            slopes[i] = slope
+            intercepts[i] = intercept
+
 
 class OLS_TransformationN(PeriodN):
     '''
-    Calculates the ``zscore`` for data0 and data1. Although it doesn't directly
-    uses any external package it relies on ``OLS_SlopeInterceptN`` which uses
-    ``pandas`` and ``statsmodels``
+    Calculates the ``zscore`` for data0 and data1 from the spread of the
+    regression calculated by ``OLS_Slope_InterceptN``
     '''
     _mindatas = 2  # ensure at least 2 data feeds are passed
     lines = ('spread', 'spread_mean', 'spread_std', 'zscore',)
@@ -72,6 +72,9 @@ class LineBuffer(LineSingle):
 
     UnBounded, QBuffer = (0, 1)
 
+    retainsize = 0  # values kept in the buffer when compacting (0: all)
+    retainmax = 0  # buffer size which triggers the compaction (0: never)
+
     def __init__(self):
         self.lines = [self]
         self.mode = self.UnBounded
@@ -125,6 +128,27 @@ class LineBuffer(LineSingle):
         self.lenmark = self.maxlen - (not self.extrasize)
         self.reset()
 
+    def retain(self, size):
+        '''Keeps only the last ``size`` values (at least) in an unbounded
+        buffer. The oldest values are discarded in chunks of ``size`` when
+        the buffer grows to twice that size, which keeps the cost per
+        ``forward`` constant
+
+        The logical length and the *ago* based indexing are not affected.
+        The absolute indices (``getzero``, ``plot``) refer to the values still
+        held in the buffer
+        '''
+        if self.mode == self.QBuffer:
+            return  # already bounded
+
+        self.retainsize = max(self.retainsize, size)  # shared by many owners
+        self.retainmax = 2 * self.retainsize
+
+    def _compact(self):
+        drop = self.buflen() - self.retainsize
+        del self.array[:drop]
+        self.idx -= drop
+
     def getindicators(self):
         return []
 
@@ -257,6 +281,9 @@ class LineBuffer(LineSingle):
         for i in range(size):
             self.array.append(value)
 
+        if self.retainmax and self.buflen() >= self.retainmax:
+            self._compact()
+
     def backwards(self, size=1, force=False):
         ''' Moves the logical index backwards and reduces the buffer as much as needed
 
@@ -331,14 +358,15 @@ class LineBuffer(LineSingle):
 
         return self.array[start:end]
 
-    def oncebinding(self):
+    def oncebinding(self, start=0):
         '''
-        Executes the bindings when running in "once" mode
+        Executes the bindings when running in "once" mode (for the values
+        from ``start``)
         '''
         larray = self.array
         blen = self.buflen()
         for binding in self.bindings:
-            binding.array[0:blen] = larray[0:blen]
+            binding.array[start:blen] = larray[start:blen]
 
     def bind2lines(self, binding=0):
         '''
@@ -633,6 +661,43 @@ class LineActions(with_metaclass(MetaLineActions, LineBuffer)):
 
         self.oncebinding()
 
+    def _oncemore(self):
+        # _once for the values of the clock which are not yet calculated
+        start = self.buflen()
+        oncegrow(self, self._clock.buflen())
+        oncerange(self, start, self.buflen())
+
+
+def oncegrow(obj, size):
+    '''Extends the buffers of ``obj`` up to ``size`` values, keeping the
+    current position'''
+    size -= obj.buflen()
+    if size > 0:
+        for line in obj.lines:
+            if not hasattr(line.array, 'append'):  # once may set any array
+                line.array = array.array(str('d'), line.array)
+
+        obj.forward(size=size)
+        obj.rewind(size)
+
+
+def oncerange(obj, start, end):
+    '''Calculates in "once" mode the values of ``obj`` from ``start`` to
+    ``end``, calling ``preonce``, ``oncestart`` and ``once`` for the parts of
+    the range which are before, at and after the minimum period'''
+    minperiod = obj._minperiod
+    if start < minperiod - 1:
+        obj.preonce(start, min(minperiod - 1, end))
+
+    if start < minperiod <= end:
+        obj.oncestart(minperiod - 1, minperiod)
+
+    if max(start, minperiod) < end:
+        obj.once(max(start, minperiod), end)
+
+    for line in obj.lines:
+        line.oncebinding(start)
+
 
 def LineDelay(a, ago=0, **kwargs):
     if ago <= 0:
@@ -828,3 +893,98 @@ class LineOwnOperation(LineActions):
 
         for i in range(start, end):
             dst[i] = op(srca[i])
+
+
+def fusable(obj):
+    '''Returns ``True`` if ``obj`` is an operation which can be evaluated
+    inline as part of a fused chain of operations'''
+    if isinstance(obj, LinesOperation):
+        return not obj.btime  # time operations convert the values
+
+    return isinstance(obj, LineOwnOperation)
+
+
+def _fusedexpr(obj, fused, srcs, args, idx, root=False):
+    # Returns the source code for the value of obj (at index idx) and
+    # collects the lines (srcs) and the operations/constants (args) used
+    if not root and id(obj) not in fused:
+        for i, src in enumerate(srcs):
+            if src is obj:
+                break
+        else:
+            i = len(srcs)
+            srcs.append(obj)
+
+        return 's%d[%s]' % (i, idx)
+
+    args.append(obj.operation)
+    op = 'a%d' % (len(args) - 1)
+
+    if isinstance(obj, LineOwnOperation):
+        return '%s(%s)' % (op, _fusedexpr(obj.a, fused, srcs, args, idx))
+
+    if obj.bline:
+        return '%s(%s, %s)' % (op,
+                               _fusedexpr(obj.a, fused, srcs, args, idx),
+                               _fusedexpr(obj.b, fused, srcs, args, idx))
+
+    if not obj.r:
+        expr = _fusedexpr(obj.a, fused, srcs, args, idx)
+        args.append(obj.b)
+        return '%s(%s, a%d)' % (op, expr, len(args) - 1)
+
+    args.append(obj.a)
+    val = 'a%d' % (len(args) - 1)
+    return '%s(%s, %s)' % (op, val, _fusedexpr(obj.b, fused, srcs, args, idx))
+
+
+_FUSEDCODE = '''
+def fusednext({args}):
+    return {exprnext}
+
+
+def fusedonce(dst, start, end, {args}):
+    for i in range(start, end):
+        dst[i] = {expronce}
+'''
+
+
+def fuseoperations(root, fused):
+    '''Replaces ``next`` and ``once`` of the operation ``root`` with a
+    single kernel which evaluates the chain of operations ending in it
+
+    ``fused`` holds the ``id`` of the operations absorbed in the chain. The
+    caller has to ensure that no other object uses their values, because
+    they are no longer calculated (nor stored)
+    '''
+    srcs, args = list(), list()
+    exprnext = _fusedexpr(root, fused, srcs, args, '0', root=True)
+    expronce = _fusedexpr(root, fused, list(), list(), 'i', root=True)
+
+    argnames = ['s%d' % i for i in range(len(srcs))]
+    argnames += ['a%d' % i for i in range(len(args))]
+    code = _FUSEDCODE.format(args=', '.join(argnames),
+                             exprnext=exprnext, expronce=expronce)
+
+    namespace = dict(range=range)
+    exec(code, namespace)
+    fnext, fonce = namespace['fusednext'], namespace['fusedonce']
+
+    nextargs = srcs + args
+
+    def fusednext():
+        root[0] = fnext(*nextargs)
+
+    def fusedonce(start, end):
+        fonce(root.array, start, end, *([s.array for s in srcs] + args))
+
+    root.next = fusednext
+    root.once = fusedonce
+
+    # the absorbed operations no longer move: take the clock from the chain
+    clock = root._clock
+    while id(clock) in fused:
+        clock = clock._clock
+
+    root._clock = clock
+    root._datas = srcs  # for the buffer adjustments in qbuffer
@@ -22,14 +22,18 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import collections
+import gc
+import itertools
 import operator
 import sys
+import types
 
 from .utils.py3 import map, range, zip, with_metaclass, string_types
 from .utils import DotDict
 
 from .lineroot import LineRoot, LineSingle
-from .linebuffer import LineActions, LineNum
+from .linebuffer import (LineActions, LineNum, fusable, fuseoperations,
+                         oncegrow, oncerange)
 from .lineseries import LineSeries, LineSeriesMaker
 from .dataseries import DataSeries
 from . import metabase
@@ -143,6 +147,9 @@ class MetaLineIterator(LineSeries.__class__):
 class LineIterator(with_metaclass(MetaLineIterator, LineSeries)):
     _nextforce = False  # force cerebro to run in next mode (runonce=False)
 
+    _plan = None  # flattened execution of the indicators (see _compileplan)
+    _planonce = None
+
     _mindatas = 1
     _ltype = LineSeries.IndType
 
@@ -251,11 +258,120 @@ class LineIterator(with_metaclass(MetaLineIterator, LineSeries)):
     bind2lines = bindlines
     bind2line = bind2lines
 
+    def _compileplan(self):
+        '''Flattens the tree of indicators (and lines operations) which hang
+        from this object into lists of steps in execution order. The steps
+        are executed by ``_runplan`` (``next``) and ``_runplanonce``
+        (``once``) without recursing into the tree
+
+        Objects which redefine how they are iterated are kept as a single
+        step which calls their ``_next``/``_once``
+        '''
+        plan, planonce = list(), list()
+        for indicator in self._lineiterators[LineIterator.IndType]:
+            _plannext(indicator, plan)
+            _planonce(indicator, planonce)
+
+        self._plan, self._planonce = plan, planonce
+
+    def _fuseoperations(self):
+        '''Fuses the chains of lines operations (like those created by
+        arithmetic expressions in ``__init__``) which hang from this object.
+        The intermediate operations whose result is only used by the next
+        operation in the chain are removed from the execution and the last
+        operation evaluates the entire chain in a single kernel
+
+        An operation is only fused if the operation graph shows a single
+        consumer (another operation of the same owner) and nothing else
+        holds a reference to it (see ``_unshared``)
+        '''
+        objs = list(_itertree(self, (LineIterator.IndType,)))
+        refobjs = list(_itertree(self, (LineIterator.ObsType,)))
+
+        # edges of the operation graph: the inputs of operations and of
+        # lineiterators
+        uses = collections.defaultdict(int)  # uses of each object
+        consumers = dict()
+        for obj in itertools.chain([self], objs, refobjs):
+            if isinstance(obj, LineActions):
+                for x in obj._datas:
+                    uses[id(x)] += 1
+                    consumers[id(x)] = obj
+
+                continue
+
+            for data in obj.datas:
+                uses[id(data)] += 1
+
+        candidates = dict()
+        for obj in objs:
+            if not fusable(obj) or obj.bindings or uses[id(obj)] != 1:
+                continue
+
+            consumer = consumers.get(id(obj), None)
+            if consumer is None or not fusable(consumer):
+                continue
+
+            if consumer._owner is obj._owner:
+                candidates[id(obj)] = (obj, consumer)
+
+        fused = dict()
+        for obj, consumer in _unshared(candidates, objs, consumers):
+            fused[id(obj)] = consumer
+
+        roots = dict()
+        for consumer in fused.values():
+            while id(consumer) in fused:
+                consumer = fused[id(consumer)]
+
+            roots[id(consumer)] = consumer
+
+        for root in roots.values():
+            fuseoperations(root, fused)
+
+        for obj in objs:
+            if id(obj) in fused:
+                indicators = obj._owner._lineiterators[LineIterator.IndType]
+                for i, indicator in enumerate(indicators):
+                    if indicator is obj:
+                        del indicators[i]
+                        break
+
+    def _runplan(self):
+        for step, obj, clock, minper, nxt, nxtstart, prenxt in self._plan:
+            if step == _PLAN_FWD:
+                if len(clock) != len(obj):
+                    obj.forward()
+
+                continue
+
+            if step == _PLAN_OBJ:
+                obj._next()
+                continue
+
+            clock_len = len(clock)
+            if step == _PLAN_ACT and clock_len > len(obj):
+                obj.forward()
+
+            if clock_len > minper:
+                nxt()
+            elif clock_len == minper:
+                nxtstart()  # only called for the 1st value
+            elif clock_len or step == _PLAN_ACT:
+                prenxt()
+
+    def _runplanonce(self):
+        for step in self._planonce:
+            step()
+
     def _next(self):
         clock_len = self._clk_update()
 
-        for indicator in self._lineiterators[LineIterator.IndType]:
-            indicator._next()
+        if self._plan is not None:
+            self._runplan()
+        else:
+            for indicator in self._lineiterators[LineIterator.IndType]:
+                indicator._next()
 
         self._notify()
 
@@ -286,13 +402,32 @@ class LineIterator(with_metaclass(MetaLineIterator, LineSeries)):
         return clock_len
 
     def _once(self):
+        self._onceforward()
+
+        if self._planonce is not None:
+            self._runplanonce()
+        else:
+            for indicator in self._lineiterators[LineIterator.IndType]:
+                indicator._once()
+
+        self._oncecalc()
+
+    def _onceforward(self):
         self.forward(size=self._clock.buflen())
 
+    def _oncemore(self):
+        # _once for the values of the clock which are not yet calculated
+        start = self.buflen()
+        oncegrow(self, self._clock.buflen())
         for indicator in self._lineiterators[LineIterator.IndType]:
-            indicator._once()
+            indicator._oncemore()
 
+        oncerange(self, start, self.buflen())
+
+    def _oncecalc(self):
         for observer in self._lineiterators[LineIterator.ObsType]:
-            observer.forward(size=self.buflen())
+            if not observer._lazy:  # lazy ones build the lines at the end
+                observer.forward(size=self.buflen())
 
         for data in self.datas:
             data.home()
@@ -370,6 +505,111 @@ class LineIterator(with_metaclass(MetaLineIterator, LineSeries)):
         for data in self.datas:
             data.minbuffer(self._minperiod)
 
+    def retain(self, size):
+        for line in self.lines:
+            line.retain(size)
+
+        for objs in self._lineiterators.values():
+            for obj in objs:
+                obj.retain(size)
+
+
+def _itertree(obj, ltypes):
+    for ltype in ltypes:
+        for child in obj._lineiterators[ltype]:
+            yield child
+            if isinstance(child, LineIterator):
+                for x in _itertree(child, (LineIterator.IndType,)):
+                    yield x
+
+
+def _unshared(candidates, *ignore):
+    # Returns the (obj, consumer) pairs of candidates whose operation is
+    # only referenced by the operation graph: the execution list of its
+    # owner, the consumer (and its inputs) and the operation itself.
+    # Anything else (a dict or container in user code, the signals of a
+    # strategy, an analyzer, ...) may read the buffer of the operation,
+    # which is no longer filled once fused
+    if not candidates:
+        return []
+
+    known = dict()
+    for obj, consumer in candidates.values():
+        holders = set([id(obj._owner._lineiterators[LineIterator.IndType]),
+                       id(consumer._datas)])
+        for holder in (obj, consumer):
+            holders.add(id(holder))
+            attrs = holder.__dict__
+            holders.add(id(attrs))
+            for val in attrs.values():
+                if isinstance(val, (list, tuple)):
+                    holders.add(id(val))
+
+        known[id(obj)] = holders
+
+    ours = set(id(x) for x in ignore)
+    ours.add(id(candidates))
+    ours.update(id(pair) for pair in candidates.values())
+
+    objs = [obj for obj, consumer in candidates.values()]
+    ours.add(id(objs))
+
+    shared = set()
+    for ref in gc.get_referrers(*objs):
+        if id(ref) in ours or isinstance(ref, types.FrameType):
+            continue
+
+        for x in gc.get_referents(ref):
+            holders = known.get(id(x), None)
+            if holders is not None and id(ref) not in holders:
+                shared.add(id(x))
+
+    return [pair for key, pair in candidates.items() if key not in shared]
+
+
+# Steps of an execution plan (see LineIterator._compileplan)
+_PLAN_FWD, _PLAN_RUN, _PLAN_ACT, _PLAN_OBJ = range(4)
+
+
+def _plannext(obj, plan):
+    ocls = type(obj)
+    if isinstance(obj, LineIterator):
+        if (ocls._next != LineIterator._next or
+                ocls._clk_update != LineIterator._clk_update or
+                ocls._notify != LineIterator._notify):
+            plan.append((_PLAN_OBJ, obj, None, None, None, None, None))
+            return
+
+        plan.append((_PLAN_FWD, obj, obj._clock, None, None, None, None))
+
+        for indicator in obj._lineiterators[LineIterator.IndType]:
+            _plannext(indicator, plan)
+
+        step = _PLAN_RUN
+
+    elif isinstance(obj, LineActions) and ocls._next == LineActions._next:
+        step = _PLAN_ACT
+
+    else:
+        plan.append((_PLAN_OBJ, obj, None, None, None, None, None))
+        return
+
+    plan.append((step, obj, obj._clock, obj._minperiod,
+                 obj.next, obj.nextstart, obj.prenext))
+
+
+def _planonce(obj, plan):
+    if isinstance(obj, LineIterator) and type(obj)._once == LineIterator._once:
+        plan.append(obj._onceforward)
+
+        for indicator in obj._lineiterators[LineIterator.IndType]:
+            _planonce(indicator, plan)
+
+        plan.append(obj._oncecalc)
+
+    else:
+        plan.append(obj._once)
+
 
 # This 3 subclasses can be used for identification purposes within LineIterator
 # or even outside (like in LineObservers)
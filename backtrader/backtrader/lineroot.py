@@ -44,6 +44,15 @@ class MetaLineRoot(metabase.MetaParams):
     class is sought
     '''
 
+    def __call__(cls, *args, **kwargs):
+        # objects created during the construction find _obj as the owner
+        ownerstack = metabase.ownercontext.stack
+        depth = len(ownerstack)
+        try:
+            return super(MetaLineRoot, cls).__call__(*args, **kwargs)
+        finally:
+            del ownerstack[depth:]
+
     def donew(cls, *args, **kwargs):
         _obj, args, kwargs = super(MetaLineRoot, cls).donew(*args, **kwargs)
 
@@ -54,6 +63,8 @@ class MetaLineRoot(metabase.MetaParams):
                                          _obj._OwnerCls or LineMultiple,
                                          skip=ownerskip)
 
+        metabase.ownercontext.stack.append(_obj)  # popped in __call__
+
         # Parameter values have now been set before __init__
         return _obj, args, kwargs
 
@@ -101,6 +112,10 @@ class LineRoot(with_metaclass(MetaLineRoot, object)):
         '''Receive notification of how large the buffer must at least be'''
         raise NotImplementedError
 
+    def retain(self, size):
+        '''Keep only the last ``size`` values in the buffers'''
+        raise NotImplementedError
+
     def setminperiod(self, minperiod):
         '''
         Direct minperiod manipulation. It could be used for example
@@ -341,6 +356,10 @@ class LineMultiple(LineRoot):
         for line in self.lines:
             line.minbuffer(size)
 
+    def retain(self, size):
+        for line in self.lines:
+            line.retain(size)
+
 
 class LineSingle(LineRoot):
     '''
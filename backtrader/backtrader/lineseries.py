@@ -636,6 +636,10 @@ class LineSeriesStub(LineSeries):
         if not self.slave:
             super(LineSeriesStub, self).minbuffer(size)
 
+    def retain(self, size):
+        if not self.slave:
+            super(LineSeriesStub, self).retain(size)
+
 
 def LineSeriesMaker(arg, slave=False):
     if isinstance(arg, LineSeries):
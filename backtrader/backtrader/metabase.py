@@ -24,6 +24,7 @@ from __future__ import (absolute_import, division, print_function,
 from collections import OrderedDict
 import itertools
 import sys
+import threading
 
 import backtrader as bt
 from .utils.py3 import zip, string_types, with_metaclass
@@ -39,7 +40,26 @@ def findbases(kls, topclass):
     return retval
 
 
+class OwnerContext(threading.local):
+    '''Keeps the objects which are being constructed (the innermost last)
+
+    Objects created during the construction of another object find their
+    owner here (see ``findowner``) without walking up the stack frames
+    '''
+    def __init__(self):
+        self.stack = list()
+
+
+ownercontext = OwnerContext()
+
+
 def findowner(owned, cls, startlevel=2, skip=None):
+    for obj in reversed(ownercontext.stack):
+        if obj is not owned and obj is not skip and isinstance(obj, cls):
+            return obj
+
+    # Not created during the construction of a cls instance. Look for it in
+    # the stack frames
     # skip this frame and the caller's -> start at 2
     for framelevel in itertools.count(startlevel):
         try:
@@ -94,6 +114,7 @@ class AutoInfoClass(object):
     _getpairsbase = classmethod(lambda cls: OrderedDict())
     _getpairs = classmethod(lambda cls: OrderedDict())
     _getrecurse = classmethod(lambda cls: False)
+    _pairstemplate = dict()  # plain (and fast to copy) version of the pairs
 
     @classmethod
     def _derive(cls, name, info, otherbases, recurse=False):
@@ -139,6 +160,7 @@ class AutoInfoClass(object):
                 classmethod(lambda cls: baseinfo.copy()))
         setattr(newcls, '_getpairs', classmethod(lambda cls: clsinfo.copy()))
         setattr(newcls, '_getrecurse', classmethod(lambda cls: recurse))
+        setattr(newcls, '_pairstemplate', dict(clsinfo))
 
         for infoname, infoval in info2add.items():
             if recurse:
@@ -238,9 +260,34 @@ class MetaParams(MetaBase):
         # Subclass and store the newly derived params class
         cls.params = params._derive(name, newparams, morebasesparams)
 
+        cls._packsdone = False  # packages imported at first instantiation
+
         return cls
 
     def donew(cls, *args, **kwargs):
+        if not cls._packsdone:
+            cls.doimport()
+            cls._packsdone = True
+
+        # Create params and set the values from the kwargs
+        params = cls.params()
+        pvalues = cls.params._pairstemplate.copy()
+        for pname in [x for x in kwargs if x in pvalues]:
+            pvalues[pname] = kwargs.pop(pname)
+
+        params.__dict__.update(pvalues)
+
+        # Create the object and set the params in place
+        _obj, args, kwargs = super(MetaParams, cls).donew(*args, **kwargs)
+        _obj.params = params
+        _obj.p = params  # shorter alias
+
+        # Parameter values have now been set before __init__
+        return _obj, args, kwargs
+
+    def doimport(cls):
+        '''Imports the ``packages`` and ``frompackages`` of the class into the
+        module in which the class is defined'''
         clsmod = sys.modules[cls.__module__]
         # import specified packages
         for p in cls.packages:
@@ -277,19 +324,6 @@ class MetaParams(MetaBase):
                 pattr = getattr(pmod, fp)
                 setattr(clsmod, falias, pattr)
 
-        # Create params and set the values from the kwargs
-        params = cls.params()
-        for pname, pdef in cls.params._getitems():
-            setattr(params, pname, kwargs.pop(pname, pdef))
-
-        # Create the object and set the params in place
-        _obj, args, kwargs = super(MetaParams, cls).donew(*args, **kwargs)
-        _obj.params = params
-        _obj.p = params  # shorter alias
-
-        # Parameter values have now been set before __init__
-        return _obj, args, kwargs
-
 
 class ParamsBase(with_metaclass(MetaParams, object)):
     pass  # stub to allow easy subclassing without metaclasses
@@ -53,6 +53,12 @@ class Observer(with_metaclass(MetaObserver, ObserverBase)):
 
     plotinfo = dict(plot=False, subplot=True)
 
+    # Observers which can record only sparse events during the run and build
+    # the lines from them at the end (lazystats in cerebro) set _canlazy to
+    # True and implement lazynext and lazybuild
+    _canlazy = False
+    _lazy = False
+
     # An Observer is ideally always observing and that' why prenext calls
     # next. The behaviour can be overriden by subclasses
     def prenext(self):
@@ -66,3 +72,31 @@ class Observer(with_metaclass(MetaObserver, ObserverBase)):
 
     def start(self):
         pass
+
+    def _lazystart(self):
+        self._lazy = True
+        self._lazylen = 0
+
+    def _lazynext(self, once):
+        # Follow the length the lines would have had (see _next_observers in
+        # the strategy and _next in LineIterator)
+        clock_len = len(self._owner if once else self._clock)
+        if clock_len:
+            self._lazylen = clock_len
+            self.lazynext(clock_len - 1)
+
+    def _lazybuild(self):
+        self.forward(size=self._lazylen)
+        self.lazybuild()
+        self._lazy = False
+
+    def lazynext(self, idx):
+        '''Called instead of ``next`` in lazy mode to record the events (if
+        any) for the absolute index ``idx`` of the lines'''
+        pass
+
+    def lazybuild(self):
+        '''Called at the end of a lazy run, once the lines have their final
+        length (filled with ``NaN``), to write down the recorded events. The
+        values can be set with ``self.lines[x].array[idx]``'''
+        pass
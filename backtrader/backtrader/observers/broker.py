@@ -21,9 +21,14 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import array
+
 from .. import Observer
 
 
+_NAN = float('NaN')
+
+
 class Cash(Observer):
     '''This observer keeps track of the current amount of cash in the broker
 
@@ -95,6 +100,8 @@ class Broker(Observer):
 
     plotinfo = dict(plot=True, subplot=True)
 
+    _canlazy = True
+
     def start(self):
         if self.p.fund is None:
             self._fundmode = self._owner.broker.fundmode
@@ -105,6 +112,10 @@ class Broker(Observer):
             self.plotlines.cash._plotskip = True
             self.plotlines.value._name = 'FundValue'
 
+        # lazy mode: changes of (cash, value) and index at which they happen
+        self._lazyidx = array.array(str('l'))
+        self._lazyvals = list()
+
     def next(self):
         if not self._fundmode:
             self.lines.value[0] = value = self._owner.broker.getvalue()
@@ -112,6 +123,31 @@ class Broker(Observer):
         else:
             self.lines.value[0] = self._owner.broker.fundvalue
 
+    def lazynext(self, idx):
+        broker = self._owner.broker
+        if not self._fundmode:
+            value = broker.getvalue()
+            vals = (broker.getcash(), value)
+        else:
+            vals = (_NAN, broker.fundvalue)  # same NaN object: tuples compare
+
+        lazyvals = self._lazyvals
+        if self._lazyidx and self._lazyidx[-1] == idx:  # same bar, overwrite
+            lazyvals[-1] = vals
+        elif not lazyvals or lazyvals[-1] != vals:
+            self._lazyidx.append(idx)
+            lazyvals.append(vals)
+
+    def lazybuild(self):
+        # each recorded value holds until the next change
+        lazyidx = self._lazyidx
+        ends = lazyidx[1:] + array.array(str('l'), [self._lazylen])
+        for line, i in ((self.lines.cash, 0), (self.lines.value, 1)):
+            larray = line.array
+            for start, end, vals in zip(lazyidx, ends, self._lazyvals):
+                larray[start:end] = array.array(str('d'), [vals[i]]) * (
+                    end - start)
+
 
 class FundValue(Observer):
     '''This observer keeps track of the current fund-like value
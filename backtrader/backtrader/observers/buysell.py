@@ -57,7 +57,12 @@ class BuySell(Observer):
         ('bardist', 0.015),  # distance to max/min in absolute perc
     )
 
-    def next(self):
+    _canlazy = True
+
+    def start(self):
+        self._lazyvals = dict()  # lazy mode: idx -> (buy, sell)
+
+    def _executions(self):
         buy = list()
         sell = list()
 
@@ -70,11 +75,13 @@ class BuySell(Observer):
             else:
                 sell.append(order.executed.price)
 
+        return buy, sell
+
+    def _values(self, curbuy, cursell, buy, sell):
         # Take into account replay ... something could already be in there
         # Write down the average buy/sell price
 
         # BUY
-        curbuy = self.lines.buy[0]
         if curbuy != curbuy:  # NaN
             curbuy = 0.0
             self.curbuylen = curbuylen = 0
@@ -84,19 +91,14 @@ class BuySell(Observer):
         buyops = (curbuy + math.fsum(buy))
         buylen = curbuylen + len(buy)
 
-        value = buyops / float(buylen or 'NaN')
-        if not self.p.barplot:
-            self.lines.buy[0] = value
-        elif value == value:  # Not NaN
-            pbuy = self.data.low[0] * (1 - self.p.bardist)
-            self.lines.buy[0] = pbuy
+        buyvalue = buyops / float(buylen or 'NaN')
+        if self.p.barplot and buyvalue == buyvalue:  # Not NaN
+            buyvalue = self.data.low[0] * (1 - self.p.bardist)
 
         # Update buylen values
-        curbuy = buyops
         self.curbuylen = buylen
 
         # SELL
-        cursell = self.lines.sell[0]
         if cursell != cursell:  # NaN
             cursell = 0.0
             self.curselllen = curselllen = 0
@@ -106,13 +108,37 @@ class BuySell(Observer):
         sellops = (cursell + math.fsum(sell))
         selllen = curselllen + len(sell)
 
-        value = sellops / float(selllen or 'NaN')
-        if not self.p.barplot:
-            self.lines.sell[0] = value
-        elif value == value:  # Not NaN
-            psell = self.data.high[0] * (1 + self.p.bardist)
-            self.lines.sell[0] = psell
+        sellvalue = sellops / float(selllen or 'NaN')
+        if self.p.barplot and sellvalue == sellvalue:  # Not NaN
+            sellvalue = self.data.high[0] * (1 + self.p.bardist)
 
         # Update selllen values
-        cursell = sellops
         self.curselllen = selllen
+
+        return buyvalue, sellvalue
+
+    def next(self):
+        buy, sell = self._executions()
+        buyvalue, sellvalue = self._values(
+            self.lines.buy[0], self.lines.sell[0], buy, sell)
+
+        self.lines.buy[0] = buyvalue
+        self.lines.sell[0] = sellvalue
+
+    def lazynext(self, idx):
+        buy, sell = self._executions()
+        curvals = self._lazyvals.get(idx, None)
+        if curvals is None:
+            if not buy and not sell:
+                return  # nothing executed, values remain NaN
+
+            curvals = (float('NaN'), float('NaN'))
+
+        self._lazyvals[idx] = self._values(curvals[0], curvals[1], buy, sell)
+
+    def lazybuild(self):
+        buyarray = self.lines.buy.array
+        sellarray = self.lines.sell.array
+        for idx, (buyvalue, sellvalue) in self._lazyvals.items():
+            buyarray[idx] = buyvalue
+            sellarray[idx] = sellvalue
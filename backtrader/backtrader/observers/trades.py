@@ -57,6 +57,8 @@ class Trades(Observer):
                       markersize=8.0, fillstyle='full')
     )
 
+    _canlazy = True
+
     def __init__(self):
 
         self.trades = 0
@@ -82,7 +84,10 @@ class Trades(Observer):
         self.trades_length_max = 0
         self.trades_length_min = 0
 
-    def next(self):
+        self._lazyvals = list()  # lazy mode: (idx, line, pnl)
+
+    def _closedtrades(self):
+        # (index of the line, pnl) for the closed trades
         for trade in self._owner._tradespending:
             if trade.data not in self.datas:
                 continue
@@ -90,10 +95,19 @@ class Trades(Observer):
             if not trade.isclosed:
                 continue
 
-            if trade.pnl >= 0:
-                self.lines.pnlplus[0] = trade.pnl
-            else:
-                self.lines.pnlminus[0] = trade.pnl
+            yield (0 if trade.pnl >= 0 else 1), trade.pnl
+
+    def next(self):
+        for lidx, pnl in self._closedtrades():
+            self.lines[lidx][0] = pnl
+
+    def lazynext(self, idx):
+        for lidx, pnl in self._closedtrades():
+            self._lazyvals.append((idx, lidx, pnl))
+
+    def lazybuild(self):
+        for idx, lidx, pnl in self._lazyvals:
+            self.lines[lidx].array[idx] = pnl
 
 
 class MetaDataTrades(Observer.__class__):
@@ -143,7 +157,13 @@ class DataTrades(with_metaclass(MetaDataTrades, Observer)):
 
     plotlines = dict()
 
-    def next(self):
+    _canlazy = True
+
+    def start(self):
+        self._lazyvals = list()  # lazy mode: (idx, line, pnl)
+
+    def _closedtrades(self):
+        # (index of the line, pnl) for the closed trades
         for trade in self._owner._tradespending:
             if trade.data not in self.datas:
                 continue
@@ -151,4 +171,16 @@ class DataTrades(with_metaclass(MetaDataTrades, Observer)):
             if not trade.isclosed:
                 continue
 
-            self.lines[trade.data._id - 1][0] = trade.pnl
+            yield trade.data._id - 1, trade.pnl
+
+    def next(self):
+        for lidx, pnl in self._closedtrades():
+            self.lines[lidx][0] = pnl
+
+    def lazynext(self, idx):
+        for lidx, pnl in self._closedtrades():
+            self._lazyvals.append((idx, lidx, pnl))
+
+    def lazybuild(self):
+        for idx, lidx, pnl in self._lazyvals:
+            self.lines[lidx].array[idx] = pnl
@@ -58,6 +58,14 @@ class OrderExecutionBit(object):
       - pprice: current open position price
 
     '''
+    # Many bits are created during a backtest (one per partial execution)
+    __slots__ = (
+        'dt', 'size', 'price',
+        'closed', 'opened', 'closedvalue', 'openedvalue',
+        'closedcomm', 'openedcomm',
+        'value', 'comm', 'pnl',
+        'psize', 'pprice',
+    )
 
     def __init__(self,
                  dt=None, size=0, price=0.0,
@@ -127,6 +135,15 @@ class OrderData(object):
     # the len of the exbits can be queried with no concerns about another
     # thread making an append and with no need for a lock
 
+    # Instances are created twice per order and copied with each notification
+    __slots__ = (
+        'pclose', 'exbits', 'p1', 'p2',
+        'dt', 'size', 'remsize', 'price', 'pricelimit', '_plimit',
+        'trailamount', 'trailpercent',
+        'value', 'comm', 'margin', 'pnl',
+        'psize', 'pprice',
+    )
+
     def __init__(self, dt=None, size=0, price=0.0, pricelimit=0.0, remsize=0,
                  pclose=0.0, trailamount=0.0, trailpercent=0.0):
 
@@ -213,6 +230,13 @@ class OrderData(object):
         # rebuild the indices to mark which exbits are pending in clone
         self.p1, self.p2 = self.p2, len(self.exbits)
 
+    def __copy__(self):
+        obj = self.__class__.__new__(self.__class__)
+        for attr in OrderData.__slots__:
+            setattr(obj, attr, getattr(self, attr))
+
+        return obj
+
     def clone(self):
         obj = copy(self)
         obj.markpending()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import numpy as np  # guaranteed by matplotlib
+
+
+def buckets(size, nbuckets):
+    '''Returns a list of (start, end) indices splitting ``size`` points into
+    (at most) ``nbuckets`` consecutive buckets of the same size, except the
+    last one which may be shorter'''
+    bsize = _bucketsize(size, nbuckets)
+    return [(start, min(start + bsize, size))
+            for start in range(0, size, bsize)]
+
+
+def _bucketsize(size, nbuckets):
+    nbuckets = max(1, min(size, nbuckets))
+    return -(-size // nbuckets)  # ceil: no more than nbuckets buckets
+
+
+def _reshaped(ys, bsize, fill):
+    # the values as a 2d array with a bucket per row, padding the last one
+    ys = np.asarray(ys, dtype=np.float64)
+    pad = -len(ys) % bsize
+    if pad:
+        ys = np.concatenate((ys, np.full(pad, fill)))
+
+    return ys.reshape(-1, bsize)
+
+
+def finite(ys):
+    '''Returns the indices of the values which are not NaN. Used for marker
+    only lines (like buy/sell signals) which are kept exact'''
+    return np.flatnonzero(~np.isnan(np.asarray(ys, dtype=np.float64)))
+
+
+def minmax(yss, threshold):
+    '''Returns the sorted indices of the minimum and maximum values for each
+    of the sequences in ``yss`` in each of the buckets in which the
+    sequences are split, which preserves the visual envelope of the values
+
+    The number of buckets is such that no more than ``threshold`` indices are
+    returned
+    '''
+    size = len(yss[0])
+    bsize = _bucketsize(size, threshold // (2 * len(yss)))
+    starts = np.arange(0, size, bsize)
+
+    idxs = []
+    for ys in yss:
+        ys = _reshaped(ys, bsize, np.nan)
+        nans = np.isnan(ys)
+        valid = ~nans.all(axis=1)  # buckets with a value
+        imin = np.where(nans, np.inf, ys).argmin(axis=1)
+        imax = np.where(nans, -np.inf, ys).argmax(axis=1)
+        idxs.append((starts + imin)[valid])
+        idxs.append((starts + imax)[valid])
+
+    return np.unique(np.concatenate(idxs))
+
+
+def _lttb(xs, ys, start, end, threshold):
+    # Largest-Triangle-Three-Buckets over xs/ys[start:end] (all finite)
+    size = end - start
+    if size <= threshold or threshold < 3:
+        return np.arange(start, end)
+
+    every = (size - 2) / (threshold - 2)
+    steps = np.arange(threshold - 1) * every
+    bstarts = start + steps.astype(np.intp) + 1  # last is the end of last
+
+    # average point of the next bucket is the 3rd vertex of the triangle
+    nstarts = bstarts[1:]
+    nend = min(start + int((threshold - 1) * every) + 1, end)
+    nlens = np.diff(np.append(nstarts, nend))
+    avgxs = np.add.reduceat(xs[:nend], nstarts) / nlens
+    avgys = np.add.reduceat(ys[:nend], nstarts) / nlens
+
+    a = start
+    idxs = [a]
+    for bstart, bend, avgx, avgy in zip(bstarts, nstarts, avgxs, avgys):
+        ax, ay = xs[a], ys[a]
+        bxs, bys = xs[bstart:bend], ys[bstart:bend]
+        areas = np.abs((ax - avgx) * (bys - ay) - (ax - bxs) * (avgy - ay))
+        a = bstart + int(areas.argmax())  # the 1st of the largest
+        idxs.append(a)
+
+    idxs.append(end - 1)
+    return np.array(idxs, dtype=np.intp)
+
+
+def lttb(xs, ys, threshold):
+    '''Returns the sorted indices of the (about) ``threshold`` points chosen
+    with the *Largest-Triangle-Three-Buckets* algorithm to represent the line
+    given by ``xs`` and ``ys``
+
+    Runs of NaN values split the line in segments which are downsampled
+    separately (with a share of ``threshold`` proportional to their size). A
+    NaN is kept in between segments to keep the gap in the line
+    '''
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+
+    # the runs of values start/end where the "finite" flag changes
+    edges = np.diff(np.concatenate(([0], ~np.isnan(ys), [0])).astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    total = (ends - starts).sum()
+    idxs = []
+    for start, end in zip(starts, ends):
+        if idxs:
+            idxs.append([idxs[-1][-1] + 1])  # nan after the previous run
+
+        rthreshold = max(3, threshold * (end - start) // total)
+        idxs.append(_lttb(xs, ys, start, end, rthreshold))
+
+    if not idxs:
+        return np.arange(0, dtype=np.intp)
+
+    return np.concatenate(idxs).astype(np.intp)
+
+
+def ohlcbuckets(xs, opens, highs, lows, closes, volumes, threshold):
+    '''Reduces the bars to (at most) ``threshold`` bars keeping open, maximum
+    high, minimum low, close and maximum volume in each bucket. The x
+    coordinate of a bar is the center of its bucket
+
+    Returns the reduced sequences and the width of a bucket along the x axis
+    '''
+    size = len(closes)
+    bsize = _bucketsize(size, threshold)
+    starts = np.arange(0, size, bsize)
+    lasts = np.minimum(starts + bsize, size) - 1
+
+    xs = np.asarray(xs, dtype=np.float64)
+    bxs = (xs[starts] + xs[lasts]) / 2.0
+    bopens = np.asarray(opens, dtype=np.float64)[starts]
+    bhighs = np.fmax.reduce(_reshaped(highs, bsize, -np.inf), axis=1)
+    blows = np.fmin.reduce(_reshaped(lows, bsize, np.inf), axis=1)
+    bcloses = np.asarray(closes, dtype=np.float64)[lasts]
+    bvolumes = np.fmax.reduce(_reshaped(volumes, bsize, -np.inf), axis=1)
+
+    width = (xs[-1] - xs[0] + 1) / len(starts)
+    return bxs, bopens, bhighs, blows, bcloses, bvolumes, width
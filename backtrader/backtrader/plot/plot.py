@@ -24,12 +24,14 @@ from __future__ import (absolute_import, division, print_function,
 import bisect
 import collections
 import datetime
+import functools
 import itertools
 import math
 import operator
 import sys
 
 import matplotlib
+from matplotlib.backend_bases import TimerBase
 import numpy as np  # guaranteed by matplotlib
 import matplotlib.dates as mdates
 import matplotlib.font_manager as mfontmgr
@@ -39,6 +41,7 @@ import matplotlib.ticker as mticker
 from ..utils.py3 import range, with_metaclass, string_types, integer_types
 from .. import AutoInfoClass, MetaParams, TimeFrame, date2num
 
+from .downsample import finite, lttb, minmax, ohlcbuckets
 from .finance import plot_candlestick, plot_ohlc, plot_volume, plot_lineonclose
 from .formatters import (MyVolFormatter, MyDateFormatter, getlocator)
 from . import locator as loc
@@ -65,6 +68,10 @@ class PInfo(object):
         self.handles = collections.defaultdict(list)
         self.labels = collections.defaultdict(list)
         self.legpos = collections.defaultdict(int)
+        self.lod = None
+        self.lodlines = list()
+        self.lodtimers = dict()  # ax -> timer delaying the zoom redraw
+        self.lodxlims = dict()  # ax -> x limits of the last zoom redraw
 
         self.prop = mfontmgr.FontProperties(size=self.sch.subtxtsize)
 
@@ -75,6 +82,7 @@ class PInfo(object):
         self.vaxis = list()
         self.row = 0
         self.sharex = None
+        self.lodlines = list()  # (line, xs, ys) to redraw when zooming
         return fig
 
     def nextcolor(self, ax):
@@ -167,6 +175,11 @@ class Plot_OldSync(with_metaclass(MetaParams, object)):
             fig = self.pinf.newfig(figid, numfig, self.mpyplot)
             figs.append(fig)
 
+            # maximum number of points per series (level of detail)
+            self.pinf.lod = self.pinf.sch.lod
+            if self.pinf.lod is True:  # use the pixel width of the figure
+                self.pinf.lod = int(fig.get_figwidth() * fig.dpi)
+
             self.pinf.pstart, self.pinf.pend, self.pinf.psize = pranges[numfig]
             self.pinf.xstart = self.pinf.pstart
             self.pinf.xend = self.pinf.pend
@@ -268,8 +281,76 @@ class Plot_OldSync(with_metaclass(MetaParams, object)):
             axtight = 'x' if not self.pinf.sch.ytight else 'both'
             self.mpyplot.autoscale(enable=True, axis=axtight, tight=True)
 
+            if self.pinf.lodlines:
+                # downsample again the visible part of the lines when zooming
+                lodredraw = functools.partial(
+                    self.lodredraw, self.pinf.lodlines, self.pinf.lod)
+                self.pinf.sharex.callbacks.connect('xlim_changed', lodredraw)
+
         return figs
 
+    def lodreduce(self, xdata, ydata, method='plot', markers=False):
+        '''Returns the points of ``xdata``/``ydata`` to hand over to
+        matplotlib, downsampled to the level of detail of the figure
+
+        Markers (lines without linestyle) keep all the points with values,
+        lines are downsampled with LTTB and other methods (like ``bar``)
+        keep the minimum and maximum of each bucket
+        '''
+        lod = self.pinf.lod
+        if not lod or len(ydata) <= lod:
+            return xdata, ydata
+
+        if markers:
+            idxs = finite(ydata)
+        elif method == 'plot':
+            idxs = lttb(xdata, ydata, lod)
+        else:
+            idxs = minmax([ydata], lod)
+
+        return np.asarray(xdata)[idxs], np.asarray(ydata)[idxs]
+
+    def lodredraw(self, lodlines, lod, ax):
+        # Panning and zooming change the limits many times per second. The
+        # lines are downsampled again only once the limits settle down
+        delay = self.pinf.sch.loddelay
+        if not delay:
+            return self._lodredraw(lodlines, lod, ax)
+
+        timer = self.pinf.lodtimers.get(ax)
+        if timer is None:
+            timer = ax.figure.canvas.new_timer(interval=delay)
+            if type(timer) is TimerBase:  # no event loop (Agg, ...)
+                return self._lodredraw(lodlines, lod, ax)
+
+            timer.single_shot = True
+            timer.add_callback(self._lodredraw, lodlines, lod, ax)
+            self.pinf.lodtimers[ax] = timer
+
+        timer.stop()
+        timer.start()
+
+    def _lodredraw(self, lodlines, lod, ax):
+        # Downsample the lines again with the points in the visible x range
+        xlim = tuple(ax.get_xlim())
+        if self.pinf.lodxlims.get(ax) == xlim:
+            return  # already drawn for these limits
+
+        self.pinf.lodxlims[ax] = xlim
+        xmin, xmax = xlim
+        for line, xs, ys in lodlines:
+            i0 = max(0, np.searchsorted(xs, xmin, 'left') - 1)  # 1 outside
+            i1 = np.searchsorted(xs, xmax, 'right') + 1
+            wxs, wys = xs[i0:i1], ys[i0:i1]
+            if len(wys) > lod:
+                idxs = lttb(wxs, wys, lod)
+                wxs, wys = wxs[idxs], wys[idxs]
+
+            line.set_data(wxs, wys)
+
+        if self.pinf.sch.loddelay:
+            ax.figure.canvas.draw_idle()  # the timer fired after the draw
+
     def setlocators(self, ax):
         comp = getattr(self.pinf.clock, '_compression', 1)
         tframe = getattr(self.pinf.clock, '_timeframe', TimeFrame.Days)
@@ -437,7 +518,8 @@ class Plot_OldSync(with_metaclass(MetaParams, object)):
             if ax in self.pinf.zorder:
                 plotkwargs['zorder'] = self.pinf.zordernext(ax)
 
-            pltmethod = getattr(ax, lineplotinfo._get('_method', 'plot'))
+            pmethod = lineplotinfo._get('_method', 'plot')
+            pltmethod = getattr(ax, pmethod)
 
             xdata, lplotarray = self.pinf.xdata, lplot
             if lineplotinfo._get('_skipnan', False):
@@ -449,13 +531,22 @@ class Plot_OldSync(with_metaclass(MetaParams, object)):
                 lplotarray = lplotarray[lplotmask]
                 xdata = np.array(xdata)[lplotmask]
 
-            plottedline = pltmethod(xdata, lplotarray, **plotkwargs)
+            markers = linekwargs.get('ls', linekwargs.get('linestyle')) == ''
+            lodx, lody = self.lodreduce(xdata, lplotarray, pmethod, markers)
+
+            plottedline = pltmethod(lodx, lody, **plotkwargs)
             try:
                 plottedline = plottedline[0]
             except:
                 # Possibly a container of artists (when plotting bars)
                 pass
 
+            if lody is not lplotarray and pmethod == 'plot' and not markers:
+                lodline = (plottedline,
+                           np.asarray(xdata, dtype=np.float64),
+                           np.asarray(lplotarray, dtype=np.float64))
+                self.pinf.lodlines.append(lodline)
+
             self.pinf.zorder[ax] = plottedline.get_zorder()
 
             vtags = lineplotinfo._get('plotvaluetags', True)
@@ -479,6 +570,12 @@ class Plot_OldSync(with_metaclass(MetaParams, object)):
                         l2 = getattr(ind, fref)
                         prl2 = l2.plotrange(self.pinf.xstart, self.pinf.xend)
                         y2 = np.array(prl2)
+                    fx = self.pinf.xdata
+                    if self.pinf.lod and len(y1) > self.pinf.lod:
+                        fidxs = minmax([y1, y2], self.pinf.lod)
+                        fx = np.asarray(fx)[fidxs]
+                        y1, y2 = y1[fidxs], y2[fidxs]
+
                     kwargs = dict()
                     if fop is not None:
                         kwargs['where'] = fop(y1, y2)
@@ -487,7 +584,7 @@ class Plot_OldSync(with_metaclass(MetaParams, object)):
                     if isinstance(fcol, (list, tuple)):
                         fcol, falpha = fcol
 
-                    ax.fill_between(self.pinf.xdata, y1, y2,
+                    ax.fill_between(fx, y1, y2,
                                     facecolor=fcol,
                                     alpha=falpha,
                                     interpolate=True,
@@ -549,7 +646,8 @@ class Plot_OldSync(with_metaclass(MetaParams, object)):
         for downind in downinds:
             self.plotind(iref, downind)
 
-    def plotvolume(self, data, opens, highs, lows, closes, volumes, label):
+    def plotvolume(self, data, opens, highs, lows, closes, volumes, label,
+                   xdata=None, width=1):
         pmaster = data.plotinfo.plotmaster
         if pmaster is data:
             pmaster = None
@@ -569,14 +667,18 @@ class Plot_OldSync(with_metaclass(MetaParams, object)):
         else:
             volalpha = 1.0
 
+        if xdata is None:
+            xdata = self.pinf.xdata
+
         maxvol = volylim = max(volumes)
         if maxvol:
 
             # Plot the volume (no matter if as overlay or standalone)
             vollabel = label
-            volplot, = plot_volume(ax, self.pinf.xdata, opens, closes, volumes,
+            volplot, = plot_volume(ax, xdata, opens, closes, volumes,
                                    colorup=self.pinf.sch.volup,
                                    colordown=self.pinf.sch.voldown,
+                                   width=width,
                                    alpha=volalpha, label=vollabel)
 
             nbins = 6
@@ -628,6 +730,15 @@ class Plot_OldSync(with_metaclass(MetaParams, object)):
         closes = data.close.plotrange(self.pinf.xstart, self.pinf.xend)
         volumes = data.volume.plotrange(self.pinf.xstart, self.pinf.xend)
 
+        # bars downsampled to the level of detail (if needed)
+        bxdata, bwidth = self.pinf.xdata, 1
+        bopens, bhighs, blows, bcloses, bvolumes = \
+            opens, highs, lows, closes, volumes
+        if self.pinf.lod and len(closes) > self.pinf.lod:
+            bxdata, bopens, bhighs, blows, bcloses, bvolumes, bwidth = \
+                ohlcbuckets(self.pinf.xdata, opens, highs, lows, closes,
+                            volumes, self.pinf.lod)
+
         vollabel = 'Volume'
         pmaster = data.plotinfo.plotmaster
         if pmaster is data:
@@ -642,7 +753,8 @@ class Plot_OldSync(with_metaclass(MetaParams, object)):
         axdatamaster = None
         if self.pinf.sch.volume and voloverlay:
             volplot = self.plotvolume(
-                data, opens, highs, lows, closes, volumes, vollabel)
+                data, bopens, bhighs, blows, bcloses, bvolumes, vollabel,
+                xdata=bxdata, width=bwidth)
             axvol = self.pinf.daxis[data.volume]
             ax = axvol.twinx()
             self.pinf.daxis[data] = ax
@@ -679,18 +791,26 @@ class Plot_OldSync(with_metaclass(MetaParams, object)):
                 self.pinf.nextcolor(axdatamaster)
                 color = self.pinf.color(axdatamaster)
 
+            lodx, lodcloses = self.lodreduce(self.pinf.xdata, closes)
             plotted = plot_lineonclose(
-                ax, self.pinf.xdata, closes,
+                ax, lodx, lodcloses,
                 color=color, label=datalabel)
+
+            if lodcloses is not closes:
+                lodline = (plotted[0],
+                           np.asarray(self.pinf.xdata, dtype=np.float64),
+                           np.asarray(closes, dtype=np.float64))
+                self.pinf.lodlines.append(lodline)
         else:
             if self.pinf.sch.linevalues and plinevalues:
                 datalabel += ' O:%.2f H:%.2f L:%.2f C:%.2f' % \
                              (opens[-1], highs[-1], lows[-1], closes[-1])
             if self.pinf.sch.style.startswith('candle'):
                 plotted = plot_candlestick(
-                    ax, self.pinf.xdata, opens, highs, lows, closes,
+                    ax, bxdata, bopens, bhighs, blows, bcloses,
                     colorup=self.pinf.sch.barup,
                     colordown=self.pinf.sch.bardown,
+                    width=bwidth,
                     label=datalabel,
                     fillup=self.pinf.sch.barupfill,
                     filldown=self.pinf.sch.bardownfill)
@@ -698,9 +818,10 @@ class Plot_OldSync(with_metaclass(MetaParams, object)):
             elif self.pinf.sch.style.startswith('bar') or True:
                 # final default option -- should be "else"
                 plotted = plot_ohlc(
-                    ax, self.pinf.xdata, opens, highs, lows, closes,
+                    ax, bxdata, bopens, bhighs, blows, bcloses,
                     colorup=self.pinf.sch.barup,
                     colordown=self.pinf.sch.bardown,
+                    tickwidth=0.5 * bwidth,
                     label=datalabel)
 
         self.pinf.zorder[ax] = plotted[0].get_zorder()
@@ -721,7 +842,8 @@ class Plot_OldSync(with_metaclass(MetaParams, object)):
             # if not self.pinf.sch.voloverlay:
             if not voloverlay:
                 self.plotvolume(
-                    data, opens, highs, lows, closes, volumes, vollabel)
+                    data, bopens, bhighs, blows, bcloses, bvolumes, vollabel,
+                    xdata=bxdata, width=bwidth)
             else:
                 # Prepare overlay scaling/pushup or manage own axis
                 if self.pinf.sch.volpushup:
@@ -181,6 +181,18 @@ class PlotScheme(object):
         # strftime Format string for the display of data points values
         self.fmt_x_data = None
 
+        # Level of detail: maximum number of points of a series handed over
+        # to matplotlib. Longer series are downsampled (buckets keeping the
+        # extremes for bars and volume, LTTB for lines, markers are kept) and
+        # lines are downsampled again when zooming. True uses the width of
+        # the figure in pixels. None plots all points
+        self.lod = None
+
+        # Milliseconds the limits of the x axis must stay unchanged while
+        # panning or zooming before the lines are downsampled again (with
+        # lod). 0 downsamples again on each change of the limits
+        self.loddelay = 100
+
     def color(self, idx):
         colidx = tab10_index[idx % len(tab10_index)]
         return self.lcolors[colidx]
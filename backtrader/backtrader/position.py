@@ -37,6 +37,10 @@ class Position(object):
     The Position instances can be tested using len(position) to see if size
     is not null
     '''
+    __slots__ = (
+        'size', 'price', 'price_orig', 'adjbase',
+        'upopened', 'upclosed', 'updt', 'datetime',
+    )
 
     def __str__(self):
         items = list()
@@ -23,6 +23,8 @@ from __future__ import (absolute_import, division, print_function,
 
 
 from datetime import datetime, date, timedelta
+from functools import reduce
+import operator
 
 from .dataseries import TimeFrame, _Bar
 from .utils.py3 import with_metaclass
@@ -93,6 +95,65 @@ class DTFaker(object):
         return self.data._getnexteos()
 
 
+class _DTCursor(object):
+    # Stands in for the data feed during a bulk resampling pass. It walks over
+    # the array of datetimes of the already loaded bars and offers the part of
+    # the data feed interface used by the boundary checks of the resamplers.
+    #
+    # As with the data feed during "load", index 0 is the bar being resampled
+    # and index -1 the last delivered resampled bar
+
+    def __init__(self, data, dts):
+        self.data = data
+        self.dts = dts
+
+        # Aliases
+        self.datetime = self
+        self.p = data.p
+
+        self._dt = float('-inf')
+        self._lastdt = float('-inf')
+        self._len = 1  # the bar being resampled
+
+    def __len__(self):
+        return self._len
+
+    def setidx(self, idx):
+        self._dt = self.dts[idx]
+
+    def delivered(self, dt):
+        self._lastdt = dt
+        self._len += 1
+
+    def __getitem__(self, idx):
+        return self._dt if idx == 0 else self._lastdt
+
+    def __call__(self, idx=0):
+        return self.data.num2date(self._dt)  # simulates data.datetime.datetime()
+
+    def datetime(self, idx=0):
+        return self.data.num2date(self._dt)
+
+    def date(self, idx=0):
+        return self.data.num2date(self._dt).date()
+
+    def time(self, idx=0):
+        return self.data.num2date(self._dt).time()
+
+    @property
+    def _calendar(self):
+        return self.data._calendar
+
+    def num2date(self, *args, **kwargs):
+        return self.data.num2date(*args, **kwargs)
+
+    def date2num(self, *args, **kwargs):
+        return self.data.date2num(*args, **kwargs)
+
+    def _getnexteos(self):
+        return self.data._getnexteos(self._dt)
+
+
 class _BaseResampler(with_metaclass(metabase.MetaParams, object)):
     params = (
         ('bar2edge', True),
@@ -124,6 +185,10 @@ class _BaseResampler(with_metaclass(metabase.MetaParams, object)):
                              self.subweeks)
 
         self._nexteos = None
+        self._pointdt = None  # cache for _dtpoint
+
+        self._lastdt = None  # time of the incomplete bar delivered by last
+        self._reopendt = None  # same, if not updated after reopening
 
         # Modify data information according to own parameters
         data.resampling = 1
@@ -269,6 +334,19 @@ class _BaseResampler(with_metaclass(metabase.MetaParams, object)):
 
         return point, restpoint
 
+    def _dtpoint(self, dt):
+        '''Returns the point of time intraday (see ``_gettmpoint``) for a
+        utc-like datetime
+
+        The last result is kept, because the time of the internal bar is
+        usually the time of the previously checked data
+        '''
+        if dt != self._pointdt:
+            self._pointdt = dt
+            self._point, _ = self._gettmpoint(num2date(dt).time())
+
+        return self._point
+
     def _barover_subdays(self, data):
         if self._eoscheck(data):
             return True
@@ -276,12 +354,9 @@ class _BaseResampler(with_metaclass(metabase.MetaParams, object)):
         if data.datetime[0] < self.bar.datetime:
             return False
 
-        # Get time objects for the comparisons - in utc-like format
-        tm = num2date(self.bar.datetime).time()
-        bartm = num2date(data.datetime[0]).time()
-
-        point, _ = self._gettmpoint(tm)
-        barpoint, _ = self._gettmpoint(bartm)
+        # Get the points for the comparisons - in utc-like format
+        point = self._dtpoint(self.bar.datetime)
+        barpoint = self._dtpoint(data.datetime[0])
 
         ret = False
         if barpoint > point:
@@ -489,6 +564,11 @@ class Resampler(_BaseResampler):
         delivered
         '''
         if self.bar.isopen():
+            self._lastdt = self.bar.datetime
+            if self._lastdt == self._reopendt:
+                self.bar.bstart(maxdate=True)  # delivered before reopening
+                return False
+
             if self.doadjusttime:
                 self._adjusttime()
 
@@ -498,6 +578,130 @@ class Resampler(_BaseResampler):
 
         return False
 
+    def reopen(self, data):
+        '''Called when the data is started again to deliver the bars added
+        to the source after a run (see ``Cerebro.runcontinue``)
+
+        If the last bar was delivered by ``last`` it may be incomplete: it is
+        opened again with the delivered values to be updated by the new
+        source bars of the same period. The complete bar is then delivered
+        as a new bar. It is not delivered again if no source bar updates it
+        '''
+        if self._lastdt is None:
+            return
+
+        for name, line in zip(self.bar.keys(), data.itersize()):
+            self.bar[name] = line[0]
+
+        self.bar.datetime = self._reopendt = self._lastdt
+        data._resumedt = self._lastdt  # last source bar which was seen
+        self._lastdt = None
+
+    def bulk(self, data, lines):
+        '''Called with all the values produced by the data source (during
+        preloading) to resample them in a single pass
+
+        ``lines`` contains the arrays of values in the order of the lines of
+        the data (which is also the order in ``_Bar``)
+
+        The boundaries of the resampled bars are calculated first with the
+        same checks used by ``__call__``, which only need the datetimes. The
+        values of the resulting bars are then reduced for each segment of
+        source bars and delivered to the stack of the data
+        '''
+        closes, lows, highs, opens, volumes, ois, dts = lines[:7]
+
+        bar = self.bar
+        cursor = _DTCursor(data, dts)
+        segs = []  # (end, open, datetime) of the resampled bars
+        skip = set()  # late bars discarded (if takelate is False)
+        end = 0  # end of the current segment
+
+        self.data = cursor  # boundary checks go to the cursor
+        try:
+            for i in range(len(dts)):
+                cursor.setidx(i)
+
+                if self._latedata(cursor):
+                    if not self.p.takelate:
+                        skip.add(i)
+                        continue
+
+                    # update bar, push time beyond reference
+                    end = i + 1
+                    if not bar.isopen():
+                        bar.open = opens[i]
+                    bar.datetime = cursor[-1] + 0.000001
+                    continue
+
+                onedge = False
+                docheckover = True
+                if self.componly:  # only if not subdays
+                    consumed = True
+                else:
+                    onedge, docheckover = self._dataonedge(cursor)
+                    consumed = onedge
+
+                if consumed:
+                    end = i + 1
+                    bar.datetime = dts[i]
+                    if not bar.isopen():
+                        bar.open = opens[i]
+
+                cond = bar.isopen()
+                if cond and not onedge and docheckover:
+                    cond = self._checkbarover(cursor)
+
+                if cond:
+                    if not onedge and self.doadjusttime:
+                        self._adjusttime(greater=True)
+
+                    segs.append((end, bar.open, bar.datetime))
+                    cursor.delivered(bar.datetime)
+                    bar.bstart(maxdate=True)
+
+                if not consumed:
+                    end = i + 1
+                    bar.datetime = dts[i]
+                    if not bar.isopen():
+                        bar.open = opens[i]
+
+            if bar.isopen():  # as in last
+                self._lastdt = bar.datetime
+                if self.doadjusttime:
+                    self._adjusttime()
+
+                segs.append((end, bar.open, bar.datetime))
+                bar.bstart(maxdate=True)
+
+        finally:
+            self.data = data
+
+        # Reduce the values of the segments. The reductions follow the same
+        # order of operations as bupdate to deliver the very same values
+        start = 0
+        for end, bopen, bdt in segs:
+            if skip:
+                idxs = [j for j in range(start, end) if j not in skip]
+                blows = [lows[j] for j in idxs]
+                bhighs = [highs[j] for j in idxs]
+                bvolumes = [volumes[j] for j in idxs]
+            else:
+                blows = lows[start:end]
+                bhighs = highs[start:end]
+                bvolumes = volumes[start:end]
+
+            data._add2stack([
+                closes[end - 1],
+                reduce(min, blows, float('inf')),
+                reduce(max, bhighs, float('-inf')),
+                bopen,
+                reduce(operator.add, bvolumes, 0.0),
+                ois[end - 1],
+                bdt,
+            ])
+            start = end
+
     def __call__(self, data, fromcheck=False, forcedata=None):
         '''Called for each set of values produced by the data source'''
         consumed = False
@@ -553,11 +757,15 @@ class Resampler(_BaseResampler):
                 dodeliver = True
 
             if dodeliver:
-                if not onedge and self.doadjusttime:
-                    self._adjusttime(greater=True, forcedata=forcedata)
+                # not delivered if not updated after reopening
+                if self.bar.datetime != self._reopendt:
+                    if not onedge and self.doadjusttime:
+                        self._adjusttime(greater=True, forcedata=forcedata)
+
+                    data._add2stack(self.bar.lvalues())
 
-                data._add2stack(self.bar.lvalues())
                 self.bar.bstart(maxdate=True)  # bar delivered -> restart
+                self._reopendt = None
 
         if not fromcheck:
             if not consumed:
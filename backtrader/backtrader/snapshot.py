@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+'''
+
+.. module:: snapshot
+
+Saves the state of the strategies of a running ``Cerebro`` (lines, indicator
+and analyzer attributes, broker with positions and orders, timers) and
+restores it into a new ``Cerebro`` which has been set up in the same manner
+
+The objects of the setup (datas, indicators, strategies, ...) are not saved.
+They are referenced by their position in the setup and the references are
+resolved against the objects of the new instance during the restore
+
+.. moduleauthor:: Daniel Rodriguez
+
+'''
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import array
+import collections
+import io
+import itertools
+import pickle
+import warnings
+import zlib
+
+from .analyzer import Analyzer
+from .broker import BrokerBase
+from .linebuffer import LineBuffer
+from .lineiterator import LineIterator, _itertree
+from .lineroot import LineRoot
+from .order import OrderBase
+from .store import Store
+from .trade import Trade
+
+
+MAGIC = b'BTSNAP01'
+
+# Attributes which make up the setup (and not the state) of the objects
+_SKIPATTRS = frozenset([
+    # params, lines and plotting
+    'p', 'params', 'lines', 'l', 'plotinfo', 'plotlines',
+    # buffers (saved separately)
+    'array', '_idx', 'lencount', 'extension', 'useislice', 'mode', 'maxlen',
+    'extrasize', 'lenmark', 'retainsize', 'retainmax', 'bindings',
+    # relationships of the objects in the setup
+    'datas', 'ddatas', 'dnames', '_datas', '_lineiterators', '_plan',
+    '_planonce', 'stats', 'observers', 'analyzers', '_slave_analyzers',
+    '_children', 'writers', '_historylog',
+    # arguments of the timers (passed back in notify_timer)
+    'args', 'kwargs',
+])
+
+_STATTYPES = (LineIterator.IndType, LineIterator.ObsType)
+
+
+def _registry(cerebro, strats):
+    # Collects the objects of the setup in a deterministic order with a key
+    # which locates them
+    objs = collections.OrderedDict()
+    seen = set()
+
+    def add(key, obj):
+        if id(obj) in seen:
+            return
+
+        seen.add(id(obj))
+        objs[key] = obj
+        if not isinstance(obj, LineBuffer) and hasattr(obj, 'lines'):
+            add(key + ('lines',), obj.lines)
+            for i, line in enumerate(obj.lines):
+                add(key + (i,), line)
+
+    add(('cerebro',), cerebro)
+    add(('broker',), cerebro.broker)
+    for i, store in enumerate(cerebro.stores):
+        add(('store', i), store)
+
+    for i, data in enumerate(cerebro.datas):
+        add(('data', i), data)
+
+    for i, timer in enumerate(cerebro._pretimers):
+        add(('timer', i), timer)
+
+    for i, strat in enumerate(strats):
+        add(('strat', i), strat)
+        add(('strat', i, 'sizer'), strat._sizer)
+        for j, obj in enumerate(_itertree(strat, _STATTYPES)):
+            add(('strat', i, 'it', j), obj)
+
+        analyzers = list(strat.analyzers) + strat._slave_analyzers
+        for j, analyzer in enumerate(analyzers):
+            add(('strat', i, 'an', j), analyzer)
+
+    return objs
+
+
+class _Pickler(pickle.Pickler):
+    # Objects of the setup are replaced by their keys. Other objects of the
+    # same kind would pull a complete setup into the snapshot
+    _novalue = (LineRoot, BrokerBase, Store, Analyzer)
+
+    def __init__(self, fileobj, keys):
+        pickle.Pickler.__init__(self, fileobj, pickle.HIGHEST_PROTOCOL)
+        self._keys = keys
+
+    def persistent_id(self, obj):
+        key = self._keys.get(id(obj))
+        if key is None and isinstance(obj, self._novalue):
+            raise pickle.PicklingError('Object not in the setup')
+
+        return key
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, fileobj, objs):
+        pickle.Unpickler.__init__(self, fileobj)
+        self._objs = objs
+
+    def persistent_load(self, key):
+        try:
+            return self._objs[tuple(key)]
+        except KeyError:
+            raise pickle.UnpicklingError(
+                'The setup does not match the snapshot: %s' % (key,))
+
+
+def _picklable(val, keys):
+    try:
+        _Pickler(io.BytesIO(), keys).dump(val)
+    except Exception:
+        return False
+
+    return True
+
+
+def _nextref(cls):
+    # Peeks the next reference of the orders/trades
+    ref = next(cls.refbasis)
+    cls.refbasis = itertools.count(ref)
+    return ref
+
+
+def dumps(cerebro, strats, tail=None):
+    '''Returns the state of ``strats`` (running in ``cerebro``) as bytes
+
+    The last ``tail`` values of the lines are saved (never less than the
+    minimum period of the strategies). With ``None`` the values held in the
+    buffers are saved
+    '''
+    objs = _registry(cerebro, strats)
+    keys = dict((id(obj), key) for key, obj in objs.items())
+
+    if tail is not None:
+        tail = max([tail] + [strat._minperiod for strat in strats])
+
+    buffers = []
+    attrs = []
+    dropped = []
+    for key, obj in objs.items():
+        if isinstance(obj, LineBuffer):
+            size = len(obj.array) - obj.extension  # values held
+            size = min(size, obj.idx + 1)  # up to the current one
+            start = 0 if tail is None else max(0, size - tail)
+            values = array.array(str('d'), obj.getzero(start, size - start))
+            buffers.append((key, len(obj), values))
+
+        if key[0] in ('cerebro', 'store') or key[-1] == 'lines':
+            continue  # setup only
+
+        state = dict()
+        for name, val in vars(obj).items():
+            if name in _SKIPATTRS or id(val) in keys or callable(val):
+                continue
+
+            if _picklable(val, keys):
+                state[name] = val
+            else:
+                dropped.append('.'.join(str(k) for k in key + (name,)))
+
+        attrs.append((key, state))
+
+    if dropped:
+        warnings.warn('Attributes which cannot be pickled are not in the '
+                      'snapshot: %s' % ', '.join(dropped), RuntimeWarning)
+
+    resume = [(i, data.datetime[0])
+              for i, data in enumerate(cerebro.datas) if len(data)]
+
+    snapshot = dict(
+        buffers=buffers,
+        attrs=attrs,
+        resume=resume,
+        refs=(_nextref(OrderBase), _nextref(Trade)),
+    )
+
+    out = io.BytesIO()
+    _Pickler(out, keys).dump(snapshot)
+    return MAGIC + zlib.compress(out.getvalue())
+
+
+def loads(cerebro, strats, payload):
+    '''Restores the state in ``payload`` (see ``dumps``) into ``strats``
+    running in ``cerebro``, which must have the same setup as the one used
+    to take the snapshot'''
+    if not payload.startswith(MAGIC):
+        raise ValueError('Not a backtrader snapshot')
+
+    objs = _registry(cerebro, strats)
+    fin = io.BytesIO(zlib.decompress(payload[len(MAGIC):]))
+    snapshot = _Unpickler(fin, objs).load()
+
+    for key, lencount, values in snapshot['buffers']:
+        line = objs[key]
+        line.extension = 0
+        if line.mode == line.QBuffer:
+            line.array.clear()
+            line.array.extend(values)
+        else:
+            line.array = values
+
+        line.set_idx(len(line.array) - 1, force=True)
+        line.lencount = lencount
+
+    for key, state in snapshot['attrs']:
+        vars(objs[key]).update(state)
+
+    # bars already seen before the snapshot are not delivered again
+    for i, dt in snapshot['resume']:
+        cerebro.datas[i]._resumedt = dt
+
+    orderref, traderef = snapshot['refs']
+    OrderBase.refbasis = itertools.count(max(orderref, _nextref(OrderBase)))
+    Trade.refbasis = itertools.count(max(traderef, _nextref(Trade)))
@@ -24,20 +24,14 @@ from __future__ import (absolute_import, division, print_function,
 # The modules below should/must define __all__ with the objects wishes
 # or prepend an "_" (underscore) to private classes/variables
 
-try:
-    from .ibstore import IBStore
-except ImportError:
-    pass  # The user may not have ibpy installed
-
-try:
-    from .vcstore import VCStore
-except ImportError:
-    pass  # The user may not have a module installed
-
-try:
-    from .oandastore import OandaStore
-except ImportError:
-    pass  # The user may not have a module installed
+from ..utils.py3 import lazyimport
 
+# The live stores are imported when first used. The user may not have the
+# needed packages (ibpy, comtypes, oandapy) installed
+lazyimport(__name__, globals(), dict(
+    IBStore=('.ibstore', 'IBStore'),
+    VCStore=('.vcstore', 'VCStore'),
+    OandaStore=('.oandastore', 'OandaStore'),
+))
 
 from .vchartfile import VChartFile
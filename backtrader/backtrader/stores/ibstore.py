@@ -185,11 +185,15 @@ class IBStore(with_metaclass(MetaSingleton, object)):
     @classmethod
     def getdata(cls, *args, **kwargs):
         '''Returns ``DataCls`` with args, kwargs'''
+        if cls.DataCls is None:  # registered when its module is imported
+            import backtrader.feeds.ibdata
         return cls.DataCls(*args, **kwargs)
 
     @classmethod
     def getbroker(cls, *args, **kwargs):
         '''Returns broker with *args, **kwargs from registered ``BrokerCls``'''
+        if cls.BrokerCls is None:  # registered when its module is imported
+            import backtrader.brokers.ibbroker
         return cls.BrokerCls(*args, **kwargs)
 
     def __init__(self):
@@ -214,11 +214,15 @@ class VCStore(with_metaclass(MetaSingleton, object)):
     @classmethod
     def getdata(cls, *args, **kwargs):
         '''Returns ``DataCls`` with args, kwargs'''
+        if cls.DataCls is None:  # registered when its module is imported
+            import backtrader.feeds.vcdata
         return cls.DataCls(*args, **kwargs)
 
     @classmethod
     def getbroker(cls, *args, **kwargs):
         '''Returns broker with *args, **kwargs from registered ``BrokerCls``'''
+        if cls.BrokerCls is None:  # registered when its module is imported
+            import backtrader.brokers.vcbroker
         return cls.BrokerCls(*args, **kwargs)
 
     # DLLs to parse if found for TypeLibs
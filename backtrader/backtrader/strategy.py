@@ -32,6 +32,7 @@ from .utils.py3 import (filter, keys, integer_types, iteritems, itervalues,
                         map, MAXINT, string_types, with_metaclass)
 
 import backtrader as bt
+from .linebuffer import oncegrow
 from .lineiterator import LineIterator, StrategyBase
 from .lineroot import LineSingle
 from .metabase import ItemCollection, findowner
@@ -91,6 +92,8 @@ class MetaStrategy(StrategyBase.__class__):
         _obj._slave_analyzers = list()
 
         _obj._tradehistoryon = False
+        _obj._historysize = 0
+        _obj._historylog = None
 
         return _obj, args, kwargs
 
@@ -151,6 +154,16 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
                 for it in self._lineiterators[itcls]:
                     it.qbuffer(savemem=1)
 
+    def retain(self, size):
+        '''Keeps in memory only the last ``size`` values of the datas,
+        indicators and observers, plus the lookback period which the
+        indicators need to deliver values'''
+        size += self._minperiod
+        for data in self.datas:
+            data.retain(size)
+
+        super(Strategy, self).retain(size)
+
     def _periodset(self):
         dataids = [id(data) for data in self.datas]
 
@@ -340,6 +353,10 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
                 else:
                     analyzer._prenext()
 
+            if observer._lazy:  # only record events, lines built at stop
+                observer._lazynext(once)
+                continue
+
             if once:
                 if len(self) > len(observer):
                     if self._oldsync:
@@ -357,6 +374,9 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
                 observer._next()
 
     def _next_analyzers(self, minperstatus, once=False):
+        if self._fundlog is not None:
+            self._fundlog.addstatus(minperstatus)
+
         for analyzer in self.analyzers:
             if minperstatus < 0:
                 analyzer._next()
@@ -371,6 +391,10 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
     def _start(self):
         self._periodset()
 
+        self._fundlog = None
+        if self.cerebro.p.fundlog:
+            self._fundlog = bt.FundLog()
+
         for analyzer in itertools.chain(self.analyzers, self._slave_analyzers):
             analyzer._start()
 
@@ -380,6 +404,8 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
 
             for o in obs:
                 o._start()
+                if o._canlazy and self.cerebro._dolazystats:
+                    o._lazystart()
 
         # change operators to stage 2
         self._stage2()
@@ -394,6 +420,23 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
         '''Called right before the backtesting is about to be started.'''
         pass
 
+    def _continue(self):
+        # a finished run is continued (see Cerebro.runcontinue)
+        self._stage2()
+        for analyzer in itertools.chain(self.analyzers, self._slave_analyzers):
+            analyzer._continue()
+
+    def _oncemore(self):
+        for indicator in self._lineiterators[LineIterator.IndType]:
+            indicator._oncemore()
+
+        if self._oldsync:
+            # strategy and observers are advanced in _oncepost
+            oncegrow(self, self._clock.buflen())
+            for observer in self._lineiterators[LineIterator.ObsType]:
+                if not observer._lazy:
+                    oncegrow(observer, self.buflen())
+
     def getwriterheaders(self):
         self.indobscsv = [self]
 
@@ -458,6 +501,10 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
         return wrinfo
 
     def _stop(self):
+        for observer in self._lineiterators[LineIterator.ObsType]:
+            if observer._lazy:
+                observer._lazybuild()
+
         self.stop()
 
         for analyzer in itertools.chain(self.analyzers, self._slave_analyzers):
@@ -473,15 +520,54 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
     def set_tradehistory(self, onoff=True):
         self._tradehistoryon = onoff
 
+    def set_history(self, size, log=None):
+        '''Keeps in memory only (about) the last ``size`` notified orders
+        and closed trades (for each data and tradeid). The older ones are
+        written out to ``log`` (a ``HistoryLog``) if one is given'''
+        self._historysize = size
+        self._historylog = log
+
     def clear(self):
         self._orders.extend(self._orderspending)
         self._orderspending = list()
         self._tradespending = list()
 
+        if self._historysize and len(self._orders) > 2 * self._historysize:
+            self._spillorders()
+
+    def _spillorders(self):
+        # the orders are notified several times, write down the final one
+        drop = len(self._orders) - self._historysize
+        if self._historylog is not None:
+            for order in self._orders[:drop]:
+                if not order.alive():
+                    self._historylog.order(order)
+
+        del self._orders[:drop]
+
+    def _addtrade(self, datatrades, trade):
+        datatrades.append(trade)
+        if self._historysize and len(datatrades) > 2 * self._historysize:
+            # only the last trade can be open
+            drop = len(datatrades) - self._historysize
+            if self._historylog is not None:
+                for trade in datatrades[:drop]:
+                    self._historylog.trade(trade)
+
+            del datatrades[:drop]
+
+    def _addtradesnapshot(self, trade, qtrades, quicknotify):
+        # A single snapshot serves the pending and the quick notifications
+        snapshot = copy.copy(trade)
+        self._tradespending.append(snapshot)
+        if quicknotify:
+            qtrades.append(snapshot)
+
     def _addnotification(self, order, quicknotify=False):
         if not order.p.simulated:
             self._orderspending.append(order)
 
+        qtrades = None
         if quicknotify:
             qorders = [order]
             qtrades = []
@@ -499,7 +585,7 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
         if not datatrades:
             trade = Trade(data=tradedata, tradeid=order.tradeid,
                           historyon=self._tradehistoryon)
-            datatrades.append(trade)
+            self._addtrade(datatrades, trade)
         else:
             trade = datatrades[-1]
 
@@ -517,16 +603,14 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
                              comminfo=order.comminfo)
 
                 if trade.isclosed:
-                    self._tradespending.append(copy.copy(trade))
-                    if quicknotify:
-                        qtrades.append(copy.copy(trade))
+                    self._addtradesnapshot(trade, qtrades, quicknotify)
 
             # Update it if needed
             if exbit.opened:
                 if trade.isclosed:
                     trade = Trade(data=tradedata, tradeid=order.tradeid,
                                   historyon=self._tradehistoryon)
-                    datatrades.append(trade)
+                    self._addtrade(datatrades, trade)
 
                 trade.update(order,
                              exbit.opened,
@@ -540,14 +624,10 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
                 # orders have put the position down to 0 and the next order
                 # "opens" a position but "closes" the trade
                 if trade.isclosed:
-                    self._tradespending.append(copy.copy(trade))
-                    if quicknotify:
-                        qtrades.append(copy.copy(trade))
+                    self._addtradesnapshot(trade, qtrades, quicknotify)
 
             if trade.justopened:
-                self._tradespending.append(copy.copy(trade))
-                if quicknotify:
-                    qtrades.append(copy.copy(trade))
+                self._addtradesnapshot(trade, qtrades, quicknotify)
 
         if quicknotify:
             self._notify(qorders=qorders, qtrades=qtrades)
@@ -584,6 +664,10 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
         fundvalue = self.broker.fundvalue
         fundshares = self.broker.fundshares
 
+        if self._fundlog is not None:
+            self._fundlog.addfund(self.datetime[0],
+                                  cash, value, fundvalue, fundshares)
+
         self.notify_cashvalue(cash, value)
         self.notify_fund(cash, value, fundvalue, fundshares)
         for analyzer in itertools.chain(self.analyzers, self._slave_analyzers):
@@ -23,3 +23,6 @@ from __future__ import (absolute_import, division, print_function,
 
 
 from backtrader import Indicator
+
+# Load contributed studies
+from . import contrib
@@ -21,8 +21,12 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
-import backtrader as bt
+import sys
 
 from .import fractal as fractal
+
+# Loaded at the end of the studies package (which may still be missing as an
+# attribute of backtrader)
+_studies = sys.modules[__name__.rpartition('.')[0]]
 for name in fractal.__all__:
-    setattr(bt.studies, name, getattr(fractal, name))
+    setattr(_studies, name, getattr(fractal, name))
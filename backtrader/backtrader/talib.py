@@ -24,6 +24,7 @@ from __future__ import (absolute_import, division, print_function,
 # The modules below should/must define __all__ with the objects wishes
 # or prepend an "_" (underscore) to private classes/variables
 
+import array
 import sys
 
 import backtrader as bt
@@ -66,7 +67,18 @@ else:
         _refname = '_taindcol'
         _taindcol = dict()
 
-        _KNOWN_UNSTABLE = ['SAR']
+        # Chains of exponential averages without the unstable flag
+        _KNOWN_UNSTABLE = ['ADOSC', 'APO', 'DEMA', 'MACD', 'MACDFIX', 'PPO',
+                           'STOCHRSI', 'TEMA', 'TRIX']
+
+        # The values carry the state of the entire history (stop and reverse,
+        # cumulative sums)
+        _KNOWN_FULLHISTORY = ['AD', 'OBV', 'SAR', 'SAREXT']
+
+        # The moving averages which can be chosen with a matype parameter and
+        # have an unstable period
+        _UNSTABLE_MATYPES = [MA_Type.EMA, MA_Type.DEMA, MA_Type.TEMA,
+                             MA_Type.KAMA, MA_Type.MAMA, MA_Type.T3]
 
         def dopostinit(cls, _obj, *args, **kwargs):
             # Go to parent
@@ -75,16 +87,23 @@ else:
             _obj, args, kwargs = res
 
             # Get the minimum period by using the abstract interface and params
-            _obj._tabstract.set_function_args(**_obj.p._getkwargs())
+            _obj._takwargs = _obj.p._getkwargs()
+            _obj._tabstract.set_function_args(**_obj._takwargs)
             _obj._lookback = lookback = _obj._tabstract.lookback + 1
             _obj.updateminperiod(lookback)
-            if _obj._unstable:
-                _obj._lookback = 0
+            matypes = [v for k, v in _obj._takwargs.items() if 'matype' in k]
+            if cls.__name__ in cls._KNOWN_FULLHISTORY:
+                _obj._lookback = 0  # next mode goes over the full history
 
-            elif cls.__name__ in cls._KNOWN_UNSTABLE:
-                _obj._lookback = 0
+            elif (_obj._unstable or cls.__name__ in cls._KNOWN_UNSTABLE or
+                  any(x in cls._UNSTABLE_MATYPES for x in matypes)):
+                # The values depend on the entire history. The lookback is
+                # the sum of the periods of the inner averages: take enough
+                # bars for the influence of the starting values to fade away
+                _obj._lookback = lookback * max(1, _obj.UNSTABLEWARMUP)
+
+            _obj._windows = None  # created with the 1st value in next mode
 
-            cerebro = bt.metabase.findowner(_obj, bt.Cerebro)
             tafuncinfo = _obj._tabstract.info
             _obj._tafunc = getattr(talib, tafuncinfo['name'], None)
             return _obj, args, kwargs  # return the object and args
@@ -93,6 +112,13 @@ else:
         CANDLEOVER = 1.02  # 2% over
         CANDLEREF = 1  # Open, High, Low, Close (0, 1, 2, 3)
 
+        # Functions with an unstable period (like EMA, RSI, MACD or an MA
+        # with an exponential matype) are calculated in next mode over this
+        # multiple of the lookback period. With 20 the weight of the starting
+        # values of an EMA is below exp(-40) and the results match those of
+        # once mode
+        UNSTABLEWARMUP = 20
+
         @classmethod
         def _subclass(cls, name):
             # Module where the class has to end (namely this one)
@@ -188,33 +214,75 @@ else:
             pass  # if not ... a call with a single value to once will happen
 
         def once(self, start, end):
-            import array
-
-            # prepare the data arrays - single shot
-            narrays = [np.array(x.lines[0].array) for x in self.datas]
+            # prepare the data arrays - single shot, without copying them
+            narrays = [self._nparray(x.lines[0].array) for x in self.datas]
             # Execute
-            output = self._tafunc(*narrays, **self.p._getkwargs())
+            output = self._tafunc(*narrays, **self._takwargs)
 
             fsize = self.size()
             lsize = fsize - self._iscandle
             if lsize == 1:  # only 1 output, no tuple returned
-                self.lines[0].array = array.array(str('d'), output)
+                outputs = [output]
 
                 if fsize > lsize:  # candle is present
                     candleref = narrays[self.CANDLEREF] * self.CANDLEOVER
-                    output2 = candleref * (output / 100.0)
-                    self.lines[1].array = array.array(str('d'), output2)
+                    outputs.append(candleref * (output / 100.0))
 
             else:
-                for i, o in enumerate(output):
-                    self.lines[i].array = array.array(str('d'), o)
+                outputs = output
+
+            for line, o in zip(self.lines, outputs):
+                if line.bindings:  # the bound lines need an array.array
+                    o = array.array(str('d'), o)
+
+                line.array = o  # numpy arrays can be directly used
+
+        @staticmethod
+        def _nparray(arr):
+            if isinstance(arr, array.array) and arr.typecode == 'd':
+                return np.frombuffer(arr, dtype=np.float64)
+
+            return np.asarray(arr, dtype=np.float64)
+
+        def _history(self):
+            # full history of values for the functions with _lookback == 0
+            size = len(self)
+            return [np.array(x.lines[0].get(size=size)) for x in self.datas]
+
+        def _windowed(self):
+            # The windows (one per data) are preallocated with the lookback
+            # size and the newest values are at the end. They are shifted to
+            # the left with each new bar, but not if the current bar is being
+            # updated (replay)
+            windows = self._windows
+            if windows is None:
+                self._windows = windows = [
+                    np.full(self._lookback, np.nan) for x in self.datas]
+                self._wlen = 0
+
+            wlen = len(self)
+            if wlen != self._wlen:
+                self._wlen = wlen
+                for window in windows:
+                    window[:-1] = window[1:]
+
+            for window, data in zip(windows, self.datas):
+                window[-1] = data.lines[0][0]
+
+            size = min(wlen, self._lookback)
+            return [window[-size:] for window in windows]
+
+        def prenext(self):
+            if self._lookback:
+                self._windowed()  # collect values for the 1st calculation
 
         def next(self):
-            # prepare the data arrays - single shot
-            size = self._lookback or len(self)
-            narrays = [np.array(x.lines[0].get(size=size)) for x in self.datas]
+            if self._lookback:
+                narrays = self._windowed()
+            else:
+                narrays = self._history()
 
-            out = self._tafunc(*narrays, **self.p._getkwargs())
+            out = self._tafunc(*narrays, **self._takwargs)
 
             fsize = self.size()
             lsize = fsize - self._iscandle
@@ -24,6 +24,7 @@ from __future__ import (absolute_import, division, print_function,
 
 import bisect
 import collections
+import math
 from datetime import date, datetime, timedelta
 from itertools import islice
 
@@ -40,6 +41,13 @@ SESSION_TIME, SESSION_START, SESSION_END = range(3)
 
 
 class Timer(with_metaclass(MetaParams, object)):
+    '''Timer which is checked by ``Cerebro`` against the datetime of the bars
+
+    After each check the timer records in ``nextdt`` the float timestamp
+    before which another check cannot produce a notification (nor change the
+    state of the timer), which allows skipping checks until that timestamp is
+    reached
+    '''
     params = (
         ('tid', None),
         ('owner', None),
@@ -79,8 +87,11 @@ class Timer(with_metaclass(MetaParams, object)):
         self._reset_when()
 
         self._nexteos = datetime.min
+        self._dteos = float('-inf')  # float version of _nexteos (for data)
         self._curdate = date.min
 
+        self.nextdt = float('-inf')  # a check is needed
+
         self._curmonth = -1  # non-existent month
         self._monthmask = collections.deque()
 
@@ -148,14 +159,30 @@ class Timer(with_metaclass(MetaParams, object)):
         return daycarry or curday
 
     def check(self, dt):
+        '''Returns ``True`` if the timer target was met at ``dt`` and updates
+        ``nextdt`` with the timestamp at which the next check is needed'''
         d = num2date(dt)
         ddate = d.date()
+        ret = self._check(dt, d, ddate)
+
+        # a day change may make the timer go off again
+        nextdt = math.floor(dt) + 1.0
+        if self._isdata:  # the session may end earlier and reset "when"
+            nextdt = min(nextdt, self._dteos)
+
+        if self._lastcall != ddate and self._dtwhen is not None:
+            nextdt = min(nextdt, self._dtwhen)  # "when" has yet to be met
+
+        self.nextdt = nextdt
+        return ret
+
+    def _check(self, dt, d, ddate):
         if self._lastcall == ddate:  # not repeating, awaiting date change
             return False
 
         if d > self._nexteos:
             if self._isdata:  # eos provided by data
-                nexteos, _ = self._tzdata._getnexteos()
+                nexteos, self._dteos = self._tzdata._getnexteos()
             else:  # generic eos
                 nexteos = datetime.combine(ddate, TIME_MAX)
             self._nexteos = nexteos
@@ -198,7 +225,7 @@ class Timer(with_metaclass(MetaParams, object)):
         else:
             if d > self._nexteos:
                 if self._isdata:  # eos provided by data
-                    nexteos, _ = self._tzdata._getnexteos()
+                    nexteos, self._dteos = self._tzdata._getnexteos()
                 else:  # generic eos
                     nexteos = datetime.combine(ddate, TIME_MAX)
 
@@ -136,7 +136,18 @@ class Trade(object):
         The first entry in the history is the Opening Event
         The last entry in the history is the Closing Event
 
+    Copies (``copy.copy``) of a trade are taken as snapshots for each
+    notification. They share the ``history`` list with the original
     '''
+    __slots__ = (
+        'ref', 'data', 'tradeid',
+        'size', 'price', 'value', 'commission', 'pnl', 'pnlcomm',
+        'justopened', 'isopen', 'isclosed', 'long',
+        'baropen', 'dtopen', 'barclose', 'dtclose', 'barlen',
+        'historyon', 'history',
+        'status',
+    )
+
     refbasis = itertools.count(1)
 
     status_names = ['Created', 'Open', 'Closed']
@@ -184,6 +195,21 @@ class Trade(object):
 
         self.status = self.Created
 
+    def __copy__(self):
+        obj = self.__class__.__new__(self.__class__)
+        for attr in Trade.__slots__:
+            try:
+                setattr(obj, attr, getattr(self, attr))
+            except AttributeError:
+                pass  # long is only set when the trade is opened
+
+        try:
+            obj.__dict__.update(self.__dict__)  # subclasses without slots
+        except AttributeError:
+            pass
+
+        return obj
+
     def __len__(self):
         '''Absolute size of the trade'''
         return abs(self.size)
@@ -45,7 +45,19 @@ ONEDAY = timedelta(days=1)
 
 
 class TradingCalendarBase(with_metaclass(MetaParams, object)):
-    def _nextday(self, day):
+    '''Base class for trading calendars
+
+    The next trading days and the daily opening/closing times are calculated
+    by subclasses in ``_calcnextday`` and ``_calcschedule``. The results are
+    kept in a per-day cache, because data feeds, resamplers and timers look
+    them up for each and every bar
+    '''
+
+    def __init__(self):
+        self._nextdays = dict()  # day -> (nextday, isocalendar)
+        self._schedules = dict()  # (date, tz) -> (opening, closing)
+
+    def _calcnextday(self, day):
         '''
         Returns the next trading day (datetime/date instance) after ``day``
         (datetime/date instance) and the isocalendar components
@@ -54,26 +66,63 @@ class TradingCalendarBase(with_metaclass(MetaParams, object)):
         '''
         raise NotImplementedError
 
-    def schedule(self, day):
+    def _calcschedule(self, day, tz=None):
         '''
-        Returns a tuple with the opening and closing times (``datetime.time``)
-        for the given ``date`` (``datetime/date`` instance)
+        Returns a tuple with the opening and closing times (utc naive
+        ``datetime.datetime``) of the session for the given ``day``
+        (``datetime.date`` instance)
         '''
         raise NotImplementedError
 
+    def _nextday(self, day):
+        '''
+        Returns the next trading day (datetime/date instance) after ``day``
+        (datetime/date instance) and the isocalendar components
+
+        The return value is a tuple with 2 components: (nextday, (y, w, d))
+        '''
+        try:
+            return self._nextdays[day]
+        except KeyError:
+            ret = self._nextdays[day] = self._calcnextday(day)
+            return ret
+
+    def schedule(self, day, tz=None):
+        '''
+        Returns the opening and closing times for the given ``day``. If the
+        method is called, the assumption is that ``day`` is an actual trading
+        day
+
+        The return value is a tuple with 2 components: opentime, closetime
+        '''
+        dt = day.date()
+        while True:
+            key = (dt, tz)
+            try:
+                opening, closing = self._schedules[key]
+            except KeyError:
+                opening, closing = self._calcschedule(dt, tz)
+                self._schedules[key] = (opening, closing)
+
+            if day > closing:  # current time over eos
+                dt += ONEDAY  # wrap over to next day
+                continue
+
+            return opening, closing
+
     def nextday(self, day):
         '''
         Returns the next trading day (datetime/date instance) after ``day``
         (datetime/date instance)
         '''
-        return self._next_day(day)[0]  # 1st ret elem is next day
+        return self._nextday(day)[0]  # 1st ret elem is next day
 
     def nextday_week(self, day):
         '''
         Returns the iso week number of the next trading day, given a ``day``
         (datetime/date) instance
         '''
-        self._nextday(day)[1][1]  # 2 elem is isocal / 0 - y, 1 - wk, 2 - day
+        return self._nextday(day)[1][1]  # 2 elem is isocal / 0-y, 1-wk, 2-day
 
     def last_weekday(self, day):
         '''
@@ -144,9 +193,10 @@ class TradingCalendar(TradingCalendarBase):
     )
 
     def __init__(self):
+        super(TradingCalendar, self).__init__()
         self._earlydays = [x[0] for x in self.p.earlydays]  # speed up searches
 
-    def _nextday(self, day):
+    def _calcnextday(self, day):
         '''
         Returns the next trading day (datetime/date instance) after ``day``
         (datetime/date instance) and the isocalendar components
@@ -161,37 +211,28 @@ class TradingCalendar(TradingCalendarBase):
 
             return day, isocal
 
-    def schedule(self, day, tz=None):
+    def _calcschedule(self, day, tz=None):
         '''
-        Returns the opening and closing times for the given ``day``. If the
-        method is called, the assumption is that ``day`` is an actual trading
-        day
+        Returns the opening and closing times (utc naive) for the given
+        ``day`` (``datetime.date`` instance)
 
         The return value is a tuple with 2 components: opentime, closetime
         '''
-        while True:
-            dt = day.date()
-            try:
-                i = self._earlydays.index(dt)
-                o, c = self.p.earlydays[i][1:]
-            except ValueError:  # not found
-                o, c = self.p.open, self.p.close
+        try:
+            i = self._earlydays.index(day)
+            o, c = self.p.earlydays[i][1:]
+        except ValueError:  # not found
+            o, c = self.p.open, self.p.close
 
-            closing = datetime.combine(dt, c)
-            if tz is not None:
-                closing = tz.localize(closing).astimezone(UTC)
-                closing = closing.replace(tzinfo=None)
+        opening = datetime.combine(day, o)
+        closing = datetime.combine(day, c)
+        if tz is not None:
+            opening = tz.localize(opening).astimezone(UTC)
+            opening = opening.replace(tzinfo=None)
+            closing = tz.localize(closing).astimezone(UTC)
+            closing = closing.replace(tzinfo=None)
 
-            if day > closing:  # current time over eos
-                day += ONEDAY
-                continue
-
-            opening = datetime.combine(dt, o)
-            if tz is not None:
-                opening = tz.localize(opening).astimezone(UTC)
-                opening = opening.replace(tzinfo=None)
-
-            return opening, closing
+        return opening, closing
 
 
 class PandasMarketCalendar(TradingCalendarBase):
@@ -227,6 +268,7 @@ class PandasMarketCalendar(TradingCalendarBase):
     )
 
     def __init__(self):
+        super(PandasMarketCalendar, self).__init__()
         self._calendar = self.p.calendar
 
         if isinstance(self._calendar, string_types):  # use passed mkt name
@@ -238,7 +280,7 @@ class PandasMarketCalendar(TradingCalendarBase):
         self.idcache = pd.DataFrame(index=pd.DatetimeIndex([0.0]))
         self.csize = timedelta(days=self.p.cachesize)
 
-    def _nextday(self, day):
+    def _calcnextday(self, day):
         '''
         Returns the next trading day (datetime/date instance) after ``day``
         (datetime/date instance) and the isocalendar components
@@ -256,16 +298,16 @@ class PandasMarketCalendar(TradingCalendarBase):
             d = self.dcache[i].to_pydatetime()
             return d, d.isocalendar()
 
-    def schedule(self, day, tz=None):
+    def _calcschedule(self, day, tz=None):
         '''
-        Returns the opening and closing times for the given ``day``. If the
-        method is called, the assumption is that ``day`` is an actual trading
-        day
+        Returns the opening and closing times (utc naive) for the given
+        ``day`` (``datetime.date`` instance) or for the next trading day if
+        ``day`` is not a trading day
 
         The return value is a tuple with 2 components: opentime, closetime
         '''
         while True:
-            i = self.idcache.index.searchsorted(day.date())
+            i = self.idcache.index.searchsorted(day)
             if i == len(self.idcache):
                 # keep a cache of 1 year to speed up searching
                 self.idcache = self._calendar.schedule(day, day + self.csize)
@@ -273,8 +315,4 @@ class PandasMarketCalendar(TradingCalendarBase):
 
             st = (x.tz_localize(None) for x in self.idcache.iloc[i, 0:2])
             opening, closing = st  # Get utc naive times
-            if day > closing:  # passed time is over the sessionend
-                day += ONEDAY  # wrap over to next day
-                continue
-
             return opening.to_pydatetime(), closing.to_pydatetime()
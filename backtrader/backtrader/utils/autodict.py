@@ -55,6 +55,9 @@ class AutoDict(dict):
 
     def _open(self):
         self._closed = False
+        for key, val in self.items():
+            if isinstance(val, (AutoDict, AutoOrderedDict)):
+                val._open()
 
     def __missing__(self, key):
         if self._closed:
@@ -88,6 +91,9 @@ class AutoOrderedDict(OrderedDict):
 
     def _open(self):
         self._closed = False
+        for key, val in self.items():
+            if isinstance(val, (AutoDict, AutoOrderedDict)):
+                val._open()
 
     def __missing__(self, key):
         if self._closed:
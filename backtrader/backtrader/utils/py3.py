@@ -21,6 +21,7 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import importlib
 import itertools
 import sys
 
@@ -131,3 +132,55 @@ def with_metaclass(meta, *bases):
         def __new__(cls, name, this_bases, d):
             return meta(name, bases, d)
     return type.__new__(metaclass, str('temporary_class'), (), {})
+
+
+def lazyimport(modname, modglobals, lazyattrs):
+    '''Defines attributes of the module ``modname`` (with globals
+    ``modglobals``) which are only imported when first accessed, using a
+    module level ``__getattr__`` (PEP 562, Python >= 3.7). With older
+    versions of Python the attributes are imported right away
+
+    ``lazyattrs`` is a dict with the attribute names as keys and tuples
+    ``(module, name)`` as values. ``module`` may be relative to ``modname``
+    and if ``name`` is ``None`` the attribute is the module itself
+
+    Attributes whose module cannot be imported (because an optional
+    dependency is missing) are not defined
+    '''
+    def load(name):
+        submod, objname = lazyattrs[name]
+        obj = importlib.import_module(submod, modname)
+        if objname is not None:
+            obj = getattr(obj, objname)
+
+        modglobals[name] = obj
+        return obj
+
+    if sys.version_info < (3, 7):
+        for name in lazyattrs:
+            try:
+                load(name)
+            except ImportError:
+                pass  # optional dependency not installed
+
+        return
+
+    def __getattr__(name):
+        if name not in lazyattrs:
+            raise AttributeError(
+                'module {!r} has no attribute {!r}'.format(modname, name))
+
+        try:
+            return load(name)
+        except ImportError as e:
+            err = AttributeError(
+                'module {!r} has no attribute {!r} ({})'.format(
+                    modname, name, e))
+            err.__cause__ = e
+            raise err
+
+    def __dir__():
+        return sorted(set(modglobals) | set(lazyattrs))
+
+    modglobals['__getattr__'] = __getattr__
+    modglobals['__dir__'] = __dir__
@@ -24,11 +24,18 @@ from __future__ import (absolute_import, division, print_function,
 import collections
 import io
 import itertools
+import struct
 import sys
+import threading
+
+try:
+    from collections.abc import Iterable
+except ImportError:  # python 2
+    from collections import Iterable
 
 import backtrader as bt
 from backtrader.utils.py3 import (map, with_metaclass, string_types,
-                                  integer_types)
+                                  integer_types, queue)
 
 
 class WriterBase(with_metaclass(bt.MetaParams, object)):
@@ -81,6 +88,24 @@ class WriterFile(WriterBase):
         Number of decimal places to round floats down to. With ``None`` no
         rounding is performed
 
+      - ``csv_buffer`` (default: ``0``)
+
+        Number of csv lines which are buffered before being written out in a
+        single block. With ``0`` each line is written out as soon as the
+        values are available
+
+      - ``csv_bgflush`` (default: ``False``)
+
+        If ``csv_buffer`` is active, whether the blocks of lines are written
+        out by a background thread
+
+      - ``csv_binary`` (default: ``None``)
+
+        Output stream (opened in binary mode) or filename to which the csv
+        values are additionally written in a compact binary columnar format,
+        in blocks of ``csv_buffer`` lines. Use ``WriterFile.readbinary`` to
+        read them back
+
     '''
     params = (
         ('out', sys.stdout),
@@ -95,8 +120,14 @@ class WriterFile(WriterBase):
         ('separators', ['=', '-', '+', '*', '.', '~', '"', '^', '#']),
         ('seplen', 79),
         ('rounding', None),
+
+        ('csv_buffer', 0),
+        ('csv_bgflush', False),
+        ('csv_binary', None),
     )
 
+    _BINMAGIC = b'BTCOL1'
+
     def __init__(self):
         self._len = itertools.count(1)
         self.headers = list()
@@ -110,18 +141,52 @@ class WriterFile(WriterBase):
             self.out = self.p.out
             self.close_out = self.p.close_out
 
+        self.outbin = self.p.csv_binary
+        if isinstance(self.outbin, string_types):
+            self.outbin = open(self.outbin, 'wb')
+
+        # csv lines are buffered if requested or for the binary output
+        self._buffered = self.p.csv_buffer > 0 or self.outbin is not None
+        self._rows = list()  # buffered (counter, values) lines
+        self._queue = None  # blocks of lines for the background thread
+
     def start(self):
         if self.p.csv:
             self.writelineseparator()
             self.writeiterable(self.headers, counter='Id')
 
+            if self.outbin is not None:
+                self._writebinheaders(self.headers)
+
+            if self.p.csv_buffer and self.p.csv_bgflush:
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(target=self._t_flush)
+                self._thread.daemon = True
+                self._thread.start()
+
     def stop(self):
+        self.flush()
+        if self._queue is not None:
+            self._queue.put(None)  # tell the thread to exit
+            self._thread.join()
+            self._queue = None
+
         if self.close_out:
             self.out.close()
 
+        if isinstance(self.p.csv_binary, string_types):
+            self.outbin.close()
+
     def next(self):
         if self.p.csv:
-            self.writeiterable(self.values, func=str, counter=next(self._len))
+            if not self._buffered:
+                self.writeiterable(self.values, func=str,
+                                   counter=next(self._len))
+            else:
+                self._rows.append((next(self._len), self.values))
+                if len(self._rows) >= self.p.csv_buffer:
+                    self._flushrows()
+
             self.values = list()
 
     def addheaders(self, headers):
@@ -130,10 +195,126 @@ class WriterFile(WriterBase):
 
     def addvalues(self, values):
         if self.p.csv:
-            if self.p.csv_filternan:
+            if self.p.csv_filternan and not self._buffered:
                 values = map(lambda x: x if x == x else '', values)
             self.values.extend(values)
 
+    def flush(self):
+        '''Writes out the buffered csv lines (if any) and waits for the
+        background thread (if any) to have written out all blocks'''
+        if self._rows:
+            self._flushrows()
+
+        if self._queue is not None:
+            self._queue.join()
+
+    def _flushrows(self):
+        rows, self._rows = self._rows, list()
+        if self._queue is not None:
+            self._queue.put(rows)
+        else:
+            self._writerows(rows)
+
+    def _t_flush(self):
+        while True:
+            rows = self._queue.get()
+            try:
+                if rows is None:
+                    break
+
+                self._writerows(rows)
+            finally:
+                self._queue.task_done()
+
+    def _writerows(self, rows):
+        filternan = self.p.csv_filternan
+        counter = self.p.csv_counter
+        lines = list()
+        for count, values in rows:
+            if filternan:
+                values = [x if x == x else '' for x in values]
+            if counter:
+                values = itertools.chain([count], values)
+
+            lines.append(self.p.csvsep.join(map(str, values)))
+
+        lines.append('')  # for the ending newline
+        self.out.write('\n'.join(lines))
+
+        if self.outbin is not None:
+            self._writebinrows([values for _, values in rows])
+
+    def _writebinstr(self, values):
+        data = '\x00'.join(values).encode('utf-8')
+        self.outbin.write(struct.pack('<I', len(data)))
+        self.outbin.write(data)
+
+    def _writebinheaders(self, headers):
+        self.outbin.write(self._BINMAGIC)
+        self.outbin.write(struct.pack('<I', len(headers)))
+        self._writebinstr([str(x) for x in headers])
+
+    def _writebinrows(self, rows):
+        # A block has the number of rows followed by each column with a type
+        # code and the values: 8 bytes ints/floats or 0 separated strings
+        self.outbin.write(struct.pack('<I', len(rows)))
+        for col in zip(*rows):
+            if all(isinstance(x, integer_types) and not isinstance(x, bool)
+                   for x in col):
+                self.outbin.write(b'q')
+                self.outbin.write(struct.pack('<%dq' % len(col), *col))
+            elif all(isinstance(x, (float, integer_types)) or x == ''
+                     for x in col):
+                col = [float('nan') if x == '' else x for x in col]
+                self.outbin.write(b'd')
+                self.outbin.write(struct.pack('<%dd' % len(col), *col))
+            else:
+                self.outbin.write(b's')
+                self._writebinstr([str(x) for x in col])
+
+    @classmethod
+    def readbinary(cls, fname):
+        '''Reads the binary columnar output written to ``fname`` (filename or
+        stream opened in binary mode) if ``csv_binary`` was set
+
+        Returns a tuple with the list of headers and the list of columns. Not
+        yet available values (and ``nan``) are returned as ``nan`` in numeric
+        columns and as empty strings in string columns
+        '''
+        f = open(fname, 'rb') if isinstance(fname, string_types) else fname
+
+        def readstr(count):
+            size, = struct.unpack('<I', f.read(4))
+            values = f.read(size).decode('utf-8').split('\x00')
+            return values if count else []
+
+        try:
+            if f.read(len(cls._BINMAGIC)) != cls._BINMAGIC:
+                raise ValueError('Not a binary writer output')
+
+            ncols, = struct.unpack('<I', f.read(4))
+            headers = readstr(ncols)
+            columns = [list() for i in range(ncols)]
+
+            while True:
+                nrows = f.read(4)
+                if not nrows:
+                    break
+
+                nrows, = struct.unpack('<I', nrows)
+                for col in columns:
+                    tcode = f.read(1).decode('ascii')
+                    if tcode == 's':
+                        col.extend(readstr(nrows))
+                    else:
+                        fmt = '<%d%s' % (nrows, tcode)
+                        col.extend(struct.unpack(fmt, f.read(nrows * 8)))
+        finally:
+            if f is not fname:
+                f.close()
+
+        return headers, columns
+
     def writeiterable(self, iterable, func=None, counter=''):
         if self.p.csv_counter:
             iterable = itertools.chain([counter], iterable)
@@ -145,9 +326,15 @@ class WriterFile(WriterBase):
         self.writeline(line)
 
     def writeline(self, line):
+        if self._rows or self._queue is not None:
+            self.flush()  # keep the order of the output
+
         self.out.write(line + '\n')
 
     def writelines(self, lines):
+        if self._rows or self._queue is not None:
+            self.flush()  # keep the order of the output
+
         for l in lines:
             self.out.write(l + '\n')
 
@@ -195,7 +382,7 @@ class WriterFile(WriterBase):
                     self.writelineseparator(level=level)
                 self.writeline(kline)
                 self.writedict(val, level=level + 1, recurse=True)
-            elif isinstance(val, (list, tuple, collections.Iterable)):
+            elif isinstance(val, (list, tuple, Iterable)):
                 line = ', '.join(map(str, val))
                 self.writeline(kline + ' ' + line)
             else:
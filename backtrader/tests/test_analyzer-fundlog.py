@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('period', 15),
+    )
+
+    def __init__(self):
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def next(self):
+        if self.cross > 0.0:
+            self.buy()
+        elif self.cross < 0.0:
+            self.close()
+
+
+ANALYZERS = [
+    (bt.analyzers.TimeReturn, dict(timeframe=bt.TimeFrame.Weeks)),
+    (bt.analyzers.TimeReturn, dict(timeframe=bt.TimeFrame.NoTimeFrame)),
+    (bt.analyzers.Returns, dict()),
+    (bt.analyzers.DrawDown, dict()),
+    (bt.analyzers.TimeDrawDown, dict(timeframe=bt.TimeFrame.Months)),
+    (bt.analyzers.VWR, dict()),
+    (bt.analyzers.SharpeRatio, dict(timeframe=bt.TimeFrame.Days)),
+    (bt.analyzers.PeriodStats, dict(timeframe=bt.TimeFrame.Months)),
+    (bt.analyzers.Calmar, dict(timeframe=bt.TimeFrame.Weeks, period=4)),
+]
+
+
+def run(fundlog, fundmode):
+    cerebro = bt.Cerebro(fundlog=fundlog)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addstrategy(RunStrategy)
+    cerebro.broker.set_fundmode(fundmode)
+    for analyzer, kwargs in ANALYZERS:
+        cerebro.addanalyzer(analyzer, **kwargs)
+
+    strat = cerebro.run()[0]
+    return strat
+
+
+def test_run(main=False):
+    for fundmode in [False, True]:
+        strat = run(fundlog=False, fundmode=fundmode)
+        fstrat = run(fundlog=True, fundmode=fundmode)
+
+        assert strat._fundlog is None
+        assert len(fstrat._fundlog) == len(fstrat)
+
+        for analyzer, fanalyzer in zip(strat.analyzers, fstrat.analyzers):
+            analysis = analyzer.get_analysis()
+            fanalysis = fanalyzer.get_analysis()
+            if main:
+                print(type(analyzer).__name__, fanalysis)
+
+            assert repr(analysis) == repr(fanalysis)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
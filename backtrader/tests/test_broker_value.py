@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import math
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('period', 15),
+        ('leverage', False),  # change the params of the comminfo
+        ('main', False),
+    )
+
+    def __init__(self):
+        self.crosses = [
+            btind.CrossOver(d.close, btind.SMA(d, period=self.p.period))
+            for d in self.datas
+        ]
+        self.checks = 0
+
+    def _brute_value(self):
+        # the broker keeps an exact sum of the values of the positions
+        broker = self.broker
+        values = []
+        for data, pos in broker.positions.items():
+            comminfo = broker.getcommissioninfo(data)
+            dvalue = comminfo.getvaluesize(pos.size, data.close[0])
+            dunrealized = comminfo.profitandloss(pos.size, pos.price,
+                                                 data.close[0])
+            if dvalue > 0:
+                dvalue -= dunrealized
+                values.append(dvalue / comminfo.get_leverage())
+                values.append(dunrealized)
+            else:
+                values.append(dvalue)
+
+        return broker.getcash() + math.fsum(values)
+
+    def next(self):
+        value = self.broker.getvalue()
+        assert value == self._brute_value()
+        self.checks += 1
+        if self.p.main:
+            print(len(self), value)
+
+        if self.p.leverage:  # in place, during the week of data1
+            comminfo = self.broker.getcommissioninfo(self.data1)
+            comminfo.p.leverage = 1.0 + len(self) % 3
+            if not self.checks % 50:
+                self.buy(data=self.data1)  # long positions are levered
+
+        for data, cross in zip(self.datas, self.crosses):
+            if cross > 0:
+                self.buy(data=data)
+            elif cross < 0:
+                self.sell(data=data)
+
+
+def test_run(main=False):
+    datas = [testcommon.getdata(i) for i in range(2)]
+    for leverage in [False, True]:
+        cerebros = testcommon.runtest(datas, RunStrategy, main=main,
+                                      leverage=leverage)
+
+        for cerebro in cerebros:
+            strat = cerebro.runstrats[0][0]
+            assert strat.checks > 0
+            if not leverage:  # else changed after the last valuation
+                assert cerebro.broker.getvalue() == strat._brute_value()
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+import os.path
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+
+def getdata(datafile, **kwargs):
+    datapath = os.path.join(testcommon.modpath, testcommon.dataspath,
+                            datafile)
+    return testcommon.DATAFEED(dataname=datapath, **kwargs)
+
+
+def getchainer():
+    d0 = testcommon.getdata(0, todate=datetime.datetime(2006, 6, 30))
+    d1 = getdata('2006-day-002.txt', fromdate=datetime.datetime(2006, 6, 15))
+    return bt.feeds.Chainer(d0, d1)
+
+
+def getrollover():
+    def checkdate(dt, d):
+        return dt.month == 6 and dt.day > 15
+
+    def checkcondition(d0, d1):
+        return d0.close[0] > 0.0 and d1.close[0] > 0.0
+
+    return bt.feeds.RollOver(testcommon.getdata(0), getdata('2006-day-002.txt'),
+                             checkdate=checkdate,
+                             checkcondition=checkcondition)
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('main', False),
+    )
+
+    def __init__(self):
+        self.sma = btind.SMA(self.data, period=10)
+
+    def start(self):
+        self.rows = list()
+
+    def next(self):
+        row = (len(self), self.data.datetime[0], self.data.close[0],
+               self.sma[0], self.broker.getvalue())
+        self.rows.append(row)
+        if self.p.main:
+            print(self.data.datetime.date(), row)
+
+        if len(self) % 9 == 0:
+            self.buy()
+        elif len(self) % 13 == 0:
+            self.close()
+
+
+def runfeed(getfeed, preload, main=False):
+    cerebro = bt.Cerebro(preload=preload, runonce=preload)
+    cerebro.adddata(getfeed())
+    cerebro.addstrategy(RunStrategy, main=main)
+    strat = cerebro.run()[0]
+
+    assert cerebro._dopreload == preload
+    assert cerebro._dorunonce == preload
+    return strat.rows
+
+
+def test_run(main=False):
+    for getfeed in [getchainer, getrollover]:
+        rows = runfeed(getfeed, preload=False, main=main)
+        prerows = runfeed(getfeed, preload=True, main=main)
+        assert rows
+        assert rows == prerows
+
+        # strictly increasing timestamps across the chained/rolled datas
+        dts = [row[1] for row in rows]
+        assert all(dt0 < dt1 for dt0, dt1 in zip(dts, dts[1:]))
+
+
+if __name__ == '__main__':
+    test_run(main=True)
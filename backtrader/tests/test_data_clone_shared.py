@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+
+class PassFilter(object):
+    def __init__(self, data):
+        pass
+
+    def __call__(self, data):
+        return False  # bar is not removed
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('main', False),
+    )
+
+    def __init__(self):
+        self.smas = [btind.SMA(d, period=15) for d in self.datas]
+        self.values = []
+
+    def next(self):
+        self.values.append(
+            tuple(d.close[0] for d in self.datas) +
+            tuple(sma[0] for sma in self.smas))
+
+    def stop(self):
+        d0 = self.datas[0]
+        self.shared = [d.close.array is d0.close.array for d in self.datas]
+        if self.p.main:
+            print(len(self.values), self.values[-1], self.shared)
+
+
+def runclones(preload, runonce, sharebuffers, main=False):
+    cerebro = bt.Cerebro(stdstats=False, preload=preload, runonce=runonce)
+    data = testcommon.getdata(0)
+    cerebro.adddata(data)
+    cerebro.adddata(data.clone(sharebuffers=sharebuffers))
+    cerebro.adddata(data.clone(sharebuffers=sharebuffers))
+    # filtered clone: holds its own storage
+    fdata = data.clone(sharebuffers=sharebuffers)
+    fdata.addfilter(PassFilter)
+    cerebro.adddata(fdata)
+    cerebro.addstrategy(RunStrategy, main=main)
+    return cerebro.run()[0]
+
+
+def test_run(main=False):
+    for preload, runonce in [(True, True), (True, False), (False, False)]:
+        copied = runclones(preload, runonce, False, main=main)
+        shared = runclones(preload, runonce, True, main=main)
+
+        assert shared.values == copied.values
+        assert copied.shared == [True, False, False, False]
+        if preload:
+            assert shared.shared == [True, True, True, False]
+        else:
+            assert shared.shared == copied.shared
+
+
+if __name__ == '__main__':
+    test_run(main=True)
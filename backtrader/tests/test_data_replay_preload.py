@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('main', False),
+    )
+
+    def __init__(self):
+        self.smas = [btind.SMA(d, period=5) for d in self.datas]
+
+    def start(self):
+        self.rows = list()
+
+    def prenext(self):
+        self.next()
+
+    def next(self):
+        # record what the system sees of each (partial) bar
+        row = [len(self)]
+        for data, sma in zip(self.datas, self.smas):
+            row.append(len(data))
+            if len(data):
+                row.extend(line[0] for line in data.lines)
+                row.extend([data.tick_open, data.tick_close])
+
+            if len(sma):
+                row.append(sma[0])
+
+        row.append(self.broker.getvalue())
+        self.rows.append(row)
+
+        if self.p.main:
+            print(','.join(str(x) for x in row))
+
+        if len(self) % 7 == 0:
+            self.buy(data=self.datas[-1])
+        elif len(self) % 11 == 0:
+            self.close(data=self.datas[-1])
+
+
+def runreplay(replaypreload, replaydata, main=False):
+    cerebro = bt.Cerebro(replaypreload=replaypreload)
+    data = testcommon.getdata(0)
+    if replaydata:
+        cerebro.adddata(data)
+        cerebro.replaydata(data, timeframe=bt.TimeFrame.Weeks)
+    else:
+        data.replay(timeframe=bt.TimeFrame.Weeks)
+        cerebro.adddata(data)
+
+    cerebro.addstrategy(RunStrategy, main=main)
+    strat = cerebro.run()[0]
+
+    # replayed data has been preloaded and runonce remains off
+    assert cerebro._dopreload == replaypreload
+    assert not (cerebro._dopreload and cerebro._dorunonce)
+    assert (cerebro.datas[-1]._preticks is not None) == replaypreload
+
+    return strat.rows
+
+
+def samerows(rows1, rows2):
+    if len(rows1) != len(rows2):
+        return False
+
+    for row1, row2 in zip(rows1, rows2):
+        if len(row1) != len(row2):
+            return False
+
+        for val1, val2 in zip(row1, row2):
+            if not (val1 == val2 or (val1 != val1 and val2 != val2)):
+                return False
+
+    return True
+
+
+def test_run(main=False):
+    for replaydata in [False, True]:
+        rows = runreplay(False, replaydata, main=main)
+        prerows = runreplay(True, replaydata, main=main)
+        assert rows
+        assert samerows(rows, prerows)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+import os.path
+
+import testcommon
+
+import backtrader as bt
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('main', False),
+    )
+
+    def start(self):
+        self.preloaded = bool(self.data.buflen())
+
+    def stop(self):
+        # keep the full resampled stream
+        self.bars = list(zip(*[list(line.array) for line in self.data.lines]))
+        if self.p.main:
+            print(len(self.bars), self.data.num2date(self.bars[-1][-1]))
+
+
+def getdata(datafile, timeframe, compression, **kwargs):
+    datapath = os.path.join(testcommon.modpath, testcommon.dataspath,
+                            datafile)
+    return bt.feeds.BacktraderCSVData(dataname=datapath,
+                                      timeframe=timeframe,
+                                      compression=compression,
+                                      **kwargs)
+
+
+def runresample(preload, datafile, timeframe, compression, dkwargs, kwargs,
+                resampledata=False, main=False):
+    cerebro = bt.Cerebro(stdstats=False, preload=preload, runonce=preload)
+    data = getdata(datafile, timeframe, compression, **dkwargs)
+    if resampledata:
+        cerebro.resampledata(data, **kwargs)
+    else:
+        data.resample(**kwargs)
+        cerebro.adddata(data)
+
+    cerebro.addstrategy(RunStrategy, main=main)
+    strat = cerebro.run()[0]
+    assert strat.preloaded == preload  # all datas are resampled
+    return strat.bars
+
+
+def samebars(bars1, bars2):
+    if len(bars1) != len(bars2):
+        return False
+
+    for bar1, bar2 in zip(bars1, bars2):
+        for val1, val2 in zip(bar1, bar2):
+            if not (val1 == val2 or (val1 != val1 and val2 != val2)):
+                return False
+
+    return True
+
+
+def test_run(main=False):
+    TF = bt.TimeFrame
+    checks = [
+        ('2006-min-005.txt', TF.Minutes, 5, dict(),
+         dict(timeframe=TF.Minutes, compression=60)),
+        ('2006-min-005.txt', TF.Minutes, 5, dict(),
+         dict(timeframe=TF.Minutes, compression=15, rightedge=False)),
+        ('2006-min-005.txt', TF.Minutes, 5, dict(),
+         dict(timeframe=TF.Minutes, compression=7, bar2edge=False)),
+        ('2006-min-005.txt', TF.Minutes, 5, dict(),
+         dict(timeframe=TF.Minutes, compression=30, adjbartime=False,
+              boundoff=5)),
+        ('2006-min-005.txt', TF.Minutes, 5,
+         dict(sessionend=datetime.time(17, 30)),
+         dict(timeframe=TF.Days, compression=1)),
+        ('2006-day-001.txt', TF.Days, 1, dict(),
+         dict(timeframe=TF.Weeks, compression=1)),
+        ('2006-day-001.txt', TF.Days, 1, dict(),
+         dict(timeframe=TF.Months, compression=2)),
+    ]
+
+    for datafile, timeframe, compression, dkwargs, kwargs in checks:
+        # preload goes through the bulk path, no preload bar by bar
+        bulkbars = runresample(True, datafile, timeframe, compression,
+                               dkwargs, kwargs, main=main)
+        bars = runresample(False, datafile, timeframe, compression,
+                           dkwargs, kwargs, main=main)
+        assert bulkbars
+        assert samebars(bulkbars, bars)
+
+        rbars = runresample(True, datafile, timeframe, compression,
+                            dkwargs, kwargs, resampledata=True, main=main)
+        assert samebars(rbars, bars)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import io
+import json
+
+import testcommon
+
+import backtrader as bt
+
+HISTORY = 5
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('main', False),
+    )
+
+    def __init__(self):
+        self.ntrades = 0
+        self.norders = 0
+        self.maxorders = 0
+
+    def notify_order(self, order):
+        if not order.alive():
+            self.norders += 1
+
+    def notify_trade(self, trade):
+        if trade.isclosed:
+            self.ntrades += 1
+
+    def next(self):
+        if len(self) % 4 == 1:
+            self.buy()
+        elif len(self) % 4 == 3:
+            self.close()
+
+        self.maxorders = max(self.maxorders, len(self._orders),
+                             len(self.broker.orders))
+
+    def stop(self):
+        if self.p.main:
+            print(self.ntrades, self.norders, self.maxorders)
+
+
+def runhistory(history, historylog=None, main=False):
+    cerebro = bt.Cerebro(history=history, historylog=historylog,
+                         tradehistory=True)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addstrategy(RunStrategy, main=main)
+    cerebro.addanalyzer(bt.analyzers.TradeAnalyzer)
+    strat = cerebro.run()[0]
+    return strat, cerebro.broker.getvalue()
+
+
+def test_run(main=False):
+    strat, value = runhistory(0, main=main)
+    out = io.StringIO()
+    hstrat, hvalue = runhistory(HISTORY, historylog=out, main=main)
+
+    # the results are the same, with less orders/trades in memory
+    assert hvalue == value
+    assert hstrat.ntrades == strat.ntrades
+    assert hstrat.norders == strat.norders
+    ta = strat.analyzers.tradeanalyzer.get_analysis()
+    hta = hstrat.analyzers.tradeanalyzer.get_analysis()
+    assert hta.pnl.net.total == ta.pnl.net.total
+
+    assert strat.maxorders > 2 * HISTORY
+    assert hstrat.maxorders <= 2 * HISTORY + 1  # +1: created in next
+
+    # what is not in memory is in the log
+    records = [json.loads(x) for x in out.getvalue().splitlines()]
+    logorders = [r for r in records if r['type'] == 'order']
+    logtrades = [r for r in records if r['type'] == 'trade']
+
+    memorders = [o for o in hstrat._orders if not o.alive()]
+    assert len(logorders) + len(memorders) == strat.norders
+
+    memtrades = [t for dt in hstrat._trades.values() for ts in dt.values()
+                 for t in ts if t.isclosed]
+    assert len(logtrades) + len(memtrades) == strat.ntrades
+    assert logtrades[0]['status'] == 'Closed'
+    assert len(logtrades[0]['history']) == 2
+
+    logpnl = sum(r['pnlcomm'] for r in logtrades)
+    mempnl = sum(t.pnlcomm for t in memtrades)
+    assert abs(logpnl + mempnl - ta.pnl.net.total) < 1e-6
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+PERIOD = 20
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('main', False),
+        ('prepend_constant', True),
+    )
+
+    def __init__(self):
+        self.ols = btind.OLS_Slope_InterceptN(
+            self.data.close, self.data.open, period=PERIOD,
+            prepend_constant=self.p.prepend_constant)
+        self.olst = btind.OLS_TransformationN(self.data.close, self.data.open)
+        self.values = []
+
+    def next(self):
+        if len(self.data) < PERIOD:
+            return  # regression not yet possible
+
+        self.values.append((
+            self.data.close.get(size=PERIOD), self.data.open.get(size=PERIOD),
+            self.ols.slope[0], self.ols.intercept[0], self.olst.zscore[0]))
+
+    def stop(self):
+        if self.p.main:
+            print(len(self.values), self.values[-1][2:])
+
+
+def refols(ys, xs, prepend_constant=True):
+    # two-pass regression of ys on xs and a constant
+    n = len(xs)
+    mx, my = sum(xs) / n, sum(ys) / n
+    sxy = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    sxx = sum((x - mx) ** 2 for x in xs)
+    beta = sxy / sxx
+    alpha = my - beta * mx
+    return (alpha, beta) if prepend_constant else (beta, alpha)
+
+
+def smols(ys, xs, prepend_constant=True):
+    try:
+        import pandas as pd
+        import statsmodels.api as sm
+    except ImportError:
+        return None
+
+    xs = sm.add_constant(pd.Series(xs), prepend=prepend_constant)
+    return tuple(sm.OLS(pd.Series(ys), xs).fit().params)
+
+
+def isclose(val1, val2, rel=1e-7):
+    if val1 != val1 or val2 != val2:
+        return val1 != val1 and val2 != val2
+
+    return abs(val1 - val2) <= rel * max(abs(val1), abs(val2), 1.0)
+
+
+def test_run(main=False):
+    for prepend_constant in [True, False]:
+        zscores = None
+        for runonce in [True, False]:
+            for exbar in [False, -1, 1]:
+                cerebro = bt.Cerebro(runonce=runonce, exactbars=exbar)
+                cerebro.adddata(testcommon.getdata(0))
+                cerebro.addstrategy(RunStrategy, main=main,
+                                    prepend_constant=prepend_constant)
+                values = cerebro.run()[0].values
+
+                for ys, xs, slope, intercept, zscore in values:
+                    ref = refols(ys, xs, prepend_constant)
+                    assert isclose(slope, ref[0])
+                    assert isclose(intercept, ref[1])
+
+                    smref = smols(ys, xs, prepend_constant)
+                    if smref is not None:
+                        assert isclose(slope, smref[0])
+                        assert isclose(intercept, smref[1])
+
+                if zscores is None:
+                    zscores = [vals[-1] for vals in values]
+                else:
+                    for z1, (_, _, _, _, z2) in zip(zscores, values):
+                        assert isclose(z1, z2, 1e-6)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('main', False),
+    )
+
+    def __init__(self):
+        self.inds = [
+            btind.Ichimoku(),
+            btind.KST(),
+            btind.MACDHisto(),
+            btind.Stochastic(),
+            btind.KAMA(),
+            btind.SMA(self.data0.close - self.data0.open, period=10),
+            btind.CrossOver(btind.SMA(self.data1), btind.EMA(self.data1)),
+        ]
+        self.values = []
+
+    def next(self):
+        self.values.append(
+            tuple(line[0] for ind in self.inds for line in ind.lines))
+
+    def stop(self):
+        self.arrays = [list(line.array) for ind in self.inds
+                       for line in ind.lines]
+        if self.p.main:
+            print(len(self.values), self.values[-1])
+
+
+def runplan(runonce, preload, indplan, main=False):
+    cerebro = bt.Cerebro(runonce=runonce, preload=preload, indplan=indplan)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.adddata(testcommon.getdata(1))
+    cerebro.addstrategy(RunStrategy, main=main)
+    return cerebro.run()[0]
+
+
+def samevalues(vals1, vals2):
+    for val1, val2 in zip(vals1, vals2):
+        if not (val1 == val2 or (val1 != val1 and val2 != val2)):
+            return False
+
+    return len(vals1) == len(vals2)
+
+
+def test_run(main=False):
+    for runonce, preload in [(True, True), (False, True), (False, False)]:
+        strat = runplan(runonce, preload, False, main=main)
+        pstrat = runplan(runonce, preload, True, main=main)
+
+        assert strat._plan is None
+        assert pstrat._plan and pstrat._planonce
+
+        assert len(strat.values) == len(pstrat.values)
+        for vals, pvals in zip(strat.values, pstrat.values):
+            assert samevalues(vals, pvals)
+
+        for arr, parr in zip(strat.arrays, pstrat.arrays):
+            assert samevalues(arr, parr)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
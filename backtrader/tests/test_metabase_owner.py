@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+
+class OwnedInd(bt.Indicator):
+    lines = ('diff',)
+    params = (('period', 5),)
+
+    def __init__(self):
+        self.sma = btind.SMA(self.data, period=self.p.period)
+        self.l.diff = self.data - self.sma
+
+
+class FailInd(bt.Indicator):
+    lines = ('fail',)
+
+    def __init__(self):
+        btind.SMA(self.data)
+        raise ValueError
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('main', False),
+    )
+
+    def __init__(self):
+        self.ind = OwnedInd(period=10)
+        self.op = self.data.close - self.ind
+        try:
+            FailInd()
+        except ValueError:
+            self.unwound = bt.metabase.ownercontext.stack[-1] is self
+        else:
+            self.unwound = False
+
+    def stop(self):
+        if self.p.main:
+            print(self.ind._owner, self.op._owner, self.ind.sma._owner)
+
+
+def test_run(main=False):
+    cerebro = bt.Cerebro()
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addstrategy(RunStrategy, main=main)
+    strat = cerebro.run()[0]
+
+    assert strat.env is cerebro
+    assert strat.ind._owner is strat
+    assert strat.op._owner is strat
+    assert strat.ind.sma._owner is strat.ind
+    assert strat.ind.p.period == 10 and strat.ind.sma.p.period == 10
+    assert strat.unwound  # back to the strategy after the error
+    assert not bt.metabase.ownercontext.stack
+
+    assert OwnedInd._packsdone and btind.SMA._packsdone
+
+
+if __name__ == '__main__':
+    test_run(main=True)
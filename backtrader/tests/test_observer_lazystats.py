@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import itertools
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('period', 15),
+    )
+
+    def __init__(self):
+        self.cross = [
+            btind.CrossOver(d.close, btind.SMA(d, period=self.p.period))
+            for d in self.datas]
+
+    def next(self):
+        for d, cross in zip(self.datas, self.cross):
+            if cross[0] > 0.0:
+                self.buy(data=d)
+            elif cross[0] < 0.0 and self.getposition(d).size:
+                self.close(data=d)
+
+
+def runstrat(ndatas, lazystats, runonce, preload, csv=False):
+    cerebro = bt.Cerebro(lazystats=lazystats, runonce=runonce,
+                         preload=preload)
+    for i in range(ndatas):
+        cerebro.adddata(testcommon.getdata(i))
+
+    cerebro.addstrategy(RunStrategy)
+    if csv:
+        cerebro.addwriter(bt.WriterStringIO, csv=True)
+
+    strat = cerebro.run()[0]
+    assert cerebro._dolazystats == (lazystats and not csv)
+
+    values = list()
+    for obs in strat.getobservers():
+        assert not obs._lazy
+        for line in obs.lines:
+            values.append([x if x == x else None for x in line.getzero(
+                0, len(line))])
+
+    return values
+
+
+def test_run(main=False):
+    for ndatas, runonce, preload in itertools.product(
+            [1, 2], [True, False], [True, False]):
+
+        values = runstrat(ndatas, False, runonce, preload)
+        lazyvalues = runstrat(ndatas, True, runonce, preload)
+        if main:
+            print(ndatas, runonce, preload, len(values),
+                  [sum(x is not None for x in v) for v in lazyvalues])
+
+        assert values == lazyvalues
+
+    # Not lazy if the values are needed in each cycle
+    values = runstrat(1, False, True, True)
+    assert runstrat(1, True, True, True, csv=True) == values
+
+
+if __name__ == '__main__':
+    test_run(main=True)
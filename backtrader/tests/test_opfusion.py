@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('main', False),
+    )
+
+    def __init__(self):
+        sma = btind.SMA(period=10)
+        self.range = self.data.high - self.data.low  # used in next
+        self.inds = [
+            self.data0.close - (sma * 1.5 + 2.0),
+            2.0 - abs(self.range - self.data.open) / self.data.close,
+            -(self.range * self.range),
+            btind.BollingerBands(),
+            btind.MACDHisto(),
+            btind.KST(),
+            btind.Stochastic(),
+        ]
+        self.values = []
+
+    def next(self):
+        self.values.append(
+            (self.range[0],) +
+            tuple(line[0] for ind in self.inds for line in ind.lines))
+
+    def stop(self):
+        self.arrays = [list(line.array) for ind in self.inds
+                       for line in ind.lines]
+        self.nops = countops(self)
+        if self.p.main:
+            print(len(self.values), self.nops, self.values[-1])
+
+
+class HeldStrategy(bt.Strategy):
+    # operations held in containers (not attributes) are not fused away
+    def __init__(self):
+        x = self.data.close - self.data.open
+        self.d = {'x': x}
+        self.y = x * 2.0 + 1.0
+        self.values = []
+
+    def next(self):
+        self.values.append((self.d['x'][0], self.y[0]))
+
+
+class SignalStrategy(bt.SignalStrategy):
+    # the signals are kept by the strategy in a defaultdict
+    def __init__(self):
+        x = self.data.close - btind.SMA(period=10) * 1.0
+        self.signal_add(bt.SIGNAL_LONG, x)
+        self.other = x * 2.0
+        self.values = []
+
+    def next(self):
+        self.values.append((self.other[0], self.broker.getvalue()))
+
+
+def countops(obj):
+    nops = 0
+    for ind in obj.getindicators():
+        if isinstance(ind, bt.LineActions):
+            nops += 1
+        else:
+            nops += countops(ind)
+
+    return nops
+
+
+def runfusion(runonce, preload, opfusion, main=False):
+    cerebro = bt.Cerebro(runonce=runonce, preload=preload,
+                         opfusion=opfusion, indplan=opfusion)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addstrategy(RunStrategy, main=main)
+    return cerebro.run()[0]
+
+
+def runheld(stcls, runonce, preload, opfusion):
+    cerebro = bt.Cerebro(runonce=runonce, preload=preload,
+                         opfusion=opfusion, indplan=opfusion)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addstrategy(stcls)
+    return cerebro.run()[0]
+
+
+def samevalues(vals1, vals2):
+    for val1, val2 in zip(vals1, vals2):
+        if not (val1 == val2 or (val1 != val1 and val2 != val2)):
+            return False
+
+    return len(vals1) == len(vals2)
+
+
+def test_run(main=False):
+    for runonce, preload in [(True, True), (False, True), (False, False)]:
+        strat = runfusion(runonce, preload, False, main=main)
+        fstrat = runfusion(runonce, preload, True, main=main)
+
+        assert fstrat.nops < strat.nops
+        assert len(fstrat.range.array) == len(strat.range.array)
+
+        assert len(strat.values) == len(fstrat.values)
+        for vals, fvals in zip(strat.values, fstrat.values):
+            assert samevalues(vals, fvals)
+
+        for arr, farr in zip(strat.arrays, fstrat.arrays):
+            assert samevalues(arr, farr)
+
+        for stcls in (HeldStrategy, SignalStrategy):
+            strat = runheld(stcls, runonce, preload, False)
+            fstrat = runheld(stcls, runonce, preload, True)
+            assert strat.values
+            assert len(strat.values) == len(fstrat.values)
+            for vals, fvals in zip(strat.values, fstrat.values):
+                assert samevalues(vals, fvals)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
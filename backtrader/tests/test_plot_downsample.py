@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import math
+import random
+
+import testcommon
+
+try:
+    from backtrader.plot import downsample
+except ImportError:
+    downsample = None  # matplotlib (and numpy) not installed
+
+NAN = float('NaN')
+SIZE = 1000
+THRESHOLD = 100
+
+
+def getys(seed=0):
+    rng = random.Random(seed)
+    ys = [100.0]
+    for i in range(SIZE - 1):
+        ys.append(ys[-1] + rng.gauss(0, 1))
+
+    return ys
+
+
+def check_lttb_ends():
+    xs = list(range(SIZE))
+    ys = getys()
+    idxs = downsample.lttb(xs, ys, THRESHOLD).tolist()
+    assert len(idxs) == THRESHOLD
+    assert idxs[0] == 0 and idxs[-1] == SIZE - 1  # first and last kept
+    assert idxs == sorted(set(idxs))
+
+
+def check_minmax_buckets():
+    ys = getys(1)
+    yss = [ys, [-y for y in ys]]
+    idxs = downsample.minmax(yss, THRESHOLD).tolist()
+    assert len(idxs) <= THRESHOLD
+
+    nbuckets = THRESHOLD // (2 * len(yss))
+    for start, end in downsample.buckets(SIZE, nbuckets):
+        bucket = range(start, end)
+        assert min(bucket, key=ys.__getitem__) in idxs
+        assert max(bucket, key=ys.__getitem__) in idxs
+
+
+def check_ohlc_ends():
+    xs = list(range(SIZE))
+    closes = getys(2)
+    opens = [closes[0]] + closes[:-1]
+    highs = [max(o, c) + 1.0 for o, c in zip(opens, closes)]
+    lows = [min(o, c) - 1.0 for o, c in zip(opens, closes)]
+    volumes = [float(i % 7) for i in range(SIZE)]
+
+    bxs, bopens, bhighs, blows, bcloses, bvolumes, width = \
+        downsample.ohlcbuckets(xs, opens, highs, lows, closes, volumes,
+                               THRESHOLD)
+
+    assert len(bcloses) == THRESHOLD
+    assert bopens[0] == opens[0] and bcloses[-1] == closes[-1]
+    assert max(bhighs) == max(highs) and min(blows) == min(lows)
+    assert width == SIZE / THRESHOLD
+
+
+def check_nan_gaps():
+    xs = list(range(SIZE))
+    ys = getys(3)
+    gap = range(400, 450)
+    for i in gap:
+        ys[i] = NAN
+
+    idxs = downsample.lttb(xs, ys, THRESHOLD).tolist()
+    nans = [i for i in idxs if math.isnan(ys[i])]
+    assert nans == [gap[0]]  # a single nan keeps the gap in the line
+    assert gap[0] - 1 in idxs and gap[-1] + 1 in idxs  # the segment ends
+    assert idxs[0] == 0 and idxs[-1] == SIZE - 1
+
+    idxs = downsample.minmax([ys], THRESHOLD).tolist()
+    assert not any(math.isnan(ys[i]) for i in idxs)
+    assert downsample.finite(ys).tolist() == [i for i in xs if i not in gap]
+
+
+def check_short():
+    size = THRESHOLD // 4
+    xs = list(range(size))
+    ys = getys(4)[:size]
+
+    assert downsample.lttb(xs, ys, THRESHOLD).tolist() == xs
+    assert downsample.minmax([ys], THRESHOLD).tolist() == xs
+
+    rets = downsample.ohlcbuckets(xs, ys, ys, ys, ys, ys, THRESHOLD)
+    for bys in rets[1:-1]:
+        assert bys.tolist() == ys
+
+
+def test_run(main=False):
+    if downsample is None:
+        return
+
+    check_lttb_ends()
+    check_minmax_buckets()
+    check_ohlc_ends()
+    check_nan_gaps()
+    check_short()
+    if main:
+        print('downsample checks passed')
+
+
+if __name__ == '__main__':
+    test_run(main=True)
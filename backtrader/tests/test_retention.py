@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+RETENTION = 20
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('main', False),
+    )
+
+    def __init__(self):
+        self.inds = [
+            btind.SMA(period=30),
+            btind.MACDHisto(),
+            self.data.high - self.data.low,
+        ]
+        self.values = []
+        self.maxbuf = 0
+
+    def next(self):
+        self.values.append(
+            (len(self), self.data.close[-RETENTION + 1]) +
+            tuple(line[0] for ind in self.inds for line in ind.lines))
+
+        if len(self) == 200:
+            self.buy()
+
+        self.maxbuf = max(self.maxbuf, self.data.buflen(),
+                          self.inds[0].buflen(), self.buflen())
+
+    def stop(self):
+        if self.p.main:
+            print(len(self), self.maxbuf, self.broker.getvalue())
+
+
+def runretention(retention, main=False):
+    cerebro = bt.Cerebro(runonce=False, preload=False, retention=retention)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addstrategy(RunStrategy, main=main)
+    return cerebro.run()[0], cerebro.broker.getvalue()
+
+
+def test_run(main=False):
+    strat, value = runretention(0, main=main)
+    rstrat, rvalue = runretention(RETENTION, main=main)
+
+    assert rstrat.values == strat.values
+    assert rvalue == value
+    assert len(rstrat) == len(strat)
+
+    # the lookback of the indicators is kept and twice as much at most
+    lookback = rstrat._minperiod
+    assert strat.maxbuf == len(strat)
+    assert rstrat.maxbuf < 2 * (RETENTION + lookback)
+    assert rstrat.data.buflen() >= RETENTION + lookback
+
+    # runonce does not use retention
+    cerebro = bt.Cerebro(retention=RETENTION)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addstrategy(RunStrategy)
+    ostrat = cerebro.run()[0]
+    assert ostrat.data.buflen() == len(ostrat.data)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import io
+import os
+import shutil
+import tempfile
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+SPLITS = [100, 101, 180]  # lines of the source (header included)
+
+ANALYZERS = ['tradeanalyzer', 'drawdown', 'vwr', 'timereturn', 'returns']
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('main', False),
+    )
+
+    def __init__(self):
+        self.ema = btind.EMA(period=15)
+        self.macd = btind.MACDHisto()
+        self.cross = btind.CrossOver(btind.SMA(period=10), btind.SMA())
+        self.values = []
+        self.nstops = 0
+
+    def next(self):
+        self.values.append(
+            (len(self), self.datetime[0], self.ema[0], self.macd.histo[0],
+             self.broker.getvalue()))
+
+        if self.cross > 0:
+            self.buy()
+        elif self.cross < 0 and self.position:
+            self.close()
+
+    def stop(self):
+        self.nstops += 1
+        if self.p.main:
+            print(len(self.values), self.broker.getvalue())
+
+
+class FeedsStrategy(bt.Strategy):
+    def __init__(self):
+        self.sma = btind.SMA(self.datas[-1], period=10)
+        self.values = []
+
+    def next(self):
+        self.values.append(
+            (len(self), self.datetime[0], len(self.datas[-1]),
+             self.datas[-1].close[0], self.sma[0]))
+
+
+def addanalyzers(cerebro):
+    cerebro.addanalyzer(bt.analyzers.TradeAnalyzer)
+    cerebro.addanalyzer(bt.analyzers.DrawDown)
+    cerebro.addanalyzer(bt.analyzers.VWR)
+    cerebro.addanalyzer(bt.analyzers.TimeReturn)
+    cerebro.addanalyzer(bt.analyzers.Returns)
+
+
+def runcontinue(runonce, preload, tmpdir, fundlog=False, main=False):
+    srcpath = os.path.join(testcommon.modpath, testcommon.dataspath,
+                           testcommon.datafiles[0])
+    with io.open(srcpath) as f:
+        lines = f.readlines()
+
+    path = os.path.join(tmpdir, 'data.txt')
+    with io.open(path, 'w') as f:
+        f.writelines(lines[:SPLITS[0]])
+
+    cerebro = bt.Cerebro(runonce=runonce, preload=preload, fundlog=fundlog)
+    cerebro.adddata(testcommon.DATAFEED(dataname=path))
+    cerebro.addstrategy(RunStrategy, main=main)
+    addanalyzers(cerebro)
+    strat = cerebro.run()[0]
+
+    # new bars arrive and only those are run
+    for start, end in zip(SPLITS, SPLITS[1:] + [len(lines)]):
+        with io.open(path, 'a') as f:
+            f.writelines(lines[start:end])
+
+        cerebro.runcontinue()
+
+    return strat, cerebro.broker.getvalue()
+
+
+def runfull(runonce, preload, fundlog=False, main=False):
+    cerebro = bt.Cerebro(runonce=runonce, preload=preload, fundlog=fundlog)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addstrategy(RunStrategy, main=main)
+    addanalyzers(cerebro)
+    strat = cerebro.run()[0]
+    return strat, cerebro.broker.getvalue()
+
+
+def getbars(data):
+    size = data.lines.size()
+    return [tuple(line.array[i] for line in data.lines[:size])
+            for i in range(data.buflen())]
+
+
+def addfeeds(cerebro, dataname, feeds):
+    data = testcommon.DATAFEED(dataname=dataname)
+    cerebro.adddata(data)
+    if feeds == 'clone':
+        cerebro.adddata(data.clone())
+    elif feeds == 'resample':
+        cerebro.resampledata(data, timeframe=bt.TimeFrame.Weeks)
+
+    cerebro.addstrategy(FeedsStrategy)
+
+
+def runfeeds(runonce, preload, feeds, tmpdir, retention=0):
+    srcpath = os.path.join(testcommon.modpath, testcommon.dataspath,
+                           testcommon.datafiles[0])
+    with io.open(srcpath) as f:
+        lines = f.readlines()
+
+    path = os.path.join(tmpdir, 'feeds.txt')
+    with io.open(path, 'w') as f:
+        f.writelines(lines)
+
+    cerebro = bt.Cerebro(runonce=runonce, preload=preload,
+                         retention=retention)
+    addfeeds(cerebro, path, feeds)
+    strat = cerebro.run()[0]
+
+    with io.open(path, 'w') as f:
+        f.writelines(lines[:SPLITS[0]])
+
+    cerebro = bt.Cerebro(runonce=runonce, preload=preload,
+                         retention=retention)
+    addfeeds(cerebro, path, feeds)
+    cstrat = cerebro.run()[0]
+
+    for start, end in zip(SPLITS, SPLITS[1:] + [len(lines)]):
+        with io.open(path, 'a') as f:
+            f.writelines(lines[start:end])
+
+        cerebro.runcontinue()
+
+    return strat, cstrat
+
+
+def isoweek(dt):
+    return bt.num2date(dt).date().isocalendar()[:2]
+
+
+def checkfeeds(main=False):
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for runonce, preload in [(True, True), (False, True), (False, False)]:
+            for feeds, retention in [('clone', 0), (None, 100)]:
+                strat, cstrat = runfeeds(runonce, preload, feeds, tmpdir,
+                                         retention=retention)
+                if main:
+                    print(feeds, len(strat.values), len(cstrat.values))
+
+                assert cstrat.values == strat.values
+
+            # A run delivers the incomplete bar of the last week: it is
+            # delivered again complete if the continuation updates it
+            strat, cstrat = runfeeds(runonce, preload, 'resample', tmpdir)
+            bars = getbars(strat.datas[-1])
+            cbars = getbars(cstrat.datas[-1])
+            if main:
+                print('resample', len(bars), len(cbars))
+
+            cbars = [bar for bar, nbar in zip(cbars, cbars[1:] + [None])
+                     if nbar is None or isoweek(bar[-1]) != isoweek(nbar[-1])]
+            assert cbars == bars
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_run(main=False):
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for runonce, preload, fundlog in [(True, True, False),
+                                          (False, True, False),
+                                          (False, False, False),
+                                          (True, True, True)]:
+            strat, value = runfull(runonce, preload, fundlog, main=main)
+            cstrat, cvalue = runcontinue(runonce, preload, tmpdir, fundlog,
+                                         main=main)
+
+            assert cstrat.values == strat.values
+            assert cvalue == value
+            assert cstrat.nstops == len(SPLITS) + 1
+
+            for line, cline in zip(strat.ema.lines, cstrat.ema.lines):
+                assert len(cline.array) == len(line.array)
+                for v, cv in zip(line.array, cline.array):
+                    assert cv == v or (cv != cv and v != v)  # NaN aware
+
+            for name in ANALYZERS:
+                ana = getattr(strat.analyzers, name).get_analysis()
+                cana = getattr(cstrat.analyzers, name).get_analysis()
+                assert cana == ana
+    finally:
+        shutil.rmtree(tmpdir)
+
+    checkfeeds(main=main)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
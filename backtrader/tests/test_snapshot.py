@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os
+import shutil
+import tempfile
+import threading
+import warnings
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+SNAPBAR = 120
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('main', False),
+        ('snapshot', None),
+    )
+
+    def __init__(self):
+        self.ema = btind.EMA(period=15)
+        self.rsi = btind.RSI()
+        self.cross = btind.CrossOver(btind.SMA(period=10), btind.SMA())
+        self.values = []
+        self.order = None
+        self.norders = 0
+        self.timers = []
+        self.lock = threading.Lock()  # cannot be pickled
+        self.add_timer(when=bt.timer.SESSION_END, monthdays=[1])
+
+    def notify_timer(self, timer, when, *args, **kwargs):
+        self.timers.append(len(self))
+
+    def notify_order(self, order):
+        if not order.alive():
+            self.order = None
+            self.norders += 1
+
+    def next(self):
+        self.values.append(
+            (len(self), self.datetime[0], self.ema[0], self.rsi[0],
+             self.broker.getvalue()))
+
+        if self.order is None:
+            if self.cross > 0 and not self.position:
+                self.order = self.buy(exectype=bt.Order.Limit,
+                                      price=self.data.close[0] * 0.99)
+            elif self.cross < 0 and self.position:
+                self.order = self.close()
+
+        if len(self) == SNAPBAR and self.p.snapshot:
+            self.cerebro.snapshot(self.p.snapshot, tail=50)
+
+    def stop(self):
+        if self.p.main:
+            print(len(self.values), self.norders, self.broker.getvalue())
+
+
+def runsnapshot(snapshot=None, restore=None, main=False):
+    cerebro = bt.Cerebro(preload=False, runonce=False)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addstrategy(RunStrategy, main=main, snapshot=snapshot)
+    cerebro.addanalyzer(bt.analyzers.TradeAnalyzer)
+    cerebro.addanalyzer(bt.analyzers.TimeReturn)
+    if restore:
+        cerebro.restore(restore)
+
+    strat = cerebro.run()[0]
+    return strat, cerebro.broker.getvalue()
+
+
+def test_run(main=False):
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, 'snapshot.bin')
+        with warnings.catch_warnings(record=True) as ws:
+            warnings.simplefilter('always')
+            strat, value = runsnapshot(snapshot=path, main=main)
+        rstrat, rvalue = runsnapshot(restore=path, main=main)
+    finally:
+        shutil.rmtree(tmpdir)
+
+    # the restored run starts after the snapshot and ends like the full run
+    assert rstrat.values == strat.values
+    assert rvalue == value
+    assert rstrat.norders == strat.norders
+    assert rstrat.timers == strat.timers
+    assert len(rstrat) == len(strat)
+    assert rstrat.data.buflen() < len(strat.data)
+
+    # the attributes left out are named
+    assert any('strat.0.lock' in str(w.message) for w in ws)
+
+    for name in ('tradeanalyzer', 'timereturn'):
+        ana = getattr(strat.analyzers, name).get_analysis()
+        rana = getattr(rstrat.analyzers, name).get_analysis()
+        assert rana == ana
+
+
+if __name__ == '__main__':
+    test_run(main=True)
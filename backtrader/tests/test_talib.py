@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import math
+
+import testcommon
+
+import backtrader as bt
+import backtrader.talib as bttalib
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('main', False),
+    )
+
+    def __init__(self):
+        d = self.data
+        MA_Type = bttalib.MA_Type
+        self.inds = [
+            # history dependent: stop and reverse, cumulative
+            bttalib.SAR(d.high, d.low),
+            bttalib.OBV(d.close, d.volume),
+            bttalib.AD(d.high, d.low, d.close, d.volume),
+            # unstable flag
+            bttalib.EMA(d.close, timeperiod=15),
+            bttalib.RSI(d.close),
+            # chains of exponential averages
+            bttalib.MACD(d.close),
+            bttalib.MACDFIX(d.close),
+            bttalib.APO(d.close),
+            bttalib.PPO(d.close),
+            bttalib.STOCHRSI(d.close),
+            bttalib.TRIX(d.close),
+            bttalib.DEMA(d.close),
+            bttalib.TEMA(d.close),
+            # exponential averages chosen with matype
+            bttalib.MA(d.close, timeperiod=10, matype=MA_Type.EMA),
+            bttalib.BBANDS(d.close, matype=MA_Type.DEMA),
+            # stable
+            bttalib.SMA(d.close),
+        ]
+        self.values = []
+
+    def next(self):
+        self.values.append(
+            [line[0] for ind in self.inds for line in ind.lines])
+
+    def stop(self):
+        if self.p.main:
+            print(len(self.values), self.values[-1])
+
+
+def isclose(a, b):
+    if a != a or b != b:  # NaN
+        return a != a and b != b
+
+    return math.fabs(a - b) <= 1e-9 * max(1.0, math.fabs(a), math.fabs(b))
+
+
+def test_run(main=False):
+    if not bttalib.__all__:
+        return  # talib is not installed
+
+    results = []
+    for runonce in [True, False]:
+        cerebro = bt.Cerebro(runonce=runonce, stdstats=False)
+        cerebro.adddata(testcommon.getdata(0))
+        cerebro.addstrategy(RunStrategy, main=main)
+        results.append(cerebro.run()[0].values)
+
+    once, nxt = results
+    assert len(once) == len(nxt)
+    for ovals, nvals in zip(once, nxt):
+        assert all(isclose(o, n) for o, n in zip(ovals, nvals))
+
+
+if __name__ == '__main__':
+    test_run(main=True)
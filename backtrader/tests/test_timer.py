@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+import os.path
+
+import testcommon
+
+import backtrader as bt
+
+
+TIMERS = [
+    dict(when=bt.timer.SESSION_START),
+    dict(when=bt.timer.SESSION_END, cheat=True),
+    dict(when=datetime.time(10, 0), repeat=datetime.timedelta(minutes=35)),
+    dict(when=datetime.time(11, 30), offset=datetime.timedelta(minutes=7),
+         weekdays=[2, 4]),
+    dict(when=datetime.time(9, 30), monthdays=[1, 2, 3], cheat=True),
+    dict(when=datetime.time(15, 0), weekdays=[5, 6, 7], weekcarry=True),
+]
+
+
+class RunStrategy(bt.Strategy):
+    params = (
+        ('main', False),
+    )
+
+    def __init__(self):
+        for kwargs in TIMERS:
+            self.add_timer(**kwargs)
+
+        # reference timers checked on each and every bar
+        self.reftimers = [bt.timer.Timer(tid=i, **kwargs)
+                          for i, kwargs in enumerate(TIMERS)]
+
+    def start(self):
+        self.notified = list()
+        self.expected = list()
+        for t in self.reftimers:
+            t.start(self.data)
+
+    def notify_timer(self, timer, when, *args, **kwargs):
+        self.notified.append((timer.p.tid, when))
+        if self.p.main:
+            print(self.data.datetime.datetime(), timer.p.tid, when)
+
+    def prenext(self):
+        self.next()
+
+    def next(self):
+        dt = self.data.datetime[0]
+        for t in sorted(self.reftimers, key=lambda x: not x.p.cheat):
+            if t.check(dt):
+                self.expected.append((t.p.tid, t.lastwhen))
+
+
+def test_run(main=False):
+    datapath = os.path.join(testcommon.modpath, testcommon.dataspath,
+                            '2006-min-005.txt')
+    data = bt.feeds.BacktraderCSVData(
+        dataname=datapath,
+        timeframe=bt.TimeFrame.Minutes, compression=5,
+        sessionstart=datetime.time(9, 0), sessionend=datetime.time(17, 30))
+
+    cerebro = bt.Cerebro()
+    cerebro.adddata(data)
+    cerebro.addstrategy(RunStrategy, main=main)
+    strat = cerebro.run()[0]
+
+    assert strat.notified
+    assert strat.notified == strat.expected
+
+
+if __name__ == '__main__':
+    test_run(main=True)
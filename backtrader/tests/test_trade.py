@@ -21,6 +21,8 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import copy
+
 import testcommon
 
 import backtrader as bt
@@ -127,6 +129,20 @@ def test_run(main=False):
     # assert tr.value == upvalue
     assert tr.commission == commission + upcomm
 
+    # snapshots are independent of further updates of the trade
+    snapshot = copy.copy(tr)
+    assert snapshot.ref == tr.ref
+    assert snapshot.isclosed
+    assert snapshot.long == tr.long
+    assert snapshot.history is tr.history
+
+    tr.update(order=order, size=size, price=price, value=value,
+              commission=commission, pnl=0.0, comminfo=FakeCommInfo())
+
+    assert tr.isopen
+    assert snapshot.isclosed
+    assert not snapshot.size
+
 
 if __name__ == '__main__':
     test_run(main=True)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+
+import testcommon
+
+import backtrader as bt
+
+
+def test_run(main=False):
+    cal = bt.TradingCalendar(
+        open=datetime.time(9, 30), close=datetime.time(16, 0),
+        holidays=[datetime.date(2006, 7, 4)],
+        earlydays=[(datetime.date(2006, 7, 3),
+                    datetime.time(9, 30), datetime.time(13, 0))])
+
+    day = datetime.datetime(2006, 6, 30, 12, 0)  # friday
+    for _ in range(2):  # 2nd round is served from the cache
+        assert cal.schedule(day) == (datetime.datetime(2006, 6, 30, 9, 30),
+                                     datetime.datetime(2006, 6, 30, 16, 0))
+
+        # over the close wraps to the next day
+        eday = datetime.datetime(2006, 6, 29, 17, 0)
+        assert cal.schedule(eday) == (datetime.datetime(2006, 6, 30, 9, 30),
+                                      datetime.datetime(2006, 6, 30, 16, 0))
+
+        eday = datetime.datetime(2006, 7, 3, 14, 0)  # over the early close
+        assert cal.schedule(eday)[1] == datetime.datetime(2006, 7, 4, 16, 0)
+        assert cal.schedule(eday.replace(hour=12))[1] == \
+            datetime.datetime(2006, 7, 3, 13, 0)
+
+        assert cal.nextday(day.date()) == datetime.date(2006, 7, 3)
+        assert cal.nextday(datetime.date(2006, 7, 3)) == \
+            datetime.date(2006, 7, 5)
+        assert cal.nextday_week(day.date()) == 27
+        assert cal.last_weekday(day.date())
+        assert cal.last_monthday(day.date())
+        assert not cal.last_yearday(day.date())
+
+    if main:
+        print('schedules cached:', len(cal._schedules))
+        print('next days cached:', len(cal._nextdays))
+
+
+if __name__ == '__main__':
+    test_run(main=True)
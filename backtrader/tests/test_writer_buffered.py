@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import io
+import math
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+
+class TestStrategy(bt.Strategy):
+    params = dict(main=False)
+
+    def __init__(self):
+        btind.SMA()
+
+
+def runwriter(**kwargs):
+    cerebro = bt.Cerebro()
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addstrategy(TestStrategy)
+    cerebro.addwriter(bt.WriterStringIO, csv=True, **kwargs)
+    cerebro.run()
+    return cerebro.runwriters[0]
+
+
+def test_run(main=False):
+    output = runwriter().out.getvalue()
+
+    binout = io.BytesIO()
+    for kwargs in [dict(csv_buffer=100),
+                   dict(csv_buffer=64, csv_bgflush=True),
+                   dict(csv_buffer=100, csv_bgflush=True, csv_binary=binout)]:
+        writer = runwriter(**kwargs)
+        assert writer.out.getvalue() == output
+
+    binout.seek(0)
+    headers, columns = bt.WriterFile.readbinary(binout)
+    if main:
+        print(headers)
+        for col in columns:
+            print(col[:3], col[-3:])
+
+    assert len(headers) == len(columns)
+    assert all(len(col) == 255 for col in columns)  # 255 bars in data
+
+    # compare against the csv (without the counter column)
+    lines = output.splitlines()[2:2 + 255]
+    for i, line in enumerate(lines):
+        fields = line.split(',')[1:]
+        for field, col in zip(fields, columns):
+            value = col[i]
+            if isinstance(value, float):
+                if math.isnan(value):
+                    assert field == ''
+                else:
+                    assert float(field) == value
+            else:
+                assert field == str(value)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015, 2016, 2017 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import argparse
+import os.path
+import subprocess
+import sys
+
+# The timing is done in a fresh interpreter for each run
+TIMER = \
+    'import time; t0 = time.time(); {}; print(time.time() - t0)'
+
+STMTS = [
+    ('import backtrader', 'import backtrader as bt'),
+    ('import backtrader + all namespaces',
+     'import backtrader as bt; '
+     '[getattr(bt, x) for x in ("feeds", "indicators", "studies", '
+     '"strategies", "analyzers", "stores", "brokers", "talib")]'),
+]
+
+
+def runstmt(stmt, runs):
+    # the backtrader package from this source tree is timed
+    env = dict(os.environ)
+    srcpath = os.path.join(os.path.dirname(__file__), '..')
+    pypath = [os.path.abspath(srcpath), env.get('PYTHONPATH', '')]
+    env['PYTHONPATH'] = os.pathsep.join(pypath)
+
+    times = []
+    for i in range(runs):
+        out = subprocess.check_output(
+            [sys.executable, '-c', TIMER.format(stmt)], env=env)
+        times.append(float(out.decode().strip().splitlines()[-1]))
+
+    times.sort()
+    return times[len(times) // 2]
+
+
+def runbench(args=None):
+    args = parse_args(args)
+    for name, stmt in STMTS:
+        print('{:<40} {:8.1f} ms (median of {} runs)'.format(
+            name, 1000.0 * runstmt(stmt, args.runs), args.runs))
+
+
+def parse_args(pargs=None):
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description=(
+            'Measures the time needed to import backtrader (the large '
+            'namespaces are imported when first used) and the time needed '
+            'to also import all those namespaces'))
+
+    parser.add_argument('--runs', default=11, type=int,
+                        help='Number of runs (each in a new interpreter)')
+
+    return parser.parse_args(pargs)
+
+
+if __name__ == '__main__':
+    runbench()
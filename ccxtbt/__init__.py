@@ -1,3 +1,6 @@
 from .ccxtbroker import *
 from .ccxtfeed import *
+from .ccxtrecord import *
+from .ccxtsim import *
 from .ccxtstore import *
+from .ccxtstream import *
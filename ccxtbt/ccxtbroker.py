@@ -28,6 +28,7 @@ from backtrader import BrokerBase, OrderBase, Order
 from backtrader.position import Position
 from backtrader.utils.py3 import queue, with_metaclass
 
+from .ccxtrecord import ReplayOver
 from .ccxtstore import CCXTStore
 
 
@@ -92,6 +93,10 @@ class CCXTBroker(with_metaclass(MetaCCXTBroker, BrokerBase)):
 
     Added new private_end_point method to allow using any private non-unified end point
 
+    When the session replayed by the store (see ``CCXTReplay``) has no response
+    for a request, the session is over: no new orders are placed and the open
+    orders are left as they are
+
     '''
 
     order_types = {Order.Market: 'market',
@@ -134,10 +139,15 @@ class CCXTBroker(with_metaclass(MetaCCXTBroker, BrokerBase)):
         self.notifs = queue.Queue()  # holds orders which are notified
 
         self.open_orders = list()
+        self._replayover = False  # the replayed session has no more responses
 
         self.startingcash = self.store._cash
         self.startingvalue = self.store._value
 
+    def stop(self):
+        super(CCXTBroker, self).stop()
+        self.store.stop()
+
     def get_balance(self):
         balance = self.store.get_balance()
         self.cash = self.store._cash
@@ -183,6 +193,9 @@ class CCXTBroker(with_metaclass(MetaCCXTBroker, BrokerBase)):
         if self.debug:
             print('Broker next() called')
 
+        if self._replayover:
+            return
+
         for o_order in list(self.open_orders):
             oID = o_order.ccxt_order['id']
 
@@ -192,7 +205,11 @@ class CCXTBroker(with_metaclass(MetaCCXTBroker, BrokerBase)):
                 print('Fetching Order ID: {}'.format(oID))
 
             # Get the order
-            ccxt_order = self.store.fetch_order(oID, o_order.data.p.dataname)
+            try:
+                ccxt_order = self.store.fetch_order(oID, o_order.data.p.dataname)
+            except ReplayOver:
+                self._replayover = True
+                return
 
             if self.debug:
                 print(json.dumps(ccxt_order, indent=self.indent))
@@ -205,16 +222,33 @@ class CCXTBroker(with_metaclass(MetaCCXTBroker, BrokerBase)):
                 self.notify(o_order)
                 self.open_orders.remove(o_order)
 
+            # Canceled at the exchange (not with cancel): stop fetching it
+            elif ccxt_order[self.mappings['canceled_order']['key']] == self.mappings['canceled_order']['value']:
+                o_order.cancel()
+                self.notify(o_order)
+                self.open_orders.remove(o_order)
+
     def _submit(self, owner, data, exectype, side, amount, price, params):
         order_type = self.order_types.get(exectype) if exectype else 'market'
 
         # Extract CCXT specific params if passed to the order
         params = params['params'] if 'params' in params else params
 
-        ret_ord = self.store.create_order(symbol=data.p.dataname, order_type=order_type, side=side,
-                                          amount=amount, price=price, params=params)
+        if self._replayover:
+            return None
 
-        _order = self.store.fetch_order(ret_ord['id'], data.p.dataname)
+        try:
+            ret_ord = self.store.create_order(symbol=data.p.dataname, order_type=order_type, side=side,
+                                              amount=amount, price=price, params=params)
+        except ReplayOver:
+            self._replayover = True
+            return None  # the order was not placed in the recorded session
+
+        try:
+            _order = self.store.fetch_order(ret_ord['id'], data.p.dataname)
+        except ReplayOver:
+            self._replayover = True
+            _order = ret_ord  # placed: kept open as it is
 
         order = CCXTOrder(owner, data, _order)
         order.price = ret_ord['price']
@@ -247,9 +281,16 @@ class CCXTBroker(with_metaclass(MetaCCXTBroker, BrokerBase)):
             print('Broker cancel() called')
             print('Fetching Order ID: {}'.format(oID))
 
+        if self._replayover:
+            return order
+
         # check first if the order has already been filled otherwise an error
         # might be raised if we try to cancel an order that is not open.
-        ccxt_order = self.store.fetch_order(oID, order.data.p.dataname)
+        try:
+            ccxt_order = self.store.fetch_order(oID, order.data.p.dataname)
+        except ReplayOver:
+            self._replayover = True
+            return order
 
         if self.debug:
             print(json.dumps(ccxt_order, indent=self.indent))
@@ -257,7 +298,11 @@ class CCXTBroker(with_metaclass(MetaCCXTBroker, BrokerBase)):
         if ccxt_order[self.mappings['closed_order']['key']] == self.mappings['closed_order']['value']:
             return order
 
-        ccxt_order = self.store.cancel_order(oID, order.data.p.dataname)
+        try:
+            ccxt_order = self.store.cancel_order(oID, order.data.p.dataname)
+        except ReplayOver:
+            self._replayover = True
+            return order
 
         if self.debug:
             print(json.dumps(ccxt_order, indent=self.indent))
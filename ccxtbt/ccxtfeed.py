@@ -22,15 +22,21 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import inspect
+import threading
 import time
 from collections import deque
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import backtrader as bt
 from backtrader.feed import DataBase
-from backtrader.utils.py3 import with_metaclass
+from backtrader.utils.py3 import queue, with_metaclass
 
+from .ccxtrecord import ReplayOver
 from .ccxtstore import CCXTStore
+from .ccxtstream import tradekey
+
+EPOCH = datetime(1970, 1, 1)
 
 
 class MetaCCXTFeed(DataBase.__class__):
@@ -55,6 +61,20 @@ class CCXTFeed(with_metaclass(MetaCCXTFeed, DataBase)):
       - ``backfill_start`` (default: ``True``)
         Perform backfilling at the start. The maximum possible historical data
         will be fetched in a single request.
+      - ``stream`` (default: ``None``)
+        Source of trades (see ``ccxtstream``) pushed by the exchange. In the
+        live state the trades are aggregated into bars of the timeframe and
+        compression of the data (ticks, seconds, minutes or days) instead of
+        polling the exchange. A bar is delivered when a trade of a later bar
+        arrives or when its time is over (estimated from the timestamp of
+        the last trade). Trades of bars already delivered are discarded.
+        The source is closed when the data is stopped
+      - ``stream_qsize`` (default: ``1000``)
+        Maximum number of trades waiting in the queue of the stream
+      - ``qcheck`` (default: ``0.5``)
+        Time in seconds to wake up if no trade is pushed by the stream, to
+        deliver a bar whose time is over and give the system a chance to
+        process events
 
     Changes From Ed's pacakge
 
@@ -62,6 +82,8 @@ class CCXTFeed(with_metaclass(MetaCCXTFeed, DataBase)):
           support sending some additional fetch parameters.
         - Added drop_newest option to avoid loading incomplete candles where exchanges
           do not support sending ohlcv params to prevent returning partial data
+        - The feed is over (notification ``DISCONNECTED``) when the session
+          replayed by the store has no response for the next request
 
     """
 
@@ -71,6 +93,9 @@ class CCXTFeed(with_metaclass(MetaCCXTFeed, DataBase)):
         ('fetch_ohlcv_params', {}),
         ('ohlcv_limit', 20),
         ('drop_newest', False),
+        ('stream', None),
+        ('stream_qsize', 1000),
+        ('qcheck', 0.5),
         ('debug', False)
     )
 
@@ -79,17 +104,41 @@ class CCXTFeed(with_metaclass(MetaCCXTFeed, DataBase)):
     # States for the Finite State Machine in _load
     _ST_LIVE, _ST_HISTORBACK, _ST_OVER = range(3)
 
+    # Length in milliseconds of the bar units which can be streamed
+    _BARUNITS = {
+        bt.TimeFrame.Ticks: 0,
+        bt.TimeFrame.Seconds: 1000,
+        bt.TimeFrame.Minutes: 60000,
+        bt.TimeFrame.Days: 86400000,
+    }
+
     # def __init__(self, exchange, symbol, ohlcv_limit=None, config={}, retries=5):
     def __init__(self, **kwargs):
         # self.store = CCXTStore(exchange, config, retries)
         self.store = self._store(**kwargs)
         self._data = deque()  # data queue for price data
-        self._last_id = ''  # last processed trade id for ohlcv
+        self._last_trade = None  # key of the last processed trade
         self._last_ts = 0  # last processed timestamp for ohlcv
+        self._stream = None  # queue with the trades of the stream
 
     def start(self, ):
         DataBase.start(self)
 
+        if self.p.stream is not None:
+            try:
+                unit = self._BARUNITS[self._timeframe]
+            except KeyError:
+                raise ValueError('Streaming does not support the timeframe %s' %
+                                 bt.TimeFrame.getname(self._timeframe))
+
+            self._barlen = unit * self._compression
+            self._bar = None  # bar being aggregated
+            self._streamend = False  # stream over: True or exception
+            self._streamstop = threading.Event()
+            self._stream = self.store.streaming_trades(self.p.stream,
+                                                       self.p.stream_qsize,
+                                                       self._streamstop)
+
         if self.p.fromdate:
             self._state = self._ST_HISTORBACK
             self.put_notification(self.DELAYED)
@@ -99,13 +148,36 @@ class CCXTFeed(with_metaclass(MetaCCXTFeed, DataBase)):
             self._state = self._ST_LIVE
             self.put_notification(self.LIVE)
 
+    def stop(self):
+        DataBase.stop(self)
+        if self._stream is not None:
+            # end the thread of the stream and wake up a waiting source
+            self._streamstop.set()
+            close = getattr(self.p.stream, 'close', None)
+            if close is not None and not inspect.isgenerator(self.p.stream):
+                close()  # a generator can only be closed by its thread
+
+            self._stream = None
+
+        self.store.stop()
+
     def _load(self):
         if self._state == self._ST_OVER:
             return False
 
+        try:
+            return self._load_state()
+        except ReplayOver:
+            self.put_notification(self.DISCONNECTED)
+            self._state = self._ST_OVER
+            return False
+
+    def _load_state(self):
         while True:
             if self._state == self._ST_LIVE:
-                if self._timeframe == bt.TimeFrame.Ticks:
+                if self._stream is not None:
+                    return self._load_stream()
+                elif self._timeframe == bt.TimeFrame.Ticks:
                     return self._load_ticks()
                 else:
                     self._fetch_ohlcv()
@@ -199,19 +271,20 @@ class CCXTFeed(with_metaclass(MetaCCXTFeed, DataBase)):
                 break
 
     def _load_ticks(self):
-        if self._last_id is None:
+        if self._last_trade is None:
             # first time get the latest trade only
-            trades = [self.store.fetch_trades(self.p.dataname)[-1]]
+            trades = self.store.fetch_trades(self.p.dataname)[-1:]
         else:
             trades = self.store.fetch_trades(self.p.dataname)
 
         for trade in trades:
-            trade_id = trade['id']
+            # ids are not necessarily strings of the same length
+            key = tradekey(trade)
 
-            if trade_id > self._last_id:
+            if self._last_trade is None or key > self._last_trade:
                 trade_time = datetime.strptime(trade['datetime'], '%Y-%m-%dT%H:%M:%S.%fZ')
                 self._data.append((trade_time, float(trade['price']), float(trade['amount'])))
-                self._last_id = trade_id
+                self._last_trade = key
 
         try:
             trade = self._data.popleft()
@@ -237,7 +310,7 @@ class CCXTFeed(with_metaclass(MetaCCXTFeed, DataBase)):
 
         tstamp, open_, high, low, close, volume = ohlcv
 
-        dtime = datetime.utcfromtimestamp(tstamp // 1000)
+        dtime = EPOCH + timedelta(milliseconds=tstamp)
 
         self.lines.datetime[0] = bt.date2num(dtime)
         self.lines.open[0] = open_
@@ -248,6 +321,79 @@ class CCXTFeed(with_metaclass(MetaCCXTFeed, DataBase)):
 
         return True
 
+    def _load_stream(self):
+        while not self._data:
+            if self._streamend:
+                if self._streamend is not True:
+                    self.put_notification(self.CONNBROKEN)
+                self.put_notification(self.DISCONNECTED)
+                self._state = self._ST_OVER
+                return False
+
+            try:
+                trade = self._stream.get(timeout=self._qcheck)
+            except queue.Empty:
+                if not self._bar_over():
+                    return None  # indicate timeout situation
+
+                self._close_bar()
+                continue
+
+            if trade is None or isinstance(trade, Exception):
+                self._streamend = trade or True
+                if self._bar is not None:
+                    self._close_bar()  # the last one
+                continue
+
+            self._add_trade(trade)
+
+        return self._load_ohlcv()
+
+    def _add_trade(self, trade):
+        key = tradekey(trade)
+        if self._last_trade is not None and key <= self._last_trade:
+            return  # already seen or out of order
+
+        self._last_trade = key
+        self._trade_recv = time.time(), key[0]
+
+        tstamp = key[0]
+        if self._barlen:
+            tstamp -= tstamp % self._barlen
+
+        if tstamp < self._last_ts or (self._barlen and tstamp == self._last_ts):
+            return  # in a bar already delivered
+
+        price, amount = float(trade['price']), float(trade['amount'])
+        bar = self._bar
+        if bar is not None and bar[0] != tstamp:
+            self._close_bar()
+            bar = None
+
+        if bar is None:
+            self._bar = [tstamp, price, price, price, price, amount]
+            if not self._barlen:
+                self._close_bar()  # a tick is a bar
+        else:
+            bar[2] = max(bar[2], price)
+            bar[3] = min(bar[3], price)
+            bar[4] = price
+            bar[5] += amount
+
+    def _close_bar(self):
+        self._data.append(self._bar)
+        self._last_ts = self._bar[0]
+        self._bar = None
+
+    def _bar_over(self):
+        # The time of the exchange is estimated from the last trade
+        if self._bar is None:
+            return False
+
+        recvtime, tstamp = self._trade_recv
+        now = tstamp + (time.time() - recvtime) * 1000
+        return now >= self._bar[0] + self._barlen
+
     def haslivedata(self):
         return self._state == self._ST_LIVE and self._data
 
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2017 Ed Bartosh <bartosh@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import collections
+import json
+import time
+
+import ccxt
+from ccxt.base.errors import ExchangeError
+
+
+class ReplayOver(Exception):
+    '''Raised when a replayed session has no response for a request, i.e.
+    the recorded session ended before it was made'''
+
+
+def _dumps(obj):
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def _key(name, args, kwargs):
+    return _dumps([name, list(args), kwargs])
+
+
+class CCXTRecorder(object):
+    '''Wraps a ccxt exchange and appends the requests made through it and
+    the responses to the file ``path`` as JSON lines
+
+    A session starts with a line describing the exchange (method
+    ``exchange``). Each request is then a line with the time ``t`` of the
+    response, the method ``m``, the arguments ``a`` and ``k`` and either the
+    response ``r`` or the error ``e`` (name and message) which was raised
+
+    Lines are flushed as they are written, so that the log of a session
+    which is killed is complete up to the last answered request. ``close``
+    closes the file, which is opened again (appending to the session) if
+    more requests are made
+    '''
+
+    def __init__(self, exchange, path):
+        self._exchange = exchange
+        self._path = path
+        self._out = open(path, 'a')
+
+        desc = dict(id=exchange.id, name=exchange.name, has=exchange.has,
+                    timeframes=exchange.timeframes,
+                    rateLimit=exchange.rateLimit)
+        self._write(dict(m='exchange', r=desc))
+
+    def _write(self, rec):
+        if self._out is None:
+            self._out = open(self._path, 'a')
+
+        rec['t'] = time.time()
+        self._out.write(_dumps(rec) + '\n')
+        self._out.flush()
+
+    def close(self):
+        '''Closes the file of the session'''
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+    def __getattr__(self, name):
+        attr = getattr(self._exchange, name)
+        if not callable(attr):
+            return attr
+
+        def request(*args, **kwargs):
+            rec = dict(m=name, a=args, k=kwargs)
+            try:
+                rec['r'] = ret = attr(*args, **kwargs)
+            except Exception as e:
+                rec['e'] = [type(e).__name__, str(e)]
+                raise
+            finally:
+                self._write(rec)
+
+            return ret
+
+        return request
+
+
+class CCXTReplay(object):
+    '''Stands in for a ccxt exchange and serves the responses recorded by
+    ``CCXTRecorder`` in ``path``. If the file holds several sessions, the
+    last one is replayed
+
+    The responses to identical requests are served in the order in which
+    they were recorded and recorded errors are raised again. A request for
+    which no response is left raises ``ReplayOver``
+    '''
+    rateLimit = 0  # answers are immediate, there is nothing to wait for
+
+    def __init__(self, path):
+        desc, recs = None, []
+        with open(path) as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break  # write interrupted by the end of the session
+
+                rec = json.loads(line)
+                if rec['m'] == 'exchange':
+                    desc, recs = rec['r'], []
+                else:
+                    recs.append(rec)
+
+        if desc is None:
+            raise ValueError('No recorded session in %s' % path)
+
+        self.id = desc['id']
+        self.name = desc['name']
+        self.has = desc['has']
+        self.timeframes = desc['timeframes']
+        self.urls = dict()
+
+        self._responses = collections.defaultdict(collections.deque)
+        for rec in recs:
+            self._responses[_key(rec['m'], rec['a'], rec['k'])].append(rec)
+
+    def pending(self, name, *args, **kwargs):
+        '''Returns how many responses are left for the request'''
+        return len(self._responses.get(_key(name, args, kwargs), ()))
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        def request(*args, **kwargs):
+            key = _key(name, args, kwargs)
+            try:
+                rec = self._responses[key].popleft()
+            except IndexError:
+                raise ReplayOver('No recorded response for %s' % key)
+
+            if 'e' in rec:
+                errname, msg = rec['e']
+                errcls = getattr(ccxt, errname, None)
+                if not (isinstance(errcls, type) and
+                        issubclass(errcls, Exception)):
+                    errcls = ExchangeError
+
+                raise errcls(msg)
+
+            return rec['r']
+
+        return request
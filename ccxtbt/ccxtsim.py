@@ -0,0 +1,496 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2017 Ed Bartosh <bartosh@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import bisect
+import collections
+import csv
+import random
+import time
+from datetime import datetime
+from functools import wraps
+
+from backtrader.metabase import MetaParams
+from backtrader.utils.py3 import string_types, with_metaclass
+from ccxt.base.errors import (BadSymbol, DDoSProtection, InsufficientFunds,
+                              InvalidOrder, NotSupported, OrderNotFound,
+                              RequestTimeout)
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def iso8601(timestamp):
+    '''Formats a timestamp in milliseconds like ccxt does'''
+    dt = datetime.utcfromtimestamp(timestamp / 1000.0)
+    return dt.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+
+def _timestamp(field):
+    try:
+        return int(float(field))
+    except ValueError:
+        pass
+
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d'):
+        try:
+            dt = datetime.strptime(field, fmt)
+        except ValueError:
+            continue
+
+        return int((dt - EPOCH).total_seconds() * 1000)
+
+    raise ValueError('Unknown timestamp format: %s' % field)
+
+
+def loadcandles(path):
+    '''Reads the candles of a csv file with the columns timestamp (in
+    milliseconds or as a date/datetime), open, high, low, close and
+    volume. A header line is skipped and further columns are ignored'''
+    candles = []
+    with open(path) as f:
+        for row in csv.reader(f):
+            if not row:
+                continue
+
+            try:
+                ts = _timestamp(row[0])
+            except ValueError:
+                if not candles:
+                    continue  # header
+                raise
+
+            candles.append([ts] + [float(x) for x in row[1:6]])
+
+    return candles
+
+
+def request(method):
+    '''Passes a call to ``method`` through the simulated network: latency,
+    rate limit and injected errors'''
+    @wraps(method)
+    def request_method(self, *args, **kwargs):
+        self._request(method.__name__)
+        return method(self, *args, **kwargs)
+
+    return request_method
+
+
+class CCXTSimulator(with_metaclass(MetaParams, object)):
+    '''In-process exchange which implements the unified ccxt methods used by
+    ``CCXTStore``. It can be passed to the store (and hence to ``CCXTFeed``
+    and ``CCXTBroker``) as ``exchange`` in place of the name of a ccxt
+    exchange
+
+    ``data`` maps symbols (like ``BTC/USDT``) to csv files (see
+    ``loadcandles``) or to lists of candles ``[timestamp, open, high, low,
+    close, volume]``
+
+    The market has a clock (``clock``, timestamp in milliseconds). Only the
+    candles with a timestamp up to the clock are published. The clock moves
+    to the next candle with ``advance`` or (``autoadvance``) when the
+    candles or trades of a symbol are polled twice in a row by a client
+    which is up to date
+
+    Orders are matched when they are created against the close of the last
+    published candle and when the clock advances against the new candles:
+    ``market`` at the open, ``limit`` if the price is reached, ``stop`` and
+    ``stop limit`` once the stop price (``stopPrice`` in the params or else
+    the price) has been reached, as a market or limit order
+
+    Params:
+
+      - ``timeframe`` (default: ``1m``): timeframe of the candles
+
+      - ``start`` (default: ``None``): initial clock. ``None`` publishes
+        the first candle
+
+      - ``balance`` (default: ``None``): dict with the initial amounts of
+        the currencies. Missing currencies start at ``0``
+
+      - ``fee`` (default: ``0.0``): fee rate charged in the quote currency
+
+      - ``fill_ratio`` (default: ``1.0``): largest part of the amount of an
+        order which is filled in a single match. Lower values produce
+        partial fills
+
+      - ``latency`` (default: ``0.0``): seconds added to each request
+
+      - ``jitter`` (default: ``0.0``): up to this number of seconds are
+        randomly added to the latency
+
+      - ``rateLimit`` (default: ``0``): milliseconds the clients have to
+        wait between requests (the ccxt attribute)
+
+      - ``minInterval`` (default: ``None``): milliseconds enforced between
+        requests. Faster requests raise ``DDoSProtection``. ``None`` uses
+        ``rateLimit``
+
+      - ``error_rate`` (default: ``0.0``): probability that a request fails
+        with ``RequestTimeout``. See also ``fail``
+
+      - ``seed`` (default: ``None``): seed for latency and errors
+
+      - ``autoadvance`` (default: ``True``): advance the clock when clients
+        poll for more data
+    '''
+    params = (
+        ('timeframe', '1m'),
+        ('start', None),
+        ('balance', None),
+        ('fee', 0.0),
+        ('fill_ratio', 1.0),
+        ('latency', 0.0),
+        ('jitter', 0.0),
+        ('rateLimit', 0),
+        ('minInterval', None),
+        ('error_rate', 0.0),
+        ('seed', None),
+        ('autoadvance', True),
+    )
+
+    id = 'simulator'
+    name = 'Simulator'
+    secret = 'simulator'  # "authenticated": the balance can be fetched
+
+    has = {
+        'fetchOHLCV': True,
+        'fetchTrades': True,
+        'fetchBalance': True,
+        'createOrder': True,
+        'cancelOrder': True,
+        'fetchOrder': True,
+        'fetchOpenOrders': True,
+    }
+
+    TRADES_LIMIT = 50  # default number of trades returned by fetch_trades
+
+    def __init__(self, data):
+        self.timeframes = {self.p.timeframe: self.p.timeframe}
+        self.urls = dict()
+        self.rateLimit = self.p.rateLimit
+        self._mininterval = self.p.minInterval
+        if self._mininterval is None:
+            self._mininterval = self.p.rateLimit
+
+        self._candles = dict()
+        self._ts = dict()
+        for symbol, candles in data.items():
+            if isinstance(candles, string_types):
+                candles = loadcandles(candles)
+
+            candles = sorted(candles)
+            self._candles[symbol] = candles
+            self._ts[symbol] = [c[0] for c in candles]
+
+        if self.p.start is not None:
+            self.clock = self.p.start
+        else:
+            self.clock = min(ts[0] for ts in self._ts.values() if ts)
+
+        self.balance = collections.defaultdict(float)
+        for symbol in self._candles:
+            for currency in symbol.split('/'):
+                self.balance.setdefault(currency, 0.0)
+        self.balance.update(self.p.balance or {})
+
+        self.orders = collections.OrderedDict()  # id -> order
+        self._open = collections.defaultdict(list)  # symbol -> open orders
+        self._orderid = 0
+
+        self._polls = dict()
+        self._rng = random.Random(self.p.seed)
+        self._failures = collections.defaultdict(collections.deque)
+        self._lastrequest = None
+        self.requests = collections.Counter()  # requests by method
+
+    def fail(self, method, error=None, count=1):
+        '''The next ``count`` requests of ``method`` raise ``error`` (an
+        exception class or instance, ``RequestTimeout`` by default)'''
+        self._failures[method].extend([error or RequestTimeout] * count)
+
+    def _request(self, name):
+        self.requests[name] += 1
+
+        now = time.time()
+        last, self._lastrequest = self._lastrequest, now
+        if last is not None and (now - last) * 1000 < self._mininterval:
+            raise DDoSProtection('%s: rate limit exceeded' % name)
+
+        if self.p.latency or self.p.jitter:
+            time.sleep(self.p.latency + self._rng.uniform(0, self.p.jitter))
+
+        failures = self._failures.get(name)
+        if failures:
+            error = failures.popleft()
+            if isinstance(error, type):
+                error = error('%s: injected error' % name)
+            raise error
+
+        if self.p.error_rate and self._rng.random() < self.p.error_rate:
+            raise RequestTimeout('%s: injected error' % name)
+
+    def _published(self, symbol):
+        try:
+            return bisect.bisect_right(self._ts[symbol], self.clock)
+        except KeyError:
+            raise BadSymbol('Unknown symbol %s' % symbol)
+
+    def price(self, symbol):
+        '''Returns the close of the last published candle of ``symbol``'''
+        end = self._published(symbol)
+        return self._candles[symbol][end - 1][4] if end else None
+
+    def advance(self, symbol=None):
+        '''Moves the clock to the next candle of ``symbol`` (of any symbol
+        with ``None``) and matches the open orders. Returns ``False`` if
+        there are no more candles'''
+        symbols = [symbol] if symbol is not None else self._candles
+        nexts = []
+        for s in symbols:
+            ts = self._ts[s]
+            i = bisect.bisect_right(ts, self.clock)
+            if i < len(ts):
+                nexts.append(ts[i])
+
+        if not nexts:
+            return False
+
+        last, self.clock = self.clock, min(nexts)
+        for s, orders in self._open.items():
+            ts = self._ts[s]
+            start = bisect.bisect_right(ts, last)
+            end = bisect.bisect_right(ts, self.clock)
+            for candle in self._candles[s][start:end]:
+                for order in list(orders):
+                    self._match(order, candle)
+
+        return True
+
+    def _poll(self, key, since, caughtup):
+        # A client which is up to date polling again means time goes by
+        if not caughtup:
+            self._polls.pop(key, None)
+            return False
+
+        mark = (since, self.clock)
+        if self.p.autoadvance and self._polls.get(key) == mark:
+            del self._polls[key]
+            return self.advance(key[1])
+
+        self._polls[key] = mark
+        return False
+
+    def _ohlcv(self, symbol, since, limit):
+        end = self._published(symbol)
+        if since is None:
+            start = max(0, end - limit) if limit else 0
+        else:
+            start = bisect.bisect_left(self._ts[symbol], since)
+
+        stop = min(end, start + limit) if limit else end
+        candles = [list(c) for c in self._candles[symbol][start:stop]]
+        return candles, since is None or start >= end - 1
+
+    @request
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None,
+                    params={}):
+        if timeframe not in self.timeframes:
+            raise NotSupported('Timeframe %s not supported' % timeframe)
+
+        candles, caughtup = self._ohlcv(symbol, since, limit)
+        if self._poll(('ohlcv', symbol), since, caughtup):
+            candles, caughtup = self._ohlcv(symbol, since, limit)
+
+        return candles
+
+    def _trades(self, symbol, limit):
+        end = self._published(symbol)
+        start = max(0, end - (limit or self.TRADES_LIMIT))
+        return [dict(id=str(c[0]), timestamp=c[0], datetime=iso8601(c[0]),
+                     symbol=symbol, side=None, price=c[4], amount=c[5],
+                     info=dict())
+                for c in self._candles[symbol][start:end]]
+
+    @request
+    def fetch_trades(self, symbol, since=None, limit=None, params={}):
+        '''Returns one trade (at the close) per published candle'''
+        self._poll(('trades', symbol), since, True)
+        trades = self._trades(symbol, limit)
+        if since is not None:
+            trades = [t for t in trades if t['timestamp'] >= since]
+
+        return trades
+
+    def _used(self):
+        used = collections.defaultdict(float)
+        for symbol, orders in self._open.items():
+            base, quote = symbol.split('/')
+            for order in orders:
+                if order['side'] == 'sell':
+                    used[base] += order['remaining']
+                else:
+                    price = order['price'] or self.price(symbol)
+                    used[quote] += (order['remaining'] * price *
+                                    (1.0 + self.p.fee))
+
+        return used
+
+    @request
+    def fetch_balance(self, params=None):
+        used = self._used()
+        balance = dict(free=dict(), used=dict(), total=dict(), info=dict())
+        for currency, total in self.balance.items():
+            acc = dict(free=total - used[currency], used=used[currency],
+                       total=total)
+            balance[currency] = acc
+            for k, v in acc.items():
+                balance[k][currency] = v
+
+        return balance
+
+    def _copy(self, order):
+        return dict(order, info=dict(order['info']), fee=dict(order['fee']))
+
+    @request
+    def create_order(self, symbol, type, side, amount, price=None,
+                     params={}):
+        price_ = self.price(symbol)  # also checks the symbol
+        if type not in ('market', 'limit', 'stop', 'stop limit'):
+            raise InvalidOrder('Order type %s not supported' % type)
+        if side not in ('buy', 'sell'):
+            raise InvalidOrder('Order side %s not supported' % side)
+        if not amount or amount <= 0:
+            raise InvalidOrder('Invalid amount %s' % amount)
+        if type != 'market' and not price:
+            raise InvalidOrder('Order type %s needs a price' % type)
+
+        base, quote = symbol.split('/')
+        used = self._used()
+        if side == 'buy':
+            needed = amount * (price or price_ or 0.0) * (1.0 + self.p.fee)
+            free = self.balance[quote] - used[quote]
+        else:
+            needed, free = amount, self.balance[base] - used[base]
+
+        if needed > free:
+            raise InsufficientFunds('%s: %s needed, %s available' %
+                                    (side, needed, free))
+
+        self._orderid += 1
+        oid = str(self._orderid)
+        order = dict(
+            id=oid, clientOrderId=None, timestamp=self.clock,
+            datetime=iso8601(self.clock), lastTradeTimestamp=None,
+            symbol=symbol, type=type, side=side,
+            price=price if type != 'market' else None,
+            amount=amount, filled=0.0, remaining=amount, cost=0.0,
+            average=None, status='open', trades=None,
+            fee=dict(currency=quote, cost=0.0),
+            info=dict(stopPrice=params.get('stopPrice', price),
+                      triggered=False),
+        )
+        self.orders[oid] = order
+        self._open[symbol].append(order)
+
+        if price_ is not None:  # match against the current price
+            self._match(order, [self.clock] + [price_] * 4 + [0.0])
+
+        return self._copy(order)
+
+    def _execprice(self, order, o, h, l):
+        buy = order['side'] == 'buy'
+        typ, info = order['type'], order['info']
+        if typ.startswith('stop') and not info['triggered']:
+            stop = info['stopPrice']
+            if not (h >= stop if buy else l <= stop):
+                return None
+
+            info['triggered'] = True
+            o = max(o, stop) if buy else min(o, stop)
+
+        if typ in ('market', 'stop'):
+            return o
+
+        price = order['price']
+        if buy:
+            return min(price, o) if l <= price else None
+
+        return max(price, o) if h >= price else None
+
+    def _match(self, order, candle):
+        ts, o, h, l = candle[:4]
+        price = self._execprice(order, o, h, l)
+        if price is None:
+            return
+
+        size = min(order['remaining'], order['amount'] * self.p.fill_ratio)
+        if order['remaining'] - size <= order['amount'] * 1e-9:
+            size = order['remaining']  # rounding leftovers
+
+        value = size * price
+        fee = value * self.p.fee
+        base, quote = order['symbol'].split('/')
+        if order['side'] == 'buy':
+            self.balance[base] += size
+            self.balance[quote] -= value + fee
+        else:
+            self.balance[base] -= size
+            self.balance[quote] += value - fee
+
+        order['filled'] += size
+        order['remaining'] -= size
+        order['cost'] += value
+        order['average'] = order['cost'] / order['filled']
+        order['fee']['cost'] += fee
+        order['lastTradeTimestamp'] = ts
+        if not order['remaining']:
+            order['status'] = 'closed'
+            self._open[order['symbol']].remove(order)
+
+    def _order(self, oid):
+        try:
+            return self.orders[oid]
+        except KeyError:
+            raise OrderNotFound('Order %s not found' % oid)
+
+    @request
+    def fetch_order(self, id, symbol=None, params={}):
+        return self._copy(self._order(id))
+
+    @request
+    def cancel_order(self, id, symbol=None, params={}):
+        order = self._order(id)
+        if order['status'] != 'open':
+            raise OrderNotFound('Order %s is %s' % (id, order['status']))
+
+        order['status'] = 'canceled'
+        self._open[order['symbol']].remove(order)
+        return self._copy(order)
+
+    @request
+    def fetch_open_orders(self, symbol=None, since=None, limit=None,
+                          params={}):
+        symbols = [symbol] if symbol is not None else list(self._open)
+        return [self._copy(order)
+                for s in symbols for order in self._open.get(s, ())]
+
+    fetchOpenOrders = fetch_open_orders  # name used by the store
@@ -21,6 +21,7 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import threading
 import time
 from datetime import datetime
 from functools import wraps
@@ -28,9 +29,12 @@ from functools import wraps
 import backtrader as bt
 import ccxt
 from backtrader.metabase import MetaParams
-from backtrader.utils.py3 import with_metaclass
+from backtrader.utils.py3 import queue, string_types, with_metaclass
 from ccxt.base.errors import NetworkError, ExchangeError
 
+from .ccxtrecord import CCXTRecorder, CCXTReplay
+from .ccxtstream import iterstream
+
 
 class MetaSingleton(MetaParams):
     '''Metaclass to make a metaclassed class a singleton'''
@@ -55,6 +59,17 @@ class CCXTStore(with_metaclass(MetaSingleton, object)):
 
     Added new private_end_point method to allow using any private non-unified end point
 
+    The exchange can also be an exchange instance, like ``CCXTSimulator``
+    (the balance is fetched at the start if it has a ``secret``)
+
+    Added recording and replaying of sessions:
+        - record: file name to which the requests made to the exchange and the
+          responses are appended (see ``CCXTRecorder``)
+        - replay: file name of a recorded session. The responses are served
+          from it (see ``CCXTReplay``) instead of from the exchange and
+          without waiting for the rate limit. Feeds end when the session is
+          over. The exchange name and config are not used
+
     '''
 
     # Supported granularities
@@ -95,8 +110,23 @@ class CCXTStore(with_metaclass(MetaSingleton, object)):
         '''Returns broker with *args, **kwargs from registered ``BrokerCls``'''
         return cls.BrokerCls(*args, **kwargs)
 
-    def __init__(self, exchange, currency, config, retries, debug=False, testnet=False):
-        self.exchange = getattr(ccxt, exchange)(config)
+    def __init__(self, exchange, currency, config, retries, debug=False, testnet=False,
+                 record=None, replay=None):
+        if replay is not None:
+            self.exchange = CCXTReplay(replay)
+            # balance fetched at the start if the session was authenticated
+            fetchbalance = self.exchange.pending('fetch_balance')
+        else:
+            if isinstance(exchange, string_types):
+                self.exchange = getattr(ccxt, exchange)(config)
+                fetchbalance = 'secret' in config
+            else:  # an exchange instance like CCXTSimulator
+                self.exchange = exchange
+                fetchbalance = bool(getattr(exchange, 'secret', None))
+
+            if record is not None:
+                self.exchange = CCXTRecorder(self.exchange, record)
+
         self.currency = currency
         self.retries = retries
         self.debug = debug
@@ -105,10 +135,15 @@ class CCXTStore(with_metaclass(MetaSingleton, object)):
             if 'test' in btmx.urls:
                 btmx.urls['api']=btmx.urls['test']
                 btmx.urls['api'] = btmx.urls['test']
-        balance = self.exchange.fetch_balance() if 'secret' in config else 0
+        balance = self.exchange.fetch_balance() if fetchbalance else 0
         self._cash = 0 if balance == 0 else balance['free'][currency]
         self._value = 0 if balance == 0 else balance['total'][currency]
 
+    def stop(self):
+        '''Closes the file of a recorded session (see ``CCXTRecorder``)'''
+        if isinstance(self.exchange, CCXTRecorder):
+            self.exchange.close()
+
     def get_granularity(self, timeframe, compression):
         if not self.exchange.has['fetchOHLCV']:
             raise NotImplementedError("'%s' exchange doesn't support fetching OHLCV data" % \
@@ -132,7 +167,8 @@ class CCXTStore(with_metaclass(MetaSingleton, object)):
             for i in range(self.retries):
                 if self.debug:
                     print('{} - {} - Attempt {}'.format(datetime.now(), method.__name__, i))
-                time.sleep(self.exchange.rateLimit / 1000)
+                if self.exchange.rateLimit:
+                    time.sleep(self.exchange.rateLimit / 1000)
                 try:
                     return method(self, *args, **kwargs)
                 except (NetworkError, ExchangeError):
@@ -171,6 +207,52 @@ class CCXTStore(with_metaclass(MetaSingleton, object)):
     def fetch_trades(self, symbol):
         return self.exchange.fetch_trades(symbol)
 
+    def streaming_trades(self, source, qsize=0, stop=None):
+        '''Returns a queue (bounded by ``qsize``) into which the trades of
+        ``source`` (see ``ccxtstream``) are put by a background thread.
+        ``None`` (end of the stream) or the exception which broke it is put
+        last
+
+        The thread ends without putting anything else once the event
+        ``stop`` is set. A source waiting for trades has to be closed too
+        (see ``ccxtstream``)'''
+        q = queue.Queue(maxsize=qsize)
+        if stop is None:
+            stop = threading.Event()
+
+        t = threading.Thread(target=self._t_streaming_trades,
+                             kwargs=dict(source=source, q=q, stop=stop))
+        t.daemon = True
+        t.start()
+        return q
+
+    def _t_streaming_trades(self, source, q, stop):
+        def put(item):
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.5)  # wait if the queue is full
+                    return True
+                except queue.Full:
+                    pass
+
+            return False
+
+        try:
+            for trades in iterstream(source):
+                if isinstance(trades, dict):
+                    trades = [trades]
+
+                for trade in trades:
+                    if not put(trade):
+                        return
+
+        except Exception as e:
+            if self.debug:
+                print('{} - Stream broken: {}'.format(datetime.now(), e))
+            put(e)
+        else:
+            put(None)
+
     @retry
     def fetch_ohlcv(self, symbol, timeframe, since, limit, params={}):
         if self.debug:
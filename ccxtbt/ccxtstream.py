@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2017 Ed Bartosh <bartosh@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+'''
+Sources of trades pushed to ``CCXTFeed`` (parameter ``stream``)
+
+A source is an iterable or an asynchronous iterable (like a websocket
+client) which produces ccxt trade structures (dicts with at least
+``timestamp``, ``price`` and ``amount``) or lists of them
+
+A source may have a ``close`` method, called from another thread when the
+feed is stopped, to end an iteration which is waiting for trades
+'''
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import json
+import socket
+import threading
+
+
+def tradekey(trade):
+    '''Returns a key which orders the trades: by timestamp and then by id.
+    Numeric ids are compared as numbers'''
+    tid = trade.get('id')
+    if tid is None:
+        tid = (0, 0)
+    elif isinstance(tid, int) or tid.isdigit():
+        tid = (0, int(tid))
+    else:
+        tid = (1, tid)
+
+    return trade['timestamp'], tid
+
+
+def iterstream(source):
+    '''Iterates over ``source`` which may be an asynchronous iterable. The
+    items are produced in an event loop owned by the calling thread'''
+    if not hasattr(source, '__aiter__'):
+        for item in source:
+            yield item
+
+        return
+
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    aiterator = source.__aiter__()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(aiterator.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.close()
+
+
+def _jsonlines(lines):
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+class FileTrades(object):
+    '''Trades read from a file, one JSON object (or list) per line
+
+    With ``follow`` the file is followed as it grows (checking every
+    ``interval`` seconds) and the source only ends with ``close``
+    '''
+    def __init__(self, path, follow=False, interval=0.1):
+        self.path = path
+        self.follow = follow
+        self.interval = interval
+        self._closed = threading.Event()
+
+    def close(self):
+        '''Ends the current iteration'''
+        self._closed.set()
+
+    def _lines(self, f):
+        pending = ''
+        while not self._closed.is_set():
+            line = f.readline()
+            if not line:
+                if not self.follow:
+                    if pending:
+                        yield pending
+                    return
+
+                self._closed.wait(self.interval)
+                continue
+
+            pending += line
+            if pending.endswith('\n'):
+                yield pending
+                pending = ''
+
+    def __iter__(self):
+        self._closed.clear()
+        with open(self.path) as f:
+            for trade in _jsonlines(self._lines(f)):
+                yield trade
+
+
+class SocketTrades(object):
+    '''Trades read from a socket connected to ``address`` (host, port), one
+    JSON object (or list) per line, until the connection is closed (by the
+    other end or with ``close``)'''
+    def __init__(self, address, timeout=None):
+        self.address = address
+        self.timeout = timeout
+        self._sock = None
+
+    def close(self):
+        '''Shuts the connection down, which ends the current iteration'''
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except (OSError, socket.error):
+                pass  # already closed
+
+    def __iter__(self):
+        self._sock = sock = socket.create_connection(self.address,
+                                                     self.timeout)
+        try:
+            f = sock.makefile('r')
+            for trade in _jsonlines(f):
+                yield trade
+        finally:
+            self._sock = None
+            sock.close()
+
+
+class WatchTrades(object):
+    '''Asynchronous iterator over the trades of ``symbol`` pushed by a
+    websocket enabled exchange (``watch_trades`` of ccxt.pro)'''
+    def __init__(self, exchange, symbol):
+        self.exchange = exchange
+        self.symbol = symbol
+        self._closed = False
+
+    def close(self):
+        '''Ends the iteration once the pending request is answered'''
+        self._closed = True
+
+    def __aiter__(self):
+        self._closed = False
+        return self
+
+    def __anext__(self):
+        if self._closed:
+            raise StopAsyncIteration
+
+        return self.exchange.watch_trades(self.symbol)
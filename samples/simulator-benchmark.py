@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2017 Ed Bartosh <bartosh@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+'''
+Measures the live stack (CCXTStore, CCXTFeed, CCXTBroker) against the local
+exchange simulator for a growing number of symbols:
+
+  - bars/s: candles delivered to a strategy by one CCXTFeed per symbol
+  - round trips/s: orders created and then fetched until closed
+'''
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import argparse
+import csv
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import backtrader as bt
+
+from ccxtbt import CCXTFeed, CCXTSimulator, CCXTStore
+
+START = datetime(2019, 1, 1)
+EPOCH = datetime(1970, 1, 1)
+
+
+def writecandles(path, bars, rng):
+    start = int((START - EPOCH).total_seconds() * 1000)
+    close = 100.0
+    with open(path, 'w') as f:
+        w = csv.writer(f)
+        w.writerow(['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        for i in range(bars):
+            open_, close = close, close * (1.0 + rng.gauss(0, 0.002))
+            high = max(open_, close) * (1.0 + abs(rng.gauss(0, 0.001)))
+            low = min(open_, close) * (1.0 - abs(rng.gauss(0, 0.001)))
+            w.writerow([start + i * 60000, open_, high, low, close,
+                        rng.randint(1, 100)])
+
+
+class St(bt.Strategy):
+    def stop(self):
+        self.bars = sum(len(data) for data in self.datas)
+
+
+def simulator(files, args):
+    CCXTStore._singleton = None  # a new store for a new exchange
+    return CCXTSimulator(
+        files, balance={'USDT': 1e12}, fill_ratio=args.fill_ratio,
+        latency=args.latency, error_rate=args.error_rate, seed=args.seed)
+
+
+def benchfeeds(files, args):
+    sim = simulator(files, args)
+    kwargs = dict(exchange=sim, currency='USDT', config={}, retries=10)
+    todate = START + timedelta(minutes=args.bars - 2)
+
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.addstrategy(St)
+    for symbol in files:
+        cerebro.adddata(CCXTFeed(dataname=symbol, ohlcv_limit=args.limit,
+                                 timeframe=bt.TimeFrame.Minutes,
+                                 compression=1, fromdate=START,
+                                 todate=todate, **kwargs))
+
+    t0 = time.time()
+    strat = cerebro.run()[0]
+    return strat.bars, time.time() - t0, sum(sim.requests.values())
+
+
+def benchorders(files, args):
+    sim = simulator(files, args)
+    store = CCXTStore(exchange=sim, currency='USDT', config={}, retries=10)
+
+    roundtrips = 0
+    t0 = time.time()
+    for i in range(args.orders):
+        for symbol in files:
+            order = store.create_order(symbol, 'market', 'buy', 1.0, None, {})
+            while store.fetch_order(order['id'], symbol)['status'] != 'closed':
+                # partial fills need new candles: stop if there are no more
+                if not sim.advance(symbol):
+                    return roundtrips, time.time() - t0
+
+            roundtrips += 1
+
+    return roundtrips, time.time() - t0
+
+
+def runbench(args=None):
+    args = parse_args(args)
+
+    rng = random.Random(args.seed)
+    tmpdir = tempfile.mkdtemp()
+    try:
+        allfiles = dict()
+        for i in range(max(args.symbols)):
+            path = os.path.join(tmpdir, 'S%d-USDT.csv' % i)
+            writecandles(path, args.bars, rng)
+            allfiles['S%d/USDT' % i] = path
+
+        print('symbols,bars,bars/s,requests/bar,roundtrips,roundtrips/s')
+        for nsymbols in args.symbols:
+            files = dict(list(allfiles.items())[:nsymbols])
+            bars, elapsed, requests = benchfeeds(files, args)
+            trips, telapsed = benchorders(files, args)
+            print('%d,%d,%.1f,%.2f,%d,%.1f' % (
+                nsymbols, bars, bars / elapsed, requests / max(bars, 1),
+                trips, trips / telapsed))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def parse_args(pargs=None):
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description='Benchmark of the live stack against CCXTSimulator')
+
+    parser.add_argument('--symbols', default='1,10,100,500',
+                        type=lambda x: [int(n) for n in x.split(',')],
+                        help='Comma separated numbers of symbols to run')
+
+    parser.add_argument('--bars', default=200, type=int,
+                        help='Candles per symbol')
+
+    parser.add_argument('--limit', default=20, type=int,
+                        help='ohlcv_limit of the feeds')
+
+    parser.add_argument('--orders', default=5, type=int,
+                        help=('Orders per symbol in the round trip test. It '
+                              'ends early if the candles run out'))
+
+    parser.add_argument('--fill-ratio', default=1.0, type=float,
+                        help='Fill ratio of the simulator (partial fills)')
+
+    parser.add_argument('--latency', default=0.0, type=float,
+                        help='Latency of each request in seconds')
+
+    parser.add_argument('--error-rate', default=0.0, type=float,
+                        help='Probability of a request failing')
+
+    parser.add_argument('--seed', default=0, type=int,
+                        help='Seed for the candles and the simulator')
+
+    return parser.parse_args(pargs)
+
+
+if __name__ == '__main__':
+    runbench()
@@ -0,0 +1,162 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from backtrader import Strategy, Cerebro, TimeFrame
+
+from ccxtbt import CCXTBroker, CCXTFeed, CCXTSimulator, CCXTStore
+
+START = 1546300800000  # 2019-01-01 00:00 UTC in milliseconds
+MINUTE = 60000
+
+
+def fetch_ohlcv(symbol, timeframe=None, since=None, limit=None, params={}):
+    """
+    Serves 10 one minute candles, starting at 2019-01-01 00:00
+    """
+    candles = [[START + i * MINUTE, 10 + i, 11 + i, 9 + i, 10.5 + i, 100 + i]
+               for i in range(10)]
+    since = since or START
+    return [c for c in candles if c[0] >= since][:limit]
+
+
+class TestRecordReplay(unittest.TestCase):
+    """
+    A session recorded with the ``record`` parameter of the store is served back by the store with the ``replay``
+    parameter. The strategy must see the same bars, without contacting the exchange and without waiting for the
+    rate limit.
+    """
+
+    def setUp(self):
+        CCXTStore._singleton = None
+        self.tmpdir = tempfile.mkdtemp()
+        self.log = os.path.join(self.tmpdir, 'session.log')
+
+    def tearDown(self):
+        CCXTStore._singleton = None
+        shutil.rmtree(self.tmpdir)
+
+    @patch('ccxt.binance.fetch_ohlcv', side_effect=fetch_ohlcv)
+    def record(self, fetch_ohlcv_mock):
+        finished_strategies = backtesting(record=self.log)
+        self.assertTrue(fetch_ohlcv_mock.called)
+        self.assertIsNone(CCXTStore._singleton.exchange._out)  # closed by the feed
+        CCXTStore._singleton = None
+        return finished_strategies[0].bars
+
+    def test_replay(self):
+        recorded = self.record()
+        self.assertEqual(len(recorded), 3)
+
+        with patch('ccxt.binance.fetch_ohlcv') as fetch_ohlcv_mock, \
+                patch('ccxtbt.ccxtstore.time.sleep') as sleep_mock:
+            finished_strategies = backtesting(replay=self.log)
+
+        fetch_ohlcv_mock.assert_not_called()
+        sleep_mock.assert_not_called()
+        self.assertEqual(finished_strategies[0].bars, recorded)
+
+    def test_replay_over(self):
+        recorded = self.record()
+
+        # keep the description of the exchange and the backfill requests
+        with open(self.log) as f:
+            lines = f.readlines()
+        with open(self.log, 'w') as f:
+            f.writelines(lines[:3])
+
+        finished_strategies = backtesting(replay=self.log)
+        replayed = finished_strategies[0].bars
+        self.assertLess(len(replayed), len(recorded))
+        self.assertEqual(replayed, recorded[:len(replayed)])
+
+
+    def test_broker_replay_over(self):
+        candles = [[START + i * MINUTE, 10 + i, 12 + i, 9 + i, 11 + i, 5] for i in range(10)]
+        sim = CCXTSimulator({'BNB/USDT': candles}, balance={'USDT': 1000})
+        strategy = backtesting_broker(exchange=sim, record=self.log)[0]
+        self.assertEqual(len(strategy.completed), 1)
+        CCXTStore._singleton = None
+
+        # the session ends right after the order was created
+        with open(self.log) as f:
+            lines = f.readlines()
+        created = [i for i, line in enumerate(lines) if '"m":"create_order"' in line][0]
+        with open(self.log, 'w') as f:
+            f.writelines(lines[:created + 1])
+
+        strategy = backtesting_broker(replay=self.log)[0]
+        self.assertEqual(len(strategy.orders), 1)
+        self.assertEqual(strategy.completed, set())
+        self.assertTrue(strategy.orders[0].alive())  # left as it is
+
+
+class TestStrategy(Strategy):
+
+    def __init__(self):
+        self.bars = []
+
+    def next(self):
+        self.bars.append((self.datas[0].datetime.datetime(0), self.datas[0].close[0]))
+
+
+class TestBrokerStrategy(Strategy):
+
+    def __init__(self):
+        self.orders = []
+        self.completed = set()
+
+    def notify_order(self, order):
+        if order.status == order.Completed:
+            self.completed.add(order.ref)
+
+    def next(self):
+        if not self.orders:
+            self.orders.append(self.buy(size=2))
+
+
+def backtesting_broker(**kwargs):
+    cerebro = Cerebro()
+
+    cerebro.addstrategy(TestBrokerStrategy)
+
+    kwargs.update(exchange=kwargs.get('exchange', 'binance'), currency='USDT', config={}, retries=3)
+    cerebro.adddata(CCXTFeed(dataname='BNB/USDT',
+                             timeframe=TimeFrame.Minutes,
+                             fromdate=datetime(2019, 1, 1, 0, 0),
+                             todate=datetime(2019, 1, 1, 0, 4),
+                             compression=1,
+                             ohlcv_limit=2,
+                             **kwargs))
+    cerebro.setbroker(CCXTBroker(**kwargs))
+
+    finished_strategies = cerebro.run()
+    return finished_strategies
+
+
+def backtesting(**kwargs):
+    cerebro = Cerebro()
+
+    cerebro.addstrategy(TestStrategy)
+
+    cerebro.adddata(CCXTFeed(exchange='binance',
+                             dataname='BNB/USDT',
+                             timeframe=TimeFrame.Minutes,
+                             fromdate=datetime(2019, 1, 1, 0, 0),
+                             todate=datetime(2019, 1, 1, 0, 2),
+                             compression=1,
+                             ohlcv_limit=2,
+                             currency='BNB',
+                             config={'enableRateLimit': True},
+                             retries=5,
+                             **kwargs))
+
+    finished_strategies = cerebro.run()
+    return finished_strategies
+
+
+if __name__ == '__main__':
+    unittest.main()
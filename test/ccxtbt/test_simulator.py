@@ -0,0 +1,127 @@
+import unittest
+from datetime import datetime
+
+from ccxt.base.errors import DDoSProtection, InsufficientFunds, RequestTimeout
+
+from backtrader import Strategy, Cerebro, TimeFrame
+
+from ccxtbt import CCXTBroker, CCXTFeed, CCXTSimulator, CCXTStore
+
+START = 1546300800000  # 2019-01-01 00:00 UTC in milliseconds
+MINUTE = 60000
+
+# 10 one minute candles, closes 11, 12, ... 20
+CANDLES = [[START + i * MINUTE, 10 + i, 12 + i, 9 + i, 11 + i, 5] for i in range(10)]
+
+
+class TestSimulator(unittest.TestCase):
+    """
+    The simulator matches orders against the published candles and simulates the network (errors, rate limit)
+    """
+
+    def setUp(self):
+        self.sim = CCXTSimulator({'BNB/USDT': CANDLES}, balance={'USDT': 1000})
+
+    def test_market_order(self):
+        order = self.sim.create_order('BNB/USDT', 'market', 'buy', 2)
+        self.assertEqual(order['status'], 'closed')
+        self.assertEqual(order['average'], 11)  # close of the published candle
+        self.assertEqual(self.sim.balance['BNB'], 2)
+        self.assertEqual(self.sim.balance['USDT'], 1000 - 2 * 11)
+
+    def test_limit_and_stop_orders(self):
+        self.sim.balance['BNB'] = 1
+        limit = self.sim.create_order('BNB/USDT', 'limit', 'sell', 1, 13.5)
+        stop = self.sim.create_order('BNB/USDT', 'stop', 'buy', 1, 12.5)
+        self.assertRaises(InsufficientFunds, self.sim.create_order, 'BNB/USDT', 'market', 'sell', 1)  # reserved
+
+        self.sim.advance()  # candle open 11, high 13
+        self.assertEqual(self.sim.fetch_order(limit['id'])['status'], 'open')
+        self.assertEqual(self.sim.fetch_order(stop['id'])['average'], 12.5)
+
+        self.sim.advance()  # candle open 12, high 14
+        self.assertEqual(self.sim.fetch_order(limit['id'])['average'], 13.5)
+        self.assertEqual(self.sim.fetch_open_orders(), [])
+
+    def test_partial_fills(self):
+        sim = CCXTSimulator({'BNB/USDT': CANDLES}, balance={'USDT': 1000}, fill_ratio=0.5)
+        order = sim.create_order('BNB/USDT', 'market', 'buy', 2)
+        self.assertEqual((order['status'], order['filled']), ('open', 1))
+
+        sim.advance()
+        order = sim.fetch_order(order['id'])
+        self.assertEqual((order['status'], order['filled']), ('closed', 2))
+        self.assertEqual(order['average'], (11 + 11) / 2)  # close, then next open
+
+    def test_errors(self):
+        self.sim.fail('fetch_balance', count=2)
+        self.assertRaises(RequestTimeout, self.sim.fetch_balance)
+        self.assertRaises(RequestTimeout, self.sim.fetch_balance)
+        self.assertEqual(self.sim.fetch_balance()['free']['USDT'], 1000)
+
+        sim = CCXTSimulator({'BNB/USDT': CANDLES}, minInterval=60000)
+        sim.fetch_trades('BNB/USDT')
+        self.assertRaises(DDoSProtection, sim.fetch_trades, 'BNB/USDT')
+
+
+class TestSimulatedStack(unittest.TestCase):
+    """
+    Store, feed and broker run against the simulator as against an exchange
+    """
+
+    def setUp(self):
+        CCXTStore._singleton = None
+
+    def tearDown(self):
+        CCXTStore._singleton = None
+
+    def test_feed_and_broker(self):
+        sim = CCXTSimulator({'BNB/USDT': CANDLES}, balance={'USDT': 1000})
+        sim.fail('fetch_ohlcv', count=2)  # retried by the store
+
+        finished_strategies = backtesting(sim)
+        strategy = finished_strategies[0]
+
+        self.assertEqual(strategy.closes, [c[4] for c in CANDLES[:9]])  # up to todate
+        self.assertEqual(len(strategy.completed), 1)
+        self.assertEqual(sim.balance['BNB'], 2)
+        self.assertEqual(sim.balance['USDT'], 1000 - 2 * 12)  # bought at the close of the 2nd bar
+
+
+class TestStrategy(Strategy):
+
+    def __init__(self):
+        self.closes = []
+        self.completed = set()
+
+    def notify_order(self, order):
+        if order.status == order.Completed:
+            self.completed.add(order.ref)
+
+    def next(self):
+        self.closes.append(self.datas[0].close[0])
+        if len(self.closes) == 2:
+            self.buy(size=2)
+
+
+def backtesting(sim):
+    cerebro = Cerebro()
+
+    cerebro.addstrategy(TestStrategy)
+
+    kwargs = dict(exchange=sim, currency='USDT', config={}, retries=3)
+    cerebro.adddata(CCXTFeed(dataname='BNB/USDT',
+                             timeframe=TimeFrame.Minutes,
+                             fromdate=datetime(2019, 1, 1, 0, 0),
+                             todate=datetime(2019, 1, 1, 0, 8),
+                             compression=1,
+                             ohlcv_limit=2,
+                             **kwargs))
+    cerebro.setbroker(CCXTBroker(**kwargs))
+
+    finished_strategies = cerebro.run()
+    return finished_strategies
+
+
+if __name__ == '__main__':
+    unittest.main()
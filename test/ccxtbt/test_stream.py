@@ -0,0 +1,165 @@
+import asyncio
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+
+from backtrader import Strategy, Cerebro, TimeFrame
+
+from ccxtbt import CCXTFeed, CCXTSimulator, CCXTStore, FileTrades, SocketTrades, WatchTrades
+
+START = 1546300800000  # 2019-01-01 00:00 UTC in milliseconds
+
+
+def trade(tid, seconds, price, amount):
+    return {'id': tid, 'timestamp': START + seconds * 1000, 'price': price, 'amount': amount}
+
+
+TRADES = [
+    trade('8', 1, 10, 1),
+    trade('9', 2, 12, 1),
+    trade('10', 2, 9, 2),  # after '9' although smaller as a string
+    trade('9', 2, 12, 1),  # duplicate
+    trade('11', 61, 11, 1),
+    trade('12', 62, 13, 3),
+    trade('5', 30, 100, 1),  # out of order: its bar is over
+    trade('13', 125, 14, 1),
+]
+
+# bars of 1 minute: the last one is delivered at the end of the stream
+BARS = [
+    (0, 10, 12, 9, 9, 4),
+    (60, 11, 13, 11, 13, 4),
+    (120, 14, 14, 14, 14, 1),
+]
+
+
+class TestStream(unittest.TestCase):
+    """
+    Trades pushed by a stream are aggregated into bars by the feed
+    """
+
+    def setUp(self):
+        CCXTStore._singleton = None
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'trades.jsonl')
+        with open(self.path, 'w') as f:
+            for t in TRADES:
+                f.write(json.dumps(t) + '\n')
+
+    def tearDown(self):
+        CCXTStore._singleton = None
+        shutil.rmtree(self.tmpdir)
+
+    def test_file(self):
+        self.assertEqual(backtesting(FileTrades(self.path)), BARS)
+
+    def test_socket(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+
+        def serve():
+            conn, _ = server.accept()
+            with open(self.path, 'rb') as f:
+                conn.sendall(f.read())
+            conn.close()
+            server.close()
+
+        threading.Thread(target=serve).start()
+        self.assertEqual(backtesting(SocketTrades(server.getsockname())), BARS)
+
+    def test_watch_trades(self):
+        class Exchange(object):
+            batches = [TRADES[:3], TRADES[3:]]
+
+            def watch_trades(self, symbol):
+                if not self.batches:
+                    raise StopAsyncIteration
+                return asyncio.sleep(0, result=self.batches.pop(0))
+
+        self.assertEqual(backtesting(WatchTrades(Exchange(), 'BNB/USDT')), BARS)
+
+    def test_file_follow_stopped(self):
+        threads = threading.active_count()
+        bars = backtesting(FileTrades(self.path, follow=True), stopafter=2)
+        self.assertEqual(bars, BARS[:2])
+        self.assertTrue(threads_ended(threads))
+
+    def test_socket_stopped(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+
+        def serve():  # keeps the connection open until the client closes it
+            conn, _ = server.accept()
+            with open(self.path, 'rb') as f:
+                conn.sendall(f.read())
+            conn.recv(1)
+            conn.close()
+            server.close()
+
+        threads = threading.active_count()
+        threading.Thread(target=serve).start()
+        bars = backtesting(SocketTrades(server.getsockname()), stopafter=2)
+        self.assertEqual(bars, BARS[:2])
+        self.assertTrue(threads_ended(threads))
+
+    def test_ticks(self):
+        bars = backtesting(FileTrades(self.path), timeframe=TimeFrame.Ticks)
+        self.assertEqual([bar[4] for bar in bars], [10, 12, 9, 11, 13, 14])
+
+
+def threads_ended(count, timeout=5.0):
+    """
+    Waits for the threads started after there were ``count`` threads to end
+    """
+    end = time.time() + timeout
+    while threading.active_count() > count:
+        if time.time() > end:
+            return False
+        time.sleep(0.05)
+
+    return True
+
+
+class TestStrategy(Strategy):
+    params = (('stopafter', None),)
+
+    def __init__(self):
+        self.bars = []
+
+    def next(self):
+        data = self.datas[0]
+        seconds = (data.datetime.datetime(0) - datetime(2019, 1, 1)).total_seconds()
+        self.bars.append((seconds, data.open[0], data.high[0], data.low[0], data.close[0], data.volume[0]))
+        if len(self.bars) == self.p.stopafter:
+            self.env.runstop()
+
+
+def backtesting(stream, timeframe=TimeFrame.Minutes, stopafter=None):
+    cerebro = Cerebro()
+
+    cerebro.addstrategy(TestStrategy, stopafter=stopafter)
+
+    exchange = CCXTSimulator({'BNB/USDT': [[START, 1, 1, 1, 1, 1]]})
+    cerebro.adddata(CCXTFeed(exchange=exchange,
+                             dataname='BNB/USDT',
+                             timeframe=timeframe,
+                             compression=1,
+                             stream=stream,
+                             currency='USDT',
+                             config={},
+                             retries=5))
+
+    finished_strategies = cerebro.run()
+    return finished_strategies[0].bars
+
+
+if __name__ == '__main__':
+    unittest.main()